@@ -0,0 +1,141 @@
+import django
+from django.core.exceptions import ImproperlyConfigured
+
+# Perfis aceitos pela variável de ambiente DJANGO_AMBIENTE
+AMBIENTE_DESENVOLVIMENTO = "desenvolvimento"
+AMBIENTE_PRODUCAO = "producao"
+
+
+def _inteiro(variaveis, nome, padrao):
+    # Converter uma variável de ambiente numérica, com mensagem clara em caso de erro
+    valor = variaveis.get(nome)
+    if valor in (None, ""):
+        return padrao
+    try:
+        return int(valor)
+    except ValueError:
+        raise ImproperlyConfigured(f"A variável {nome} deve ser um número inteiro.")
+
+
+def _booleano(variaveis, nome, padrao):
+    valor = variaveis.get(nome)
+    if valor in (None, ""):
+        return padrao
+    return valor.strip().lower() in ("1", "true", "sim", "yes", "on")
+
+
+def banco_padrao(ambiente, variaveis, base_dir):
+    """
+    Monta a configuração do banco "default" conforme o perfil do ambiente.
+
+    No desenvolvimento é usado o SQLite local ("db.sqlite3"), com transações em
+    modo IMMEDIATE para evitar "database is locked" em escritas simultâneas. Na
+    produção é usado o PostgreSQL com conexões persistentes, verificadas antes
+    de serem reutilizadas. Com DB_POOL_MAX_SIZE, o pool de conexões nativo do
+    Django (5.1+ com psycopg 3) substitui as conexões persistentes.
+
+    Variáveis de ambiente:
+        DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT: Conexão com o PostgreSQL
+            (no desenvolvimento, DB_NAME é o caminho do arquivo SQLite).
+        DB_CONN_MAX_AGE: Segundos que uma conexão é reutilizada (produção: 60,
+            desenvolvimento: 0, ou seja, uma conexão por requisição).
+        DB_CONN_HEALTH_CHECKS: Verificar a conexão antes de reutilizá-la (padrão: true).
+        DB_CONNECT_TIMEOUT: Tempo máximo (segundos) para abrir uma conexão (padrão: 5).
+        DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE, DB_POOL_TIMEOUT: Tamanho do pool e
+            tempo máximo (segundos) de espera por uma conexão livre.
+
+    Args:
+        ambiente (str): "desenvolvimento" ou "producao".
+        variaveis (Mapping): Variáveis de ambiente (normalmente "os.environ").
+        base_dir (Path): Diretório raiz do projeto.
+
+    Returns:
+        dict: Configuração do banco "default" para "DATABASES".
+
+    Raises:
+        ImproperlyConfigured: Se o ambiente ou alguma variável for inválida.
+
+    """
+    if ambiente == AMBIENTE_DESENVOLVIMENTO:
+        return {
+            # SQLite com transações IMMEDIATE (utils.sqlite.base); ver também SQLITE_PRAGMAS
+            "ENGINE": "utils.sqlite",
+            "NAME": variaveis.get("DB_NAME") or base_dir / "db.sqlite3",
+            "CONN_MAX_AGE": _inteiro(variaveis, "DB_CONN_MAX_AGE", 0),
+            "OPTIONS": {"transaction_mode": "IMMEDIATE"},
+        }
+    if ambiente != AMBIENTE_PRODUCAO:
+        raise ImproperlyConfigured(
+            f"DJANGO_AMBIENTE inválido: {ambiente!r}. "
+            f"Use {AMBIENTE_DESENVOLVIMENTO!r} ou {AMBIENTE_PRODUCAO!r}."
+        )
+
+    banco = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": variaveis.get("DB_NAME", "khanto"),
+        "USER": variaveis.get("DB_USER", "khanto"),
+        "PASSWORD": variaveis.get("DB_PASSWORD", ""),
+        "HOST": variaveis.get("DB_HOST", "localhost"),
+        "PORT": variaveis.get("DB_PORT", "5432"),
+        "CONN_MAX_AGE": _inteiro(variaveis, "DB_CONN_MAX_AGE", 60),
+        "CONN_HEALTH_CHECKS": _booleano(variaveis, "DB_CONN_HEALTH_CHECKS", True),
+        "OPTIONS": {
+            "connect_timeout": _inteiro(variaveis, "DB_CONNECT_TIMEOUT", 5),
+        },
+    }
+
+    tamanho_pool = _inteiro(variaveis, "DB_POOL_MAX_SIZE", 0)
+    if tamanho_pool:
+        if django.VERSION < (5, 1):
+            raise ImproperlyConfigured(
+                "O pool de conexões nativo (DB_POOL_MAX_SIZE) requer Django 5.1 ou "
+                "superior e psycopg 3. Use DB_CONN_MAX_AGE para reutilizar conexões."
+            )
+        # O Django não permite combinar o pool com conexões persistentes
+        banco["CONN_MAX_AGE"] = 0
+        banco["OPTIONS"]["pool"] = {
+            "min_size": _inteiro(variaveis, "DB_POOL_MIN_SIZE", 2),
+            "max_size": tamanho_pool,
+            "timeout": _inteiro(variaveis, "DB_POOL_TIMEOUT", 10),
+        }
+    return banco
+
+
+def bancos_replicas(variaveis, banco):
+    """
+    Monta as réplicas de leitura a partir da variável de ambiente DB_REPLICAS.
+
+    DB_REPLICAS lista as réplicas separadas por vírgula, cada uma com um peso
+    opcional após "=" (padrão 1). Para o PostgreSQL, cada item é o host da
+    réplica; para o SQLite, o caminho do arquivo (útil para testar o roteamento
+    com dois arquivos locais). As demais configurações são as do banco
+    principal. Nos testes, as réplicas espelham o banco "default".
+
+    Args:
+        variaveis (Mapping): Variáveis de ambiente (normalmente "os.environ").
+        banco (dict): Configuração do banco "default".
+
+    Returns:
+        tuple: Configurações das réplicas ({alias: dict}) e o peso de cada uma
+            ({alias: int}), para "DATABASES" e "DATABASE_REPLICAS".
+
+    Raises:
+        ImproperlyConfigured: Se algum peso for inválido.
+
+    Examples:
+        DB_REPLICAS="replica-1.interno=3,replica-2.interno"
+
+    """
+    campo = "HOST" if banco["ENGINE"] == "django.db.backends.postgresql" else "NAME"
+    bancos, pesos = {}, {}
+    itens = [item.strip() for item in variaveis.get("DB_REPLICAS", "").split(",")]
+    for numero, item in enumerate(filter(None, itens), start=1):
+        endereco, _, peso = item.partition("=")
+        alias = f"replica_{numero}"
+        bancos[alias] = {
+            **banco,
+            campo: endereco.strip(),
+            "TEST": {"MIRROR": "default"},
+        }
+        pesos[alias] = _inteiro({"DB_REPLICAS": peso.strip()}, "DB_REPLICAS", 1)
+    return bancos, pesos
@@ -10,22 +10,43 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
+import os
 from pathlib import Path
+from .banco import (
+    AMBIENTE_DESENVOLVIMENTO,
+    AMBIENTE_PRODUCAO,
+    banco_padrao,
+    bancos_replicas,
+)
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Perfil das configurações, escolhido pela variável de ambiente DJANGO_AMBIENTE:
+# "desenvolvimento" (padrão, SQLite local) ou "producao" (PostgreSQL)
+AMBIENTE = os.environ.get("DJANGO_AMBIENTE", AMBIENTE_DESENVOLVIMENTO)
+PRODUCAO = AMBIENTE == AMBIENTE_PRODUCAO
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.0/howto/deployment/checklist/
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = "django-insecure-&@y&gqtpv%u1_=^x6ds1#@7x3m)$xt=#4r41!4(3hx*q64d0)g"
+SECRET_KEY = (
+    os.environ["DJANGO_SECRET_KEY"]
+    if PRODUCAO
+    else "django-insecure-&@y&gqtpv%u1_=^x6ds1#@7x3m)$xt=#4r41!4(3hx*q64d0)g"
+)
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = not PRODUCAO
 
-ALLOWED_HOSTS = []
+# Na produção, os domínios aceitos são separados por vírgula, ex.: "api.khanto.com,localhost"
+ALLOWED_HOSTS = [
+    host.strip()
+    for host in os.environ.get("DJANGO_ALLOWED_HOSTS", "").split(",")
+    if host.strip()
+]
 
 
 # Application definition
@@ -45,7 +66,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Consultas SQL, tempos de serialização/renderização e cabeçalho Server-Timing
+    # (primeiro item, para que o tempo "total" inclua os demais middlewares)
+    "utils.metricas.MetricasMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    # Compressão brotli/gzip das respostas (antes dos demais, para comprimir o conteúdo final)
+    "utils.compressao.CompressaoMiddleware",
+    # Leituras no banco principal logo após uma escrita do mesmo cliente
+    "utils.replicas.ReplicaMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -77,14 +105,77 @@ WSGI_APPLICATION = "API_Khanto.wsgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
+# Desenvolvimento: SQLite. Produção: PostgreSQL com conexões persistentes e verificadas,
+# ou o pool nativo do Django 5.1+ (variáveis DB_* descritas em API_Khanto/banco.py)
 
 DATABASES = {
+    "default": banco_padrao(AMBIENTE, os.environ, BASE_DIR),
+}
+
+# Réplicas de leitura (variável DB_REPLICAS). As consultas das views decoradas com
+# "utils.replicas.leitura_replica" são distribuídas entre elas conforme o peso; o
+# cliente que acabou de escrever lê do banco principal por REPLICA_JANELA_PRIMARIO
+# segundos (ReplicaMiddleware). Sem réplicas, tudo usa o "default"
+_REPLICAS, DATABASE_REPLICAS = bancos_replicas(os.environ, DATABASES["default"])
+DATABASES.update(_REPLICAS)
+DATABASE_ROUTERS = ["utils.replicas.RoteadorReplicas"]
+REPLICA_JANELA_PRIMARIO = 10
+
+# PRAGMAs aplicados a cada nova conexão SQLite (utils.sqlite). WAL permite leituras
+# simultâneas a uma escrita; "synchronous=NORMAL" é seguro com WAL (apenas as últimas
+# transações podem ser perdidas numa queda de energia); "busy_timeout" espera até 5 s
+# por um bloqueio em vez de retornar "database is locked". Para desligar, use {}
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    # 128 MiB lidos por mmap e cache de 20 MiB por conexão (negativo = KiB)
+    "mmap_size": 134217728,
+    "cache_size": -20000,
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+
+CACHES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
     }
 }
 
+# Alias do cache usado pelas respostas das listagens e tempo de expiração (segundos)
+CACHE_LISTAGENS_ALIAS = "default"
+CACHE_LISTAGENS_TIMEOUT = 300
+
+
+# Compressão das respostas (utils.compressao.CompressaoMiddleware): tamanho mínimo em
+# bytes, nível do gzip e qualidade do brotli (usado quando o pacote "brotli" está instalado)
+COMPRESSAO_TAMANHO_MINIMO = 1024
+COMPRESSAO_GZIP_NIVEL = 6
+COMPRESSAO_BROTLI_QUALIDADE = 5
+
+# Logs
+# https://docs.djangoproject.com/en/5.0/topics/logging/
+# "khanto.metricas" registra uma linha JSON por requisição no nível INFO (tempo total,
+# de SQL, de serialização e de renderização e quantidade de consultas)
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "khanto.metricas": {
+            "handlers": ["console"],
+            "level": os.environ.get(
+                "METRICAS_LOG_NIVEL", "INFO" if PRODUCAO else "WARNING"
+            ),
+            "propagate": False,
+        },
+    },
+}
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -126,3 +217,25 @@ STATIC_URL = "static/"
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+
+# Django REST Framework
+# https://www.django-rest-framework.org/api-guide/settings/
+
+REST_FRAMEWORK = {
+    # Paginação por cursor (keyset) usada nas listagens
+    "DEFAULT_PAGINATION_CLASS": "utils.paginacao.PaginacaoCursor",
+    "PAGE_SIZE": 100,
+    # JSON com orjson quando instalado (mesmo formato do renderer/parser padrão do DRF).
+    # Para voltar ao "json" da biblioteca padrão, use "rest_framework.renderers.JSONRenderer"
+    # e "rest_framework.parsers.JSONParser"
+    "DEFAULT_RENDERER_CLASSES": [
+        "utils.json_rapido.JSONRendererRapido",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "utils.json_rapido.JSONParserRapido",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+}
@@ -17,9 +17,11 @@ Including another URLconf
 
 from django.contrib import admin
 from django.urls import path, include
+from base import views as base_views
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("metricas/", base_views.metricas, name="metricas"),
     path("imovel/", include("api_imoveis.urls")),
     path("anuncio/", include("api_anuncios.urls")),
     path("reserva/", include("api_reservas.urls")),
@@ -1,8 +1,46 @@
-from rest_framework import serializers
-from base.models import Anuncio
+from base.models import Anuncio, Imovel, Reserva
+from utils.esquemas import EsquemaPayload
+from utils.expansao import Expansao, SerializerExpansivel
+from utils.representacao import RepresentacaoRapida
 
 
-class AnuncioSerializer(serializers.ModelSerializer):
+class AnuncioSerializer(SerializerExpansivel):
     class Meta:
         model = Anuncio
         fields = "__all__"
+        expansoes = {
+            "imovel": ("api_imoveis.serializer.ImovelSerializer", "cod_imovel", False),
+            "reservas": (
+                "api_reservas.serializer.ReservaSerializer",
+                "reserva_set",
+                True,
+            ),
+        }
+
+
+# Campos aceitos no payload e o tipo esperado no JSON
+CAMPOS_ANUNCIO = {
+    "cod_imovel": int,
+    "plataforma": str,
+    "taxa_plataforma": float,
+}
+
+# Esquemas compilados uma única vez, na importação do módulo
+ESQUEMA_CADASTRO_ANUNCIO = EsquemaPayload(
+    Anuncio, CAMPOS_ANUNCIO, recusa_desconhecidos=False
+)
+ESQUEMA_ALTERACAO_ANUNCIO = EsquemaPayload(
+    Anuncio,
+    CAMPOS_ANUNCIO,
+    obrigatorios=False,
+    prefixo_desconhecidos="Registro não atualizado! ",
+)
+
+# Relacionamentos aceitos em "get_anuncios?expand="
+EXPANSOES_ANUNCIO = {
+    "imovel": Expansao(Imovel, select_related="cod_imovel"),
+    "reservas": Expansao(Reserva, prefetch_related="reserva_set"),
+}
+
+# Representação das listagens a partir de ".values_list()", idêntica à do AnuncioSerializer
+REPRESENTACAO_ANUNCIO = RepresentacaoRapida(AnuncioSerializer)
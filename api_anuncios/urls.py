@@ -5,6 +5,10 @@ app_name = "api_anuncios"
 
 urlpatterns = [
     path("include_anuncio/", views.add_anuncio, name="add_anuncio"),
+    path("include_anuncios_lote/", views.add_anuncios_lote, name="add_anuncios_lote"),
     path("get_anuncios/", views.get_anuncios, name="get_anuncios"),
+    path("async/get_anuncios/", views.aget_anuncios, name="aget_anuncios"),
+    path("export_anuncios/", views.export_anuncios, name="export_anuncios"),
+    path("del_anuncio/", views.del_anuncio, name="del_anuncio"),
     path("alter_anuncio/", views.alter_anuncio, name="alter_anuncio"),
 ]
@@ -1,9 +1,31 @@
 from rest_framework.response import Response
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, renderer_classes
+from django.views.decorators.http import require_GET
 from rest_framework import status
 from utils.validations import *
+from utils.paginacao import apagina_registros, pagina_registros
+from utils.assincrono import requisicao_async, resposta_async
+from utils.cache import cache_listagem
+from utils.condicional import condicao_listagem
+from utils.replicas import leitura_replica
+from utils.expansao import converte_expansoes
+from utils.formatos import RENDERERS_LISTAGEM
+from utils.exportacao import exporta_registros
+from utils.exclusao import exclui_registros
+from utils.lote import (
+    LOTE_MAX_ITENS,
+    resposta_lote,
+    salva_registros_lote,
+    valida_itens_lote,
+)
 from utils.validations import valida_ids_get
-from .serializer import AnuncioSerializer
+from .serializer import (
+    ESQUEMA_ALTERACAO_ANUNCIO,
+    ESQUEMA_CADASTRO_ANUNCIO,
+    EXPANSOES_ANUNCIO,
+    REPRESENTACAO_ANUNCIO,
+    AnuncioSerializer,
+)
 from base.models import Anuncio
 
 
@@ -33,63 +55,107 @@ def add_anuncio(request):
 
     """
     try:
-        # Validar e salvar os dados do anúncio
-        serializer = AnuncioSerializer(data=request.data)
-        dict_campos_obrigatorios = {
-            "cod_imovel": int,
-            "plataforma": str,
-            "taxa_plataforma": float,
-        }
-        campos_faltantes = valida_campos_obrigatorios(
-            dict_campos_obrigatorios.keys(), request.data.keys()
-        )
-        if campos_faltantes:
+        # Validar e converter os dados do anúncio em uma única passagem
+        dados, erro = ESQUEMA_CADASTRO_ANUNCIO.valida(request.data)
+        if not erro:
+            erro = ESQUEMA_CADASTRO_ANUNCIO.valida_relacionados(dados)
+        if erro:
             # Se os dados forem inválidos, retornar uma resposta de erro
             return Response(
-                data={
-                    "error": f"Os campos a seguir são obrigatórios e não foram preenchidos.\
-                    {str(list(campos_faltantes))[1:][:-1]}"
-                },
+                data={"error": erro},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        tipos_incorretos = valida_var_tipos(dict_campos_obrigatorios, request.data)
-        if tipos_incorretos:
-            return Response(
-                data={"error": tipos_incorretos},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+        # Salvar o anúncio
+        Anuncio.objects.create(**dados)
+
+        # Retornar uma resposta de sucesso
+        return Response(
+            data={"message": "Anúncio salvo com sucesso!"},
+            status=status.HTTP_200_OK,
+        )
+    except Exception as error:
+        # Se ocorrer uma exceção durante o processamento, retornar uma resposta de erro
+        return Response(
+            data={"error": str(error)},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+
+@api_view(["POST"])
+def add_anuncios_lote(request):
+    """
+    View para cadastrar os anúncios em lote.
+
+    Cada item é validado com as mesmas regras do cadastro individual. Os itens
+    válidos são salvos com "bulk_create" em uma única transação e os inválidos
+    são informados individualmente pelo seu índice na lista.
+
+    Args:
+        request (Request): Requisição HTTP contendo uma lista de anúncios.
+
+    Returns:
+        Response: Uma resposta HTTP com a quantidade e os IDs dos anúncios criados
+            e os erros de cada item recusado.
+
+    Raises:
+        Exception: Se ocorrer algum erro durante o processamento do lote.
+
+    Examples:
+        Um exemplo do formato esperado dos dados de cadastro em lote:
+
+        anuncios_json_example = [
+            {
+                "cod_imovel": 1, // int
+                "plataforma": "airbnb", // string
+                "taxa_plataforma": 99.99 // float
+            },
+            ...
+        ]
 
-        if serializer.is_valid():
-            serializer.save()
-        else:
+    """
+    try:
+        itens = request.data
+        if not isinstance(itens, list) or not itens:
             return Response(
                 data={
-                    "error": "Opa, algo deu errado. Verifique se todos os campos estão corretos e tente novamente."
+                    "error": "O payload deve ser uma lista com os anúncios a serem cadastrados."
                 },
                 status=status.HTTP_400_BAD_REQUEST,
             )
+        if len(itens) > LOTE_MAX_ITENS:
+            return Response(
+                data={"error": f"O lote pode conter no máximo {LOTE_MAX_ITENS} itens."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-        # Retornar uma resposta de sucesso
+        registros, erros = valida_itens_lote(itens, ESQUEMA_CADASTRO_ANUNCIO)
+
+        ids_criados = salva_registros_lote(Anuncio, registros) if registros else []
         return Response(
-            data={"message": "Anúncio salvo com sucesso!"},
-            status=status.HTTP_200_OK,
+            data=resposta_lote(ids_criados, erros, "Anúncios salvos com sucesso!"),
+            status=status.HTTP_200_OK if ids_criados else status.HTTP_400_BAD_REQUEST,
         )
     except Exception as error:
-        # Se ocorrer uma exceção durante o processamento, retornar uma resposta de erro
+        # Se ocorrer um erro, retornar uma resposta de erro
         return Response(
             data={"error": str(error)},
             status=status.HTTP_400_BAD_REQUEST,
         )
 
 
+@leitura_replica
+@condicao_listagem(Anuncio, expansoes=EXPANSOES_ANUNCIO)
 @api_view(["GET"])
+@renderer_classes(RENDERERS_LISTAGEM)
+@cache_listagem(Anuncio, expansoes=EXPANSOES_ANUNCIO)
 def get_anuncios(request):
     """
     View para obter anúncios.
 
     Args:
         request (Request): Requisição HTTP contendo os parâmetros de filtragem.
+            "expand" inclui os registros relacionados, ex.: "?expand=imovel,reservas".
 
     Returns:
         Response: Uma resposta HTTP contendo os registros de anúncios.
@@ -102,23 +168,38 @@ def get_anuncios(request):
         # Obter o parâmetro de consulta "id" da requisição
         param = request.query_params.get("id", None)
 
-        registros = valida_ids_get(Anuncio, param)
-        if param == None and not registros:
-            return Response(
-                data={"error": "Opa! Não há nenhum registro de imoveis salvo."},
-                status=status.HTTP_404_NOT_FOUND,
-            )
-        elif param != None and not registros:
+        # Carregar os relacionamentos expandidos com uma quantidade fixa de consultas
+        # ou, sem expansões, apenas as colunas da representação com ".values_list()"
+        expand = converte_expansoes(
+            request.query_params.get("expand"), EXPANSOES_ANUNCIO
+        )
+        registros_base = REPRESENTACAO_ANUNCIO.queryset_listagem(
+            Anuncio.objects.all(), expand, EXPANSOES_ANUNCIO
+        )
+
+        if not param:
+            # Sem "id", listar os registros paginados por cursor (keyset)
+            paginador, pagina = pagina_registros(request, registros_base)
+            if not pagina and paginador.cursor is None:
+                return Response(
+                    data={"error": "Opa! Não há nenhum registro de imoveis salvo."},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            dados = REPRESENTACAO_ANUNCIO.dados_listagem(pagina, expand)
+            return paginador.get_paginated_response(dados)
+
+        registros = valida_ids_get(Anuncio, param, registros_base)
+        if not registros:
             return Response(
                 data={"error": "Opa! Não há nenhum registro de imoveis com esse ID."},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        # Serializar os registros de anúncios
-        serializer = AnuncioSerializer(registros, many=True)
+        # Representar os registros (sem o DRF quando não há expansões)
+        dados = REPRESENTACAO_ANUNCIO.dados_listagem(registros, expand)
 
         # Retornar uma resposta contendo os dados serializados
-        return Response(serializer.data)
+        return Response(dados)
     except Exception as error:
         # Se ocorrer uma exceção durante o processamento, retornar uma resposta de erro
         return Response(
@@ -127,6 +208,147 @@ def get_anuncios(request):
         )
 
 
+@leitura_replica
+@require_GET
+async def aget_anuncios(request):
+    """
+    View assíncrona para obter anúncios.
+
+    Aceita os mesmos parâmetros e retorna as mesmas respostas de "get_anuncios",
+    mas lê os registros com o ORM assíncrono ("aiterator"), sem bloquear o loop
+    de eventos enquanto aguarda o banco. As consultas em si ainda são executadas
+    pelo Django na thread síncrona compartilhada. Não utiliza o cache nem o ETag
+    das listagens síncronas.
+
+    Args:
+        request (HttpRequest): Requisição HTTP contendo os parâmetros de filtragem.
+            "expand" inclui os registros relacionados, ex.: "?expand=imovel,reservas".
+
+    Returns:
+        HttpResponse: Uma resposta HTTP contendo os registros de anúncios.
+
+    """
+    request = requisicao_async(request)
+    try:
+        param = request.query_params.get("id", None)
+        expand = converte_expansoes(
+            request.query_params.get("expand"), EXPANSOES_ANUNCIO
+        )
+        registros_base = REPRESENTACAO_ANUNCIO.queryset_listagem(
+            Anuncio.objects.all(), expand, EXPANSOES_ANUNCIO
+        )
+
+        if not param:
+            # Sem "id", listar os registros paginados por cursor (keyset)
+            paginador, pagina = await apagina_registros(request, registros_base)
+            if not pagina and paginador.cursor is None:
+                return resposta_async(
+                    request,
+                    {"error": "Opa! Não há nenhum registro de imoveis salvo."},
+                    status.HTTP_404_NOT_FOUND,
+                )
+            dados = REPRESENTACAO_ANUNCIO.dados_listagem(pagina, expand)
+            return resposta_async(request, paginador.get_paginated_response(dados).data)
+
+        registros = await avalida_ids_get(Anuncio, param, registros_base)
+        if not registros:
+            return resposta_async(
+                request,
+                {"error": "Opa! Não há nenhum registro de imoveis com esse ID."},
+                status.HTTP_404_NOT_FOUND,
+            )
+        return resposta_async(
+            request, REPRESENTACAO_ANUNCIO.dados_listagem(registros, expand)
+        )
+    except Exception as error:
+        # Se ocorrer um erro, retornar uma resposta de erro
+        return resposta_async(
+            request, {"error": str(error)}, status.HTTP_400_BAD_REQUEST
+        )
+
+
+@api_view(["GET"])
+def export_anuncios(request):
+    """
+    View para exportar todos os anúncios em streaming.
+
+    Os registros são lidos do banco em pedaços e enviados como um único array
+    JSON, sem carregar a tabela inteira em memória.
+
+    Args:
+        request (Request): Requisição HTTP.
+
+    Returns:
+        StreamingHttpResponse: Uma resposta HTTP contendo um array JSON com todos os anúncios.
+
+    """
+    return exporta_registros(Anuncio.objects.all(), AnuncioSerializer)
+
+
+@api_view(["DELETE"])
+def del_anuncio(request):
+    """
+    View para deletar um ou mais anúncios.
+
+    As reservas dos anúncios também são excluídas.
+
+    Args:
+        request (Request): Requisição HTTP contendo os dados do anúncio a ser deletado.
+
+    Returns:
+        Response: Uma resposta HTTP indicando o resultado da operação de deleção.
+
+    Raises:
+        KeyError: Se o campo "id" não estiver presente nos dados da requisição.
+
+    Examples:
+        Um exemplo do formato esperado dos dados de deletar anuncio:
+
+        del_anuncio_json_example = {
+            "id":1 //int
+        }
+
+        ou, para excluir vários registros de uma vez:
+
+        del_anuncio_json_example = {
+            "id":[1, 2, 3] //list[int]
+        }
+
+    """
+    try:
+        # Obter o ID do anúncio a ser deletado dos dados da requisição
+        filtro = request.data
+        if "id" not in filtro.keys():
+            return Response(
+                data={"error": "O campo id é obrigatório para essa operação."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        ids = valida_ids_payload(filtro["id"])
+        if ids is None:
+            return Response(
+                data={
+                    "error": f"O campo id deve ser um inteiro ou uma lista de até {IDS_MAX_QUANTIDADE} inteiros."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # Excluir os registros e os seus dependentes com DELETEs por conjunto
+        result = exclui_registros(Anuncio, ids)
+        if not result[1].get(Anuncio._meta.label):
+            return Response(
+                data={"error": "id do anúncio não encontrado."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        # Retornar uma resposta indicando o resultado da operação de deleção
+        return Response(result)
+    except KeyError as error:
+        # Se o campo "id" não estiver presente nos dados da requisição, retornar uma resposta de erro
+        return Response(
+            data={"error": error},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+
 @api_view(["POST"])
 def alter_anuncio(request):
     """
@@ -156,52 +378,32 @@ def alter_anuncio(request):
     try:
         # Obter os dados do anúncio a ser alterado da requisição
         filtro = request.data
-        # Obter o registro do anúncio a ser alterado com base no ID fornecido
-        registro = Anuncio.objects.get(id=filtro["id"])
-
-        dict_campos_validos = {
-            "cod_imovel": int,
-            "plataforma": str,
-            "taxa_plataforma": float,
-        }
-
-        # valida há campos invalidos no payload
-        campos_invalidos_anuncio = valida_campos_validos(
-            dict_campos_validos.keys(), filtro["fields"].keys()
-        )
-
-        if campos_invalidos_anuncio:
+        # Validar e converter os novos valores em uma única passagem
+        dados, erro = ESQUEMA_ALTERACAO_ANUNCIO.valida(filtro["fields"])
+        if erro:
             return Response(
-                data={
-                    "error": f"Registro não atualizado! Os campos a seguir não existem na tabela Anuncio: {str(list(campos_invalidos_anuncio))[1:][:-1]}. Campos permitidos: {str(list(dict_campos_validos))[1:][:-1]}"
-                },
+                data={"error": erro},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # valida o tipo dos valores para cada campo, buscando tipos invalidos
-        tipos_incorretos = valida_var_tipos(dict_campos_validos, request.data["fields"])
-        if tipos_incorretos:
+        # Obter o registro do anúncio a ser alterado com base no ID fornecido
+        registro = Anuncio.objects.get(id=filtro["id"])
+
+        erro = ESQUEMA_ALTERACAO_ANUNCIO.valida_relacionados(dados)
+        if erro:
             return Response(
-                data={"error": tipos_incorretos},
+                data={"error": erro},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Iterar sobre os campos a serem alterados
-        for field in filtro["fields"].keys():
-            valor_field = filtro["fields"][field]
-            # Atribuir o novo valor ao campo do registro
+        # Atribuir os novos valores e salvar apenas as colunas alteradas em um único UPDATE
+        for field, valor_field in dados.items():
             setattr(registro, field, valor_field)
-            # Salvar as mudanças no registro
-            registro.save()
-
-        # Obter novamente o registro de anúncio alterado
-        registros = Anuncio.objects.filter(id=filtro["id"])
-
-        # Serializar o registro de anúncio alterado
-        serializer = AnuncioSerializer(registros, many=True)
+        registro.save(update_fields=[*dados.keys(), "data_atualizacao"])
 
-        # Retornar uma resposta contendo os dados serializados do anúncio alterado
-        return Response(serializer.data)
+        # Retornar uma resposta contendo os dados serializados do anúncio alterado,
+        # sem consultar o registro novamente
+        return Response([AnuncioSerializer(registro).data])
     except Exception as error:
         # Se ocorrer uma exceção durante o processamento, retornar uma resposta de erro
         return Response(
@@ -1,8 +1,64 @@
-from rest_framework import serializers
-from base.models import Imovel
+from base.models import Anuncio, Imovel, Reserva
+from utils.esquemas import EsquemaPayload
+from utils.expansao import Expansao, SerializerExpansivel
+from utils.filtros import FiltrosListagem
+from utils.representacao import RepresentacaoRapida
 
 
-class ImovelSerializer(serializers.ModelSerializer):
+class ImovelSerializer(SerializerExpansivel):
     class Meta:
         model = Imovel
         fields = "__all__"
+        expansoes = {
+            "anuncios": (
+                "api_anuncios.serializer.AnuncioSerializer",
+                "anuncio_set",
+                True,
+            ),
+        }
+
+
+# Campos aceitos no payload e o tipo esperado no JSON
+CAMPOS_IMOVEL = {
+    "limite_hospedes": int,
+    "quantidade_banheiros": int,
+    "aceita_animais": bool,
+    "valor_limpeza": float,
+    "data_ativacao": str,
+}
+
+# Esquemas compilados uma única vez, na importação do módulo
+ESQUEMA_CADASTRO_IMOVEL = EsquemaPayload(
+    Imovel, CAMPOS_IMOVEL, recusa_desconhecidos=False
+)
+ESQUEMA_ALTERACAO_IMOVEL = EsquemaPayload(
+    Imovel,
+    CAMPOS_IMOVEL,
+    obrigatorios=False,
+    prefixo_desconhecidos="Registro não atualizado! ",
+)
+
+# Relacionamentos aceitos em "get_imoveis?expand=" (as reservas dentro dos anúncios)
+EXPANSOES_IMOVEL = {
+    "anuncios": Expansao(Anuncio, prefetch_related="anuncio_set"),
+    "reservas": Expansao(
+        Reserva, prefetch_related="anuncio_set__reserva_set", depende="anuncios"
+    ),
+}
+
+# Representação das listagens a partir de ".values_list()", idêntica à do ImovelSerializer
+REPRESENTACAO_IMOVEL = RepresentacaoRapida(ImovelSerializer)
+
+# Filtros aceitos em "get_imoveis" (intervalos inclusivos), atendidos pelos índices de Imovel
+FILTROS_IMOVEL = FiltrosListagem(
+    Imovel,
+    {
+        "limite_hospedes_min": "limite_hospedes__gte",
+        "aceita_animais": "aceita_animais",
+        "quantidade_banheiros": "quantidade_banheiros",
+        "valor_limpeza_min": "valor_limpeza__gte",
+        "valor_limpeza_max": "valor_limpeza__lte",
+        "data_ativacao_min": "data_ativacao__gte",
+        "data_ativacao_max": "data_ativacao__lte",
+    },
+)
@@ -4,7 +4,10 @@ from . import views
 app_name = "api_imoveis"
 urlpatterns = [
     path("include_imovel/", views.add_imovel, name="add_imovel"),
+    path("include_imoveis_lote/", views.add_imoveis_lote, name="add_imoveis_lote"),
     path("get_imoveis/", views.get_imoveis, name="get_imoveis"),
+    path("async/get_imoveis/", views.aget_imoveis, name="aget_imoveis"),
+    path("export_imoveis/", views.export_imoveis, name="export_imoveis"),
     path("del_imovel/", views.del_imovel, name="del_imovel"),
     path("alter_imovel/", views.alter_imovel, name="alter_imovel"),
 ]
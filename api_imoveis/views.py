@@ -1,7 +1,30 @@
 from rest_framework.response import Response
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, renderer_classes
+from django.views.decorators.http import require_GET
 from utils.validations import *
-from .serializer import ImovelSerializer
+from utils.paginacao import apagina_registros, pagina_registros
+from utils.assincrono import requisicao_async, resposta_async
+from utils.cache import cache_listagem
+from utils.condicional import condicao_listagem
+from utils.replicas import leitura_replica
+from utils.expansao import converte_expansoes
+from utils.formatos import RENDERERS_LISTAGEM
+from utils.exportacao import exporta_registros
+from utils.exclusao import exclui_registros
+from utils.lote import (
+    LOTE_MAX_ITENS,
+    resposta_lote,
+    salva_registros_lote,
+    valida_itens_lote,
+)
+from .serializer import (
+    ESQUEMA_ALTERACAO_IMOVEL,
+    ESQUEMA_CADASTRO_IMOVEL,
+    EXPANSOES_IMOVEL,
+    FILTROS_IMOVEL,
+    REPRESENTACAO_IMOVEL,
+    ImovelSerializer,
+)
 from base.models import Imovel
 from rest_framework import status
 from django.db import IntegrityError
@@ -34,54 +57,88 @@ def add_imovel(request):
 
     """
     try:
-        # Obter os dados do imóvel da requisição
-        serializer = ImovelSerializer(data=request.data)
-        dict_campos_obrigatorios = {
-            "limite_hospedes": int,
-            "quantidade_banheiros": int,
-            "aceita_animais": bool,
-            "valor_limpeza": float,
-            "data_ativacao": str,
-        }
-        campos_faltantes = valida_campos_obrigatorios(
-            dict_campos_obrigatorios.keys(), request.data.keys()
-        )
-        if campos_faltantes:
+        # Validar e converter os dados do imóvel em uma única passagem
+        dados, erro = ESQUEMA_CADASTRO_IMOVEL.valida(request.data)
+        if erro:
             # Se os dados forem inválidos, retornar uma resposta de erro
             return Response(
-                data={
-                    "error": f"Os campos a seguir são obrigatórios e não foram preenchidos.\
-                    {str(list(campos_faltantes))[1:][:-1]}"
-                },
+                data={"error": erro},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        tipos_incorretos = valida_var_tipos(dict_campos_obrigatorios, request.data)
-        if tipos_incorretos:
-            return Response(
-                data={"error": tipos_incorretos},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+        # Salvar o imóvel
+        Imovel.objects.create(**dados)
 
-        if serializer.is_valid():
-            # Se os dados forem válidos, salvar o imóvel
-            serializer.save()
+        # Retornar uma resposta de sucesso
+        return Response(
+            data={"message": "Imóvel cadastrado com sucesso!"},
+            status=status.HTTP_200_OK,
+        )
 
-        else:
-            # Se os dados forem inválidos, retornar uma resposta de erro
+    except Exception as erro:
+        # Se ocorrer um erro, retornar uma resposta de erro
+        return Response(
+            data={"error": str(erro)},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+
+@api_view(["POST"])
+def add_imoveis_lote(request):
+    """
+    View para cadastrar os imóveis em lote.
+
+    Cada item é validado com as mesmas regras do cadastro individual. Os itens
+    válidos são salvos com "bulk_create" em uma única transação e os inválidos
+    são informados individualmente pelo seu índice na lista.
+
+    Args:
+        request (Request): Requisição HTTP contendo uma lista de imóveis.
+
+    Returns:
+        Response: Uma resposta HTTP com a quantidade e os IDs dos imóveis criados
+            e os erros de cada item recusado.
+
+    Raises:
+        Exception: Se ocorrer algum erro durante o processamento do lote.
+
+    Examples:
+        Um exemplo do formato esperado dos dados de cadastro em lote:
+
+        imoveis_json_example = [
+            {
+                "limite_hospedes": 6, // int
+                "quantidade_banheiros": 2, // int
+                "aceita_animais": true, // boolean
+                "valor_limpeza": 10.05, // float
+                "data_ativacao": "2020-12-21" // string (data no formato americano YYYY-MM-DD)
+            },
+            ...
+        ]
+
+    """
+    try:
+        itens = request.data
+        if not isinstance(itens, list) or not itens:
             return Response(
                 data={
-                    "error": "Opa! algo deu errado. Verifique se todos os campos estão corretos e tente novamente."
+                    "error": "O payload deve ser uma lista com os imóveis a serem cadastrados."
                 },
                 status=status.HTTP_400_BAD_REQUEST,
             )
+        if len(itens) > LOTE_MAX_ITENS:
+            return Response(
+                data={"error": f"O lote pode conter no máximo {LOTE_MAX_ITENS} itens."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-        # Retornar uma resposta de sucesso
+        registros, erros = valida_itens_lote(itens, ESQUEMA_CADASTRO_IMOVEL)
+
+        ids_criados = salva_registros_lote(Imovel, registros) if registros else []
         return Response(
-            data={"message": "Imóvel cadastrado com sucesso!"},
-            status=status.HTTP_200_OK,
+            data=resposta_lote(ids_criados, erros, "Imóveis cadastrados com sucesso!"),
+            status=status.HTTP_200_OK if ids_criados else status.HTTP_400_BAD_REQUEST,
         )
-
     except Exception as erro:
         # Se ocorrer um erro, retornar uma resposta de erro
         return Response(
@@ -90,13 +147,27 @@ def add_imovel(request):
         )
 
 
+def _mensagem_sem_imoveis(parametros):
+    # Mensagem da listagem vazia, com ou sem filtros
+    if FILTROS_IMOVEL.informados(parametros):
+        return "Opa! Não há nenhum imóvel com esses filtros."
+    return "Opa! Não há nenhum registro de imoveis salvo."
+
+
+@leitura_replica
+@condicao_listagem(Imovel, expansoes=EXPANSOES_IMOVEL, filtros=FILTROS_IMOVEL)
 @api_view(["GET"])
+@renderer_classes(RENDERERS_LISTAGEM)
+@cache_listagem(Imovel, expansoes=EXPANSOES_IMOVEL)
 def get_imoveis(request):
     """
     View para obter imóveis.
 
     Args:
         request (Request): Requisição HTTP contendo os parâmetros de filtragem.
+            "expand" inclui os registros relacionados, ex.: "?expand=anuncios,reservas".
+            Os filtros de FILTROS_IMOVEL são aplicados pelo banco e combinam com
+            "id" e com a paginação, ex.: "?limite_hospedes_min=4&aceita_animais=true".
 
     Returns:
         Response: Uma resposta HTTP contendo os registros de imóveis.
@@ -109,22 +180,38 @@ def get_imoveis(request):
         # Obter o parâmetro de consulta "id" da requisição
         param = request.query_params.get("id", None)
 
-        registros = valida_ids_get(Imovel, param)
-        if param == None and not registros:
-            return Response(
-                data={"error": "Opa! Não há nenhum registro de imoveis salvo."},
-                status=status.HTTP_404_NOT_FOUND,
-            )
-        elif param != None and not registros:
+        # Carregar os relacionamentos expandidos com uma quantidade fixa de consultas
+        # ou, sem expansões, apenas as colunas da representação com ".values_list()"
+        expand = converte_expansoes(
+            request.query_params.get("expand"), EXPANSOES_IMOVEL
+        )
+        filtrados = FILTROS_IMOVEL.aplica(Imovel.objects.all(), request.query_params)
+        registros_base = REPRESENTACAO_IMOVEL.queryset_listagem(
+            filtrados, expand, EXPANSOES_IMOVEL
+        )
+
+        if not param:
+            # Sem "id", listar os registros paginados por cursor (keyset)
+            paginador, pagina = pagina_registros(request, registros_base)
+            if not pagina and paginador.cursor is None:
+                return Response(
+                    data={"error": _mensagem_sem_imoveis(request.query_params)},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            dados = REPRESENTACAO_IMOVEL.dados_listagem(pagina, expand)
+            return paginador.get_paginated_response(dados)
+
+        registros = valida_ids_get(Imovel, param, registros_base)
+        if not registros:
             return Response(
                 data={"error": "Opa! Não há nenhum registro de imoveis com esse ID."},
                 status=status.HTTP_404_NOT_FOUND,
             )
-        # Serializar os registros de imóveis
-        serializer = ImovelSerializer(registros, many=True)
+        # Representar os registros (sem o DRF quando não há expansões)
+        dados = REPRESENTACAO_IMOVEL.dados_listagem(registros, expand)
 
         # Retornar uma resposta contendo os dados serializados
-        return Response(serializer.data)
+        return Response(dados)
     except Exception as erro:
         # Se ocorrer um erro, retornar uma resposta de erro
         return Response(
@@ -133,6 +220,84 @@ def get_imoveis(request):
         )
 
 
+@leitura_replica
+@require_GET
+async def aget_imoveis(request):
+    """
+    View assíncrona para obter imóveis.
+
+    Aceita os mesmos parâmetros (inclusive os filtros) e retorna as mesmas
+    respostas de "get_imoveis", mas lê os registros com o ORM assíncrono
+    ("aiterator"), sem bloquear o loop de eventos enquanto aguarda o banco. As
+    consultas em si ainda são executadas pelo Django na thread síncrona
+    compartilhada. Não utiliza o cache nem o ETag das listagens síncronas.
+
+    Args:
+        request (HttpRequest): Requisição HTTP contendo os parâmetros de filtragem.
+            "expand" inclui os registros relacionados, ex.: "?expand=anuncios,reservas".
+
+    Returns:
+        HttpResponse: Uma resposta HTTP contendo os registros de imóveis.
+
+    """
+    request = requisicao_async(request)
+    try:
+        param = request.query_params.get("id", None)
+        expand = converte_expansoes(
+            request.query_params.get("expand"), EXPANSOES_IMOVEL
+        )
+        filtrados = FILTROS_IMOVEL.aplica(Imovel.objects.all(), request.query_params)
+        registros_base = REPRESENTACAO_IMOVEL.queryset_listagem(
+            filtrados, expand, EXPANSOES_IMOVEL
+        )
+
+        if not param:
+            # Sem "id", listar os registros paginados por cursor (keyset)
+            paginador, pagina = await apagina_registros(request, registros_base)
+            if not pagina and paginador.cursor is None:
+                return resposta_async(
+                    request,
+                    {"error": _mensagem_sem_imoveis(request.query_params)},
+                    status.HTTP_404_NOT_FOUND,
+                )
+            dados = REPRESENTACAO_IMOVEL.dados_listagem(pagina, expand)
+            return resposta_async(request, paginador.get_paginated_response(dados).data)
+
+        registros = await avalida_ids_get(Imovel, param, registros_base)
+        if not registros:
+            return resposta_async(
+                request,
+                {"error": "Opa! Não há nenhum registro de imoveis com esse ID."},
+                status.HTTP_404_NOT_FOUND,
+            )
+        return resposta_async(
+            request, REPRESENTACAO_IMOVEL.dados_listagem(registros, expand)
+        )
+    except Exception as erro:
+        # Se ocorrer um erro, retornar uma resposta de erro
+        return resposta_async(
+            request, {"error": str(erro)}, status.HTTP_400_BAD_REQUEST
+        )
+
+
+@api_view(["GET"])
+def export_imoveis(request):
+    """
+    View para exportar todos os imóveis em streaming.
+
+    Os registros são lidos do banco em pedaços e enviados como um único array
+    JSON, sem carregar a tabela inteira em memória.
+
+    Args:
+        request (Request): Requisição HTTP.
+
+    Returns:
+        StreamingHttpResponse: Uma resposta HTTP contendo um array JSON com todos os imóveis.
+
+    """
+    return exporta_registros(Imovel.objects.all(), ImovelSerializer)
+
+
 @api_view(["DELETE"])
 def del_imovel(request):
     """
@@ -154,6 +319,12 @@ def del_imovel(request):
             "id":1 //int
         }
 
+        ou, para excluir vários registros de uma vez:
+
+        del_imovel_json_example = {
+            "id":[1, 2, 3] //list[int]
+        }
+
     """
     try:
         # Obter o ID do imóvel a ser deletado dos dados da requisição
@@ -163,15 +334,22 @@ def del_imovel(request):
                 data={"error": "O campo id é obrigatório para essa operação."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        # Filtrar o registro de imóvel com base no ID fornecido
-        registro = Imovel.objects.filter(id=filtro["id"])
+        ids = valida_ids_payload(filtro["id"])
+        if ids is None:
+            return Response(
+                data={
+                    "error": f"O campo id deve ser um inteiro ou uma lista de até {IDS_MAX_QUANTIDADE} inteiros."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-        if not registro:
+        # Excluir os registros e os seus dependentes com DELETEs por conjunto
+        result = exclui_registros(Imovel, ids)
+        if not result[1].get(Imovel._meta.label):
             return Response(
                 data={"error": "id do imóvel não encontrado."},
                 status=status.HTTP_404_NOT_FOUND,
             )
-        result = registro.delete()
         # Retornar uma resposta indicando o resultado da operação de deleção
         return Response(result)
     except KeyError as error:
@@ -217,54 +395,25 @@ def alter_imovel(request):
                 data={"error": "O campo id é obrigatório para essa operação."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        # Obter o registro do imóvel a ser alterado com base no ID fornecido
-        registro = Imovel.objects.get(id=filtro["id"])
-
-        dict_campos_validos = {
-            "limite_hospedes": int,
-            "quantidade_banheiros": int,
-            "aceita_animais": bool,
-            "valor_limpeza": float,
-            "data_ativacao": str,
-        }
-
-        # valida há campos invalidos no payload
-        campos_invalidos_imovel = valida_campos_validos(
-            dict_campos_validos.keys(), filtro["fields"].keys()
-        )
-
-        if campos_invalidos_imovel:
+        # Validar e converter os novos valores em uma única passagem
+        dados, erro = ESQUEMA_ALTERACAO_IMOVEL.valida(filtro["fields"])
+        if erro:
             return Response(
-                data={
-                    "error": f"Registro não atualizado! Os campos a seguir não existem na tabela Imovel: {str(list(campos_invalidos_imovel))[1:][:-1]}. Campos permitidos: {str(list(dict_campos_validos))[1:][:-1]}"
-                },
+                data={"error": erro},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # valida o tipo dos valores para cada campo, buscando tipos invalidos
-        tipos_incorretos = valida_var_tipos(dict_campos_validos, request.data["fields"])
-        if tipos_incorretos:
-            return Response(
-                data={"error": tipos_incorretos},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+        # Obter o registro do imóvel a ser alterado com base no ID fornecido
+        registro = Imovel.objects.get(id=filtro["id"])
 
-        # Iterar sobre os campos a serem alterados
-        for field in filtro["fields"].keys():
-            valor_field = filtro["fields"][field]
-            # Atribuir o novo valor ao campo do registro
+        # Atribuir os novos valores e salvar apenas as colunas alteradas em um único UPDATE
+        for field, valor_field in dados.items():
             setattr(registro, field, valor_field)
-            # Salvar as mudanças no registro
-            registro.save()
-
-        # Obter novamente o registro de imóvel alterado
-        registros = Imovel.objects.filter(id=filtro["id"])
-
-        # Serializar o registro de imóvel alterado
-        serializer = ImovelSerializer(registros, many=True)
+        registro.save(update_fields=[*dados.keys(), "data_atualizacao"])
 
-        # Retornar uma resposta contendo os dados serializados do imóvel alterado
-        return Response(serializer.data)
+        # Retornar uma resposta contendo os dados serializados do imóvel alterado,
+        # sem consultar o registro novamente
+        return Response([ImovelSerializer(registro).data])
     except Exception as erro:
         # Se ocorrer um erro, retornar uma resposta de erro
         return Response(
@@ -0,0 +1,127 @@
+from django.db.models import Exists, OuterRef
+from base.models import Anuncio, Reserva
+from utils.validations import divide_ids
+
+
+def reservas_sobrepostas(data_checkin, data_checkout):
+    """
+    Filtra as reservas que ocupam alguma noite do período informado.
+
+    Duas estadias se sobrepõem quando uma começa antes da outra terminar. O dia
+    de check-out fica livre para um novo check-in. A consulta é atendida pelo
+    índice (cod_anuncio, data_checkin, data_checkout) da tabela Reserva.
+
+    Args:
+        data_checkin (date | str): Data de check-in do período (YYYY-MM-DD).
+        data_checkout (date | str): Data de check-out do período (YYYY-MM-DD).
+
+    Returns:
+        QuerySet: Reservas que se sobrepõem ao período.
+
+    """
+    return Reserva.objects.filter(
+        data_checkin__lt=data_checkout, data_checkout__gt=data_checkin
+    )
+
+
+def anuncio_disponivel(cod_anuncio, data_checkin, data_checkout):
+    """
+    Verifica se um anúncio está livre no período informado.
+
+    Args:
+        cod_anuncio (int): ID do anúncio.
+        data_checkin (date | str): Data de check-in do período (YYYY-MM-DD).
+        data_checkout (date | str): Data de check-out do período (YYYY-MM-DD).
+
+    Returns:
+        bool: True se não houver nenhuma reserva sobreposta ao período.
+
+    """
+    return not (
+        reservas_sobrepostas(data_checkin, data_checkout)
+        .filter(cod_anuncio=cod_anuncio)
+        .exists()
+    )
+
+
+def disponibilidade_anuncios(ids_anuncios, data_checkin, data_checkout):
+    """
+    Verifica a disponibilidade de vários anúncios em uma única consulta.
+
+    Args:
+        ids_anuncios (list): IDs dos anúncios a serem verificados.
+        data_checkin (date | str): Data de check-in do período (YYYY-MM-DD).
+        data_checkout (date | str): Data de check-out do período (YYYY-MM-DD).
+
+    Returns:
+        dict: Mapeamento {id_do_anuncio: disponivel} para os anúncios existentes.
+
+    Examples:
+        >>> disponibilidade_anuncios([1, 2], "2024-04-20", "2024-04-23")
+        {1: False, 2: True}
+
+    """
+    ocupado = reservas_sobrepostas(data_checkin, data_checkout).filter(
+        cod_anuncio=OuterRef("pk")
+    )
+    disponibilidade = {}
+    # Uma consulta por pedaço de IDs (uma única consulta para listas pequenas)
+    for lote_ids in divide_ids(sorted(ids_anuncios)):
+        registros = (
+            Anuncio.objects.filter(id__in=lote_ids)
+            .annotate(ocupado=Exists(ocupado))
+            .values_list("id", "ocupado")
+            .order_by("id")
+        )
+        disponibilidade.update(
+            {id_anuncio: not ocupado for id_anuncio, ocupado in registros}
+        )
+    return disponibilidade
+
+
+async def adisponibilidade_anuncios(ids_anuncios, data_checkin, data_checkout):
+    # Versão assíncrona de "disponibilidade_anuncios", lendo os pedaços com "aiterator"
+    ocupado = reservas_sobrepostas(data_checkin, data_checkout).filter(
+        cod_anuncio=OuterRef("pk")
+    )
+    disponibilidade = {}
+    for lote_ids in divide_ids(sorted(ids_anuncios)):
+        registros = (
+            Anuncio.objects.filter(id__in=lote_ids)
+            .annotate(ocupado=Exists(ocupado))
+            # "named=True": no Django 5.0, o "values_list" comum com anotações
+            # executa a consulta fora do "sync_to_async" usado pelo "aiterator"
+            .values_list("id", "ocupado", named=True)
+            .order_by("id")
+        )
+        async for id_anuncio, ocupado_periodo in registros.aiterator():
+            disponibilidade[id_anuncio] = not ocupado_periodo
+    return disponibilidade
+
+
+def periodos_ocupados(ids_anuncios, data_checkin, data_checkout):
+    """
+    Obtém os períodos reservados de vários anúncios.
+
+    Uma consulta por pedaço de IDs (uma única consulta para listas pequenas),
+    para não ultrapassar o limite de parâmetros do banco.
+
+    Args:
+        ids_anuncios (list): IDs dos anúncios.
+        data_checkin (date | str): Início do intervalo de interesse (YYYY-MM-DD).
+        data_checkout (date | str): Fim do intervalo de interesse (YYYY-MM-DD).
+
+    Returns:
+        dict: Mapeamento {id_do_anuncio: [(data_checkin, data_checkout), ...]}
+            com as reservas que se sobrepõem ao intervalo.
+
+    """
+    periodos = {}
+    sobrepostas = reservas_sobrepostas(data_checkin, data_checkout)
+    for lote_ids in divide_ids(sorted(ids_anuncios)):
+        registros = sobrepostas.filter(cod_anuncio__in=lote_ids).values_list(
+            "cod_anuncio", "data_checkin", "data_checkout"
+        )
+        for id_anuncio, checkin, checkout in registros:
+            periodos.setdefault(id_anuncio, []).append((checkin, checkout))
+    return periodos
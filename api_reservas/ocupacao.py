@@ -0,0 +1,320 @@
+from decimal import Decimal
+from django.db.models import (
+    Case,
+    Count,
+    DateField,
+    F,
+    FilteredRelation,
+    DecimalField,
+    Func,
+    IntegerField,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Greatest, Least
+from base.models import Anuncio, Imovel, Reserva, ResumoDiario
+
+AGRUPAMENTOS = ("imovel", "anuncio", "plataforma")
+# "reservas": calculado a partir das reservas; "resumo": a partir do resumo diário
+FONTES = ("reservas", "resumo")
+CENTAVOS = Decimal("0.01")
+
+
+class DiasEntre(Func):
+    """
+    Quantidade de dias entre duas datas ("fim - inicio"), como inteiro.
+
+    Args:
+        fim (Expression): Data final.
+        inicio (Expression): Data inicial.
+
+    """
+
+    # PostgreSQL e Oracle: a diferença entre datas já é um número de dias
+    template = "(%(expressions)s)"
+    arg_joiner = " - "
+    output_field = IntegerField()
+
+    def __init__(self, fim, inicio, **extra):
+        super().__init__(fim, inicio, **extra)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler,
+            connection,
+            template="CAST(julianday(%(expressions)s) AS INTEGER)",
+            arg_joiner=") - julianday(",
+            **extra_context,
+        )
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler,
+            connection,
+            template="DATEDIFF(%(expressions)s)",
+            arg_joiner=", ",
+            **extra_context,
+        )
+
+
+class Divisao(Func):
+    """
+    Divisão decimal ("dividendo / divisor"), sem truncar em divisões inteiras.
+
+    Args:
+        dividendo (Expression): Dividendo.
+        divisor (Expression): Divisor.
+
+    """
+
+    template = "(%(expressions)s)"
+    arg_joiner = " / "
+    output_field = DecimalField()
+
+    def __init__(self, dividendo, divisor, **extra):
+        super().__init__(dividendo, divisor, **extra)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # O SQLite não tem aritmética decimal e divide inteiros sem as casas
+        # decimais (um preço inteiro é gravado como INTEGER)
+        return self.as_sql(
+            compiler,
+            connection,
+            template="(CAST(%(expressions)s)",
+            arg_joiner=" AS REAL) / ",
+            **extra_context,
+        )
+
+
+def _data(valor):
+    return Value(valor, output_field=DateField())
+
+
+def reservas_na_janela(prefixo, data_inicio, data_fim):
+    """
+    Condição das reservas que ocupam alguma noite da janela [inicio, fim).
+
+    Inclui também as reservas sem pernoite (check-in igual ao check-out) com
+    check-in dentro da janela.
+
+    Args:
+        prefixo (str): Caminho até a reserva (ex.: "reserva__").
+        data_inicio (date): Primeiro dia da janela.
+        data_fim (date): Dia seguinte ao último dia da janela.
+
+    Returns:
+        Q: Condição sobre os campos da reserva.
+
+    """
+    return Q(**{f"{prefixo}data_checkin__lt": data_fim}) & (
+        Q(**{f"{prefixo}data_checkout__gt": data_inicio})
+        | Q(**{f"{prefixo}data_checkin__gte": data_inicio})
+    )
+
+
+def _metricas_reservas(prefixo, data_inicio, data_fim):
+    # Noites e receita de cada reserva dentro da janela; a receita de uma estadia
+    # que atravessa a borda da janela é proporcional às noites dentro dela
+    checkin, checkout = F(f"{prefixo}data_checkin"), F(f"{prefixo}data_checkout")
+    noites = Greatest(
+        DiasEntre(
+            Least(checkout, _data(data_fim)), Greatest(checkin, _data(data_inicio))
+        ),
+        Value(0),
+    )
+    preco = F(f"{prefixo}preco_total")
+    receita = Case(
+        When(**{f"{prefixo}data_checkin": checkout}, then=preco),
+        default=Divisao(preco * noites, DiasEntre(checkout, checkin)),
+        output_field=DecimalField(),
+    )
+    return {
+        "reservas": Count(f"{prefixo}id"),
+        "noites_vendidas": Coalesce(Sum(noites), 0),
+        "receita": Coalesce(Sum(receita), Value(Decimal(0))),
+    }
+
+
+def dias_na_janela(prefixo, data_inicio, data_fim):
+    """
+    Condição das linhas do resumo diário dentro da janela [inicio, fim).
+
+    Args:
+        prefixo (str): Caminho até o resumo (ex.: "resumodiario__").
+        data_inicio (date): Primeiro dia da janela.
+        data_fim (date): Dia seguinte ao último dia da janela.
+
+    Returns:
+        Q: Condição sobre os campos do resumo.
+
+    """
+    return Q(**{f"{prefixo}data__gte": data_inicio, f"{prefixo}data__lt": data_fim})
+
+
+def _metricas_resumo(prefixo, data_inicio, data_fim):
+    # As reservas da janela são as que começam nela mais as que, iniciadas
+    # antes, ocupam a sua primeira noite (continuações do primeiro dia)
+    continuacoes = Case(
+        When(**{f"{prefixo}data": data_inicio}, then=F(f"{prefixo}continuacoes")),
+        default=Value(0),
+    )
+    return {
+        "reservas": Coalesce(Sum(f"{prefixo}reservas"), 0)
+        + Coalesce(Sum(continuacoes), 0),
+        "noites_vendidas": Coalesce(Sum(f"{prefixo}noites"), 0),
+        "receita": Coalesce(Sum(f"{prefixo}receita"), Value(Decimal(0))),
+    }
+
+
+# Model, relação a partir do anúncio, condição da janela e métricas de cada fonte
+_ORIGENS = {
+    "reservas": (Reserva, "reserva", reservas_na_janela, _metricas_reservas),
+    "resumo": (ResumoDiario, "resumodiario", dias_na_janela, _metricas_resumo),
+}
+
+
+def _noites_disponiveis(campo_ativacao, data_inicio, data_fim):
+    # Noites da janela a partir da ativação do imóvel
+    return Greatest(
+        DiasEntre(_data(data_fim), Greatest(F(campo_ativacao), _data(data_inicio))),
+        Value(0),
+    )
+
+
+def relatorio_ocupacao(agrupar, data_inicio, data_fim, ids=None, fonte="reservas"):
+    """
+    Calcula a ocupação e a receita por imóvel, anúncio ou plataforma em uma janela.
+
+    Todo o cálculo é feito pelo banco, em uma única consulta. A janela vai de
+    "data_inicio" até a noite anterior a "data_fim", como uma reserva. As
+    reservas que atravessam as bordas da janela contam apenas as noites
+    dentro dela, com a receita proporcional a essas noites; reservas sem
+    pernoite contam a receita inteira no dia do check-in.
+
+    As noites disponíveis são as noites da janela a partir da ativação do
+    imóvel (de cada anúncio, somadas, no agrupamento por plataforma). As
+    reservas são filtradas na junção com as tabelas, atendida pelo índice
+    (cod_anuncio, data_checkin, data_checkout).
+
+    Com a fonte "resumo", as métricas são somadas a partir do resumo diário
+    (ver "utils.resumo"), sem percorrer as reservas. Os valores são os mesmos,
+    exceto pela receita das reservas nas bordas da janela, que pode diferir em
+    centavos: no resumo, o preço é dividido entre as noites em centavos.
+
+    Args:
+        agrupar (str): "imovel", "anuncio" ou "plataforma".
+        data_inicio (date): Primeiro dia da janela.
+        data_fim (date): Dia seguinte ao último dia da janela.
+        ids (list): IDs dos imóveis ou anúncios (opcional, não se aplica a "plataforma").
+        fonte (str): "reservas" (padrão) ou "resumo".
+
+    Returns:
+        list: Dicionários com o identificador do grupo, "reservas",
+            "noites_vendidas", "noites_disponiveis", "taxa_ocupacao" e "receita".
+
+    Examples:
+        >>> relatorio_ocupacao("imovel", date(2024, 4, 1), date(2024, 5, 1))
+        [{'cod_imovel': 1, 'reservas': 2, 'noites_vendidas': 6,
+          'noites_disponiveis': 30, 'taxa_ocupacao': 0.2, 'receita': Decimal('51.98')}]
+
+    """
+    _, relacao, na_janela, metricas = _ORIGENS[fonte]
+    if agrupar == "imovel":
+        # Campo do model: nome no resultado
+        campos = {"id": "cod_imovel"}
+        registros = Imovel.objects.annotate(
+            janela=FilteredRelation(
+                f"anuncio__{relacao}",
+                condition=na_janela(f"anuncio__{relacao}__", data_inicio, data_fim),
+            )
+        )
+        disponiveis = _noites_disponiveis("data_ativacao", data_inicio, data_fim)
+    elif agrupar == "anuncio":
+        campos = {
+            "id": "cod_anuncio",
+            "cod_imovel": "cod_imovel",
+            "plataforma": "plataforma",
+        }
+        registros = Anuncio.objects.annotate(
+            janela=FilteredRelation(
+                relacao, condition=na_janela(f"{relacao}__", data_inicio, data_fim)
+            )
+        )
+        disponiveis = _noites_disponiveis(
+            "cod_imovel__data_ativacao", data_inicio, data_fim
+        )
+    else:
+        return _relatorio_plataformas(data_inicio, data_fim, fonte)
+
+    if ids is not None:
+        registros = registros.filter(id__in=ids)
+    registros = (
+        registros.values(*campos)
+        .annotate(
+            **metricas("janela__", data_inicio, data_fim),
+            noites_disponiveis=disponiveis,
+        )
+        .order_by(next(iter(campos)))
+    )
+    return [
+        {
+            **{nome: registro[campo] for campo, nome in campos.items()},
+            **_resultado(registro),
+        }
+        for registro in registros
+    ]
+
+
+def _relatorio_plataformas(data_inicio, data_fim, fonte):
+    # Na junção com as reservas, cada anúncio se repetiria por reserva, e as noites
+    # disponíveis dos anúncios não poderiam ser somadas. As métricas das reservas
+    # são calculadas por anúncio em subconsultas (atendidas pelo índice) e somadas
+    model, _, na_janela, metricas_origem = _ORIGENS[fonte]
+    linhas_anuncio = (
+        model.objects.filter(
+            na_janela("", data_inicio, data_fim), cod_anuncio=OuterRef("pk")
+        )
+        .order_by()
+        .values("cod_anuncio")
+    )
+    metricas = {
+        nome: Sum(Subquery(linhas_anuncio.annotate(valor=agregado).values("valor")))
+        for nome, agregado in metricas_origem("", data_inicio, data_fim).items()
+    }
+    registros = (
+        Anuncio.objects.values("plataforma")
+        .annotate(
+            anuncios=Count("id"),
+            **metricas,
+            noites_disponiveis=Sum(
+                _noites_disponiveis("cod_imovel__data_ativacao", data_inicio, data_fim)
+            ),
+        )
+        .order_by("plataforma")
+    )
+    return [
+        {
+            "plataforma": registro["plataforma"],
+            "anuncios": registro["anuncios"],
+            **_resultado(registro),
+        }
+        for registro in registros
+    ]
+
+
+def _resultado(registro):
+    # Métricas de um grupo, com a taxa de ocupação e a receita em centavos. As
+    # somas de um grupo sem reservas (ou sem anúncios) podem ser nulas
+    noites = registro["noites_vendidas"] or 0
+    disponiveis = registro["noites_disponiveis"] or 0
+    return {
+        "reservas": registro["reservas"] or 0,
+        "noites_vendidas": noites,
+        "noites_disponiveis": disponiveis,
+        "taxa_ocupacao": round(noites / disponiveis, 4) if disponiveis else None,
+        "receita": (registro["receita"] or Decimal(0)).quantize(CENTAVOS),
+    }
@@ -1,8 +1,44 @@
-from rest_framework import serializers
-from base.models import Reserva
+from base.models import Anuncio, Imovel, Reserva
+from utils.esquemas import EsquemaPayload
+from utils.expansao import Expansao, SerializerExpansivel
+from utils.representacao import RepresentacaoRapida
 
 
-class ReservaSerializer(serializers.ModelSerializer):
+class ReservaSerializer(SerializerExpansivel):
     class Meta:
         model = Reserva
         fields = "__all__"
+        expansoes = {
+            "anuncio": (
+                "api_anuncios.serializer.AnuncioSerializer",
+                "cod_anuncio",
+                False,
+            ),
+        }
+
+
+# Campos aceitos no payload e o tipo esperado no JSON
+CAMPOS_RESERVA = {
+    "cod_anuncio": int,
+    "data_checkin": str,
+    "data_checkout": str,
+    "preco_total": float,
+    "comentario": str,
+    "numero_hospedes": int,
+}
+
+# Esquemas compilados uma única vez, na importação do módulo
+ESQUEMA_CADASTRO_RESERVA = EsquemaPayload(
+    Reserva, CAMPOS_RESERVA, recusa_desconhecidos=False
+)
+
+# Relacionamentos aceitos em "get_reservas?expand=" (o imóvel dentro do anúncio)
+EXPANSOES_RESERVA = {
+    "anuncio": Expansao(Anuncio, select_related="cod_anuncio"),
+    "imovel": Expansao(
+        Imovel, select_related="cod_anuncio__cod_imovel", depende="anuncio"
+    ),
+}
+
+# Representação das listagens a partir de ".values_list()", idêntica à do ReservaSerializer
+REPRESENTACAO_RESERVA = RepresentacaoRapida(ReservaSerializer)
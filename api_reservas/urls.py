@@ -1,10 +1,19 @@
 from django.urls import path
 from . import views
 
-
 app_name = "api_reservas"
 urlpatterns = [
     path("include_reserva/", views.add_reserva, name="add_reserva"),
+    path("include_reservas_lote/", views.add_reservas_lote, name="add_reservas_lote"),
     path("get_reservas/", views.get_reservas, name="get_reservas"),
+    path("async/get_reservas/", views.aget_reservas, name="aget_reservas"),
+    path("export_reservas/", views.export_reservas, name="export_reservas"),
+    path("disponibilidade/", views.get_disponibilidade, name="get_disponibilidade"),
+    path(
+        "async/disponibilidade/",
+        views.aget_disponibilidade,
+        name="aget_disponibilidade",
+    ),
+    path("ocupacao/", views.get_ocupacao, name="get_ocupacao"),
     path("del_reserva/", views.del_reserva, name="del_reserva"),
 ]
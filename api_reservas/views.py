@@ -1,9 +1,39 @@
 from rest_framework.response import Response
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, renderer_classes
+from django.views.decorators.http import require_GET
 from rest_framework import status
+from django.db import transaction
 from utils.validations import *
-from .serializer import ReservaSerializer
-from base.models import Reserva
+from utils.paginacao import apagina_registros, pagina_registros
+from utils.assincrono import requisicao_async, resposta_async
+from utils.cache import cache_listagem
+from utils.condicional import condicao_listagem
+from utils.replicas import leitura_replica
+from utils.expansao import converte_expansoes
+from utils.formatos import RENDERERS_LISTAGEM
+from utils.exportacao import exporta_registros
+from utils.exclusao import exclui_registros
+from utils.resumo import atualiza_resumo, dados_reserva
+from utils.lote import (
+    LOTE_MAX_ITENS,
+    resposta_lote,
+    salva_registros_lote,
+    valida_itens_lote,
+)
+from .serializer import (
+    ESQUEMA_CADASTRO_RESERVA,
+    EXPANSOES_RESERVA,
+    REPRESENTACAO_RESERVA,
+    ReservaSerializer,
+)
+from .disponibilidade import (
+    adisponibilidade_anuncios,
+    anuncio_disponivel,
+    disponibilidade_anuncios,
+    periodos_ocupados,
+)
+from .ocupacao import AGRUPAMENTOS, FONTES, relatorio_ocupacao
+from base.models import Anuncio, Reserva
 from datetime import datetime
 
 
@@ -34,11 +64,16 @@ def add_reserva(request):
         }
     """
     try:
-        # Recuperar os dados da reserva da requisição
-        dados_reserva = request.data
+        # Validar e converter os dados da reserva em uma única passagem
+        dados, erro = ESQUEMA_CADASTRO_RESERVA.valida(request.data)
+        if erro:
+            # Se os dados forem inválidos, retornar uma resposta de erro
+            return Response(
+                data={"error": erro},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-        checkin_maior_checkout = valida_data_checkin_checkout(dados_reserva)
-        if checkin_maior_checkout == True:
+        if dados["data_checkout"] < dados["data_checkin"]:
             return Response(
                 data={
                     "error": "A data de Check-Out não pode ser inferior a data de Check-In"
@@ -46,67 +81,173 @@ def add_reserva(request):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Validar os dados da reserva usando o serializer
-        serializer = ReservaSerializer(data=dados_reserva)
+        with transaction.atomic():
+            # Bloquear o anúncio para que reservas simultâneas não ocupem o mesmo período
+            anuncio = (
+                Anuncio.objects.select_for_update()
+                .filter(id=dados["cod_anuncio_id"])
+                .first()
+            )
+            if anuncio is None:
+                return Response(
+                    data={
+                        "error": {
+                            "cod_anuncio": [
+                                f'Pk inválido "{dados["cod_anuncio_id"]}" - objeto não existe.'
+                            ]
+                        }
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            if not anuncio_disponivel(
+                anuncio.id, dados["data_checkin"], dados["data_checkout"]
+            ):
+                return Response(
+                    data={
+                        "error": "O anúncio já possui uma reserva que se sobrepõe a esse período."
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            # Se os dados forem válidos e o período estiver livre, salvar a reserva
+            Reserva.objects.create(**dados)
 
-        dict_campos_obrigatorios = {
-            "cod_anuncio": int,
-            "data_checkin": str,
-            "data_checkout": str,
-            "preco_total": float,
-            "comentario": str,
-            "numero_hospedes": int,
-        }
-        campos_faltantes = valida_campos_obrigatorios(
-            dict_campos_obrigatorios.keys(), request.data.keys()
+        # Retornar uma resposta de sucesso
+        return Response(
+            data={"message": "Reserva concluída com sucesso!"},
+            status=status.HTTP_200_OK,
         )
-        if campos_faltantes:
-            # Se os dados forem inválidos, retornar uma resposta de erro
+    except Exception as error:
+        # Se ocorrer uma exceção durante o processamento, retornar uma resposta de erro
+        return Response(
+            data={"error": str(error)},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+
+@api_view(["POST"])
+def add_reservas_lote(request):
+    """
+    View para cadastrar as reservas em lote.
+
+    Cada item é validado com as mesmas regras do cadastro individual. Os itens
+    válidos são salvos com "bulk_create" em uma única transação e os inválidos
+    são informados individualmente pelo seu índice na lista.
+
+    Args:
+        request (Request): Requisição HTTP contendo uma lista de reservas.
+
+    Returns:
+        Response: Uma resposta HTTP com a quantidade e os IDs das reservas criadas
+            e os erros de cada item recusado.
+
+    Raises:
+        Exception: Se ocorrer algum erro durante o processamento do lote.
+
+    Examples:
+        Um exemplo do formato esperado dos dados de cadastro em lote:
+
+        reservas_json_example = [
+            {
+                "cod_anuncio": 1, // int
+                "data_checkin": "2024-04-20", // string (data no formato americano YYYY-MM-DD)
+                "data_checkout": "2024-04-23", // string (data no formato americano YYYY-MM-DD)
+                "preco_total": 25.99, // float
+                "comentario": "meu comentario", // string
+                "numero_hospedes": 1 // int
+            },
+            ...
+        ]
+
+    """
+    try:
+        itens = request.data
+        if not isinstance(itens, list) or not itens:
             return Response(
                 data={
-                    "error": f"Os campos a seguir são obrigatórios e não foram preenchidos.\
-                    {str(list(campos_faltantes))[1:][:-1]}"
+                    "error": "O payload deve ser uma lista com as reservas a serem cadastradas."
                 },
                 status=status.HTTP_400_BAD_REQUEST,
             )
-
-        tipos_incorretos = valida_var_tipos(dict_campos_obrigatorios, request.data)
-        if tipos_incorretos:
+        if len(itens) > LOTE_MAX_ITENS:
             return Response(
-                data={"error": tipos_incorretos},
+                data={"error": f"O lote pode conter no máximo {LOTE_MAX_ITENS} itens."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        if serializer.is_valid():
-            # Se os dados forem válidos, salvar a reserva
-            serializer.save()
-        else:
-            # Se os dados forem inválidos, retornar uma resposta de erro
-            return Response(
-                data={"error": "Opa, algo deu errado"},
-                status=status.HTTP_400_BAD_REQUEST,
+        registros, erros = valida_itens_lote(itens, ESQUEMA_CADASTRO_RESERVA)
+
+        # Recusar os itens com data de check-out anterior à de check-in
+        registros_validos = []
+        for indice, registro in registros:
+            if registro.data_checkout < registro.data_checkin:
+                erros[indice] = (
+                    "A data de Check-Out não pode ser inferior a data de Check-In"
+                )
+            else:
+                registros_validos.append((indice, registro))
+
+        with transaction.atomic():
+            # Bloquear os anúncios para que reservas simultâneas não ocupem o mesmo período
+            ids_anuncios = {
+                registro.cod_anuncio_id for _, registro in registros_validos
+            }
+            for lote_ids in divide_ids(sorted(ids_anuncios)):
+                list(Anuncio.objects.select_for_update().filter(id__in=lote_ids))
+
+            # Verificar sobreposições com as reservas existentes e com as do próprio lote
+            registros = []
+            if registros_validos:
+                periodos = periodos_ocupados(
+                    ids_anuncios,
+                    min(registro.data_checkin for _, registro in registros_validos),
+                    max(registro.data_checkout for _, registro in registros_validos),
+                )
+                for indice, registro in registros_validos:
+                    periodos_anuncio = periodos.setdefault(registro.cod_anuncio_id, [])
+                    if any(
+                        checkin < registro.data_checkout
+                        and checkout > registro.data_checkin
+                        for checkin, checkout in periodos_anuncio
+                    ):
+                        erros[indice] = (
+                            "O anúncio já possui uma reserva que se sobrepõe a esse período."
+                        )
+                        continue
+                    periodos_anuncio.append(
+                        (registro.data_checkin, registro.data_checkout)
+                    )
+                    registros.append((indice, registro))
+
+            ids_criados = salva_registros_lote(Reserva, registros) if registros else []
+            # "bulk_create" não dispara "post_save"; atualizar o resumo diário explicitamente
+            atualiza_resumo(
+                adicionadas=[dados_reserva(registro) for _, registro in registros]
             )
 
-        # Retornar uma resposta de sucesso
         return Response(
-            data={"message": "Reserva concluída com sucesso!"},
-            status=status.HTTP_200_OK,
+            data=resposta_lote(ids_criados, erros, "Reservas concluídas com sucesso!"),
+            status=status.HTTP_200_OK if ids_criados else status.HTTP_400_BAD_REQUEST,
         )
     except Exception as error:
-        # Se ocorrer uma exceção durante o processamento, retornar uma resposta de erro
+        # Se ocorrer um erro, retornar uma resposta de erro
         return Response(
             data={"error": str(error)},
             status=status.HTTP_400_BAD_REQUEST,
         )
 
 
+@leitura_replica
+@condicao_listagem(Reserva, expansoes=EXPANSOES_RESERVA)
 @api_view(["GET"])
+@renderer_classes(RENDERERS_LISTAGEM)
+@cache_listagem(Reserva, expansoes=EXPANSOES_RESERVA)
 def get_reservas(request):
     """
     View para obter reservas.
 
     Args:
         request (Request): Requisição HTTP contendo os parâmetros de filtragem.
+            "expand" inclui os registros relacionados, ex.: "?expand=anuncio,imovel".
 
     Returns:
         Response: Uma resposta HTTP contendo os registros de reserva.
@@ -119,23 +260,287 @@ def get_reservas(request):
         # Obter o parâmetro de consulta "id" da requisição
         param = request.query_params.get("id", None)
 
-        registros = valida_ids_get(Reserva, param)
-        if param == None and not registros:
+        # Carregar os relacionamentos expandidos com uma quantidade fixa de consultas
+        # ou, sem expansões, apenas as colunas da representação com ".values_list()"
+        expand = converte_expansoes(
+            request.query_params.get("expand"), EXPANSOES_RESERVA
+        )
+        registros_base = REPRESENTACAO_RESERVA.queryset_listagem(
+            Reserva.objects.all(), expand, EXPANSOES_RESERVA
+        )
+
+        if not param:
+            # Sem "id", listar os registros paginados por cursor (keyset)
+            paginador, pagina = pagina_registros(request, registros_base)
+            if not pagina and paginador.cursor is None:
+                return Response(
+                    data={"error": "Opa! Não há nenhum registro de reservas salvo."},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            dados = REPRESENTACAO_RESERVA.dados_listagem(pagina, expand)
+            return paginador.get_paginated_response(dados)
+
+        registros = valida_ids_get(Reserva, param, registros_base)
+        if not registros:
             return Response(
-                data={"error": "Opa! Não há nenhum registro de reservas salvo."},
+                data={"error": "Opa! Não há nenhum registro de reservas com esse ID."},
                 status=status.HTTP_404_NOT_FOUND,
             )
-        elif param != None and not registros:
+
+        # Representar os registros (sem o DRF quando não há expansões)
+        dados = REPRESENTACAO_RESERVA.dados_listagem(registros, expand)
+
+        # Retornar uma resposta contendo os dados serializados
+        return Response(dados)
+    except Exception as error:
+        # Se ocorrer um erro, retornar uma resposta de erro
+        return Response(
+            data={"error": str(error)},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+
+@leitura_replica
+@require_GET
+async def aget_reservas(request):
+    """
+    View assíncrona para obter reservas.
+
+    Aceita os mesmos parâmetros e retorna as mesmas respostas de "get_reservas",
+    mas lê os registros com o ORM assíncrono ("aiterator"), sem bloquear o loop
+    de eventos enquanto aguarda o banco. As consultas em si ainda são executadas
+    pelo Django na thread síncrona compartilhada. Não utiliza o cache nem o ETag
+    das listagens síncronas.
+
+    Args:
+        request (HttpRequest): Requisição HTTP contendo os parâmetros de filtragem.
+            "expand" inclui os registros relacionados, ex.: "?expand=anuncio,imovel".
+
+    Returns:
+        HttpResponse: Uma resposta HTTP contendo os registros de reservas.
+
+    """
+    request = requisicao_async(request)
+    try:
+        param = request.query_params.get("id", None)
+        expand = converte_expansoes(
+            request.query_params.get("expand"), EXPANSOES_RESERVA
+        )
+        registros_base = REPRESENTACAO_RESERVA.queryset_listagem(
+            Reserva.objects.all(), expand, EXPANSOES_RESERVA
+        )
+
+        if not param:
+            # Sem "id", listar os registros paginados por cursor (keyset)
+            paginador, pagina = await apagina_registros(request, registros_base)
+            if not pagina and paginador.cursor is None:
+                return resposta_async(
+                    request,
+                    {"error": "Opa! Não há nenhum registro de reservas salvo."},
+                    status.HTTP_404_NOT_FOUND,
+                )
+            dados = REPRESENTACAO_RESERVA.dados_listagem(pagina, expand)
+            return resposta_async(request, paginador.get_paginated_response(dados).data)
+
+        registros = await avalida_ids_get(Reserva, param, registros_base)
+        if not registros:
+            return resposta_async(
+                request,
+                {"error": "Opa! Não há nenhum registro de reservas com esse ID."},
+                status.HTTP_404_NOT_FOUND,
+            )
+        return resposta_async(
+            request, REPRESENTACAO_RESERVA.dados_listagem(registros, expand)
+        )
+    except Exception as error:
+        # Se ocorrer um erro, retornar uma resposta de erro
+        return resposta_async(
+            request, {"error": str(error)}, status.HTTP_400_BAD_REQUEST
+        )
+
+
+@api_view(["GET"])
+def export_reservas(request):
+    """
+    View para exportar todas as reservas em streaming.
+
+    Os registros são lidos do banco em pedaços e enviados como um único array
+    JSON, sem carregar a tabela inteira em memória.
+
+    Args:
+        request (Request): Requisição HTTP.
+
+    Returns:
+        StreamingHttpResponse: Uma resposta HTTP contendo um array JSON com todas as reservas.
+
+    """
+    return exporta_registros(Reserva.objects.all(), ReservaSerializer)
+
+
+@leitura_replica
+@api_view(["GET"])
+def get_disponibilidade(request):
+    """
+    View para verificar a disponibilidade de anúncios em um período.
+
+    Todos os anúncios informados são verificados em uma única consulta ao banco.
+
+    Args:
+        request (Request): Requisição HTTP contendo os parâmetros "cod_anuncio",
+            "data_checkin" e "data_checkout".
+
+    Returns:
+        Response: Uma resposta HTTP indicando se cada anúncio está disponível no período.
+
+    Raises:
+        Exception: Se ocorrer algum erro durante a verificação.
+
+    Examples:
+        caminho_da_api.com/reserva/disponibilidade?cod_anuncio=1,2,10-20&data_checkin=2024-04-20&data_checkout=2024-04-23
+
+    """
+    try:
+        parametros = request.query_params
+        dict_campos_obrigatorios = {
+            "cod_anuncio": str,
+            "data_checkin": str,
+            "data_checkout": str,
+        }
+        campos_faltantes = valida_campos_obrigatorios(
+            dict_campos_obrigatorios.keys(),
+            [campo for campo in parametros.keys() if parametros[campo]],
+        )
+        if campos_faltantes:
+            return Response(
+                data={
+                    "error": f"Os campos a seguir são obrigatórios e não foram preenchidos.\
+                    {str(list(campos_faltantes))[1:][:-1]}"
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        checkin_maior_checkout = valida_data_checkin_checkout(parametros)
+        if checkin_maior_checkout == True:
+            return Response(
+                data={
+                    "error": "A data de Check-Out não pode ser inferior a data de Check-In"
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        ids_anuncios = converte_ids(parametros["cod_anuncio"])
+        disponibilidade = disponibilidade_anuncios(
+            ids_anuncios, parametros["data_checkin"], parametros["data_checkout"]
+        )
+        if not disponibilidade:
             return Response(
-                data={"error": "Opa! Não há nenhum registro de reservas com esse ID."},
+                data={"error": "Opa! Não há nenhum registro de anúncios com esse ID."},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        # Serializar os registros de reserva
-        serializer = ReservaSerializer(registros, many=True)
+        return Response(
+            data={
+                "data_checkin": parametros["data_checkin"],
+                "data_checkout": parametros["data_checkout"],
+                "disponibilidade": [
+                    {"cod_anuncio": id_anuncio, "disponivel": disponivel}
+                    for id_anuncio, disponivel in disponibilidade.items()
+                ],
+            }
+        )
+    except Exception as error:
+        # Se ocorrer um erro, retornar uma resposta de erro
+        return Response(
+            data={"error": str(error)},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
 
-        # Retornar uma resposta contendo os dados serializados
-        return Response(serializer.data)
+
+@leitura_replica
+@api_view(["GET"])
+def get_ocupacao(request):
+    """
+    View para obter a taxa de ocupação, as noites vendidas e a receita em um período.
+
+    Os valores são calculados pelo banco, em uma única consulta, por imóvel,
+    anúncio ou plataforma. O período vai de "data_inicio" até a noite anterior
+    a "data_fim" (como em uma reserva); reservas que atravessam as bordas do
+    período contam apenas as noites dentro dele, com a receita proporcional.
+    Com "fonte=resumo", os valores são somados a partir do resumo diário dos
+    anúncios, sem percorrer as reservas.
+
+    Args:
+        request (Request): Requisição HTTP contendo os parâmetros "data_inicio",
+            "data_fim", "agrupar" ("imovel", "anuncio" ou "plataforma"; padrão
+            "imovel"), "fonte" ("reservas" ou "resumo"; padrão "reservas") e,
+            opcionalmente, "id" dos imóveis ou anúncios.
+
+    Returns:
+        Response: Uma resposta HTTP contendo as métricas de cada grupo.
+
+    Raises:
+        Exception: Se ocorrer algum erro durante o cálculo.
+
+    Examples:
+        caminho_da_api.com/reserva/ocupacao?data_inicio=2024-04-01&data_fim=2024-05-01&agrupar=anuncio&id=1-10
+
+    """
+    try:
+        parametros = request.query_params
+        campos_faltantes = valida_campos_obrigatorios(
+            ["data_inicio", "data_fim"],
+            [campo for campo in parametros.keys() if parametros[campo]],
+        )
+        if campos_faltantes:
+            return Response(
+                data={
+                    "error": f"Os campos a seguir são obrigatórios e não foram preenchidos.\
+                    {str(list(campos_faltantes))[1:][:-1]}"
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        data_inicio = datetime.strptime(parametros["data_inicio"], "%Y-%m-%d").date()
+        data_fim = datetime.strptime(parametros["data_fim"], "%Y-%m-%d").date()
+        if data_fim <= data_inicio:
+            return Response(
+                data={"error": "A data final deve ser posterior à data inicial."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        agrupar = parametros.get("agrupar") or "imovel"
+        if agrupar not in AGRUPAMENTOS:
+            return Response(
+                data={
+                    "error": f"O parâmetro agrupar deve ser um destes: {', '.join(AGRUPAMENTOS)}."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        fonte = parametros.get("fonte") or "reservas"
+        if fonte not in FONTES:
+            return Response(
+                data={
+                    "error": f"O parâmetro fonte deve ser um destes: {', '.join(FONTES)}."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        param_ids = parametros.get("id")
+        ids = converte_ids(param_ids) if param_ids else None
+
+        resultados = relatorio_ocupacao(agrupar, data_inicio, data_fim, ids, fonte)
+        return Response(
+            data={
+                "data_inicio": data_inicio,
+                "data_fim": data_fim,
+                "agrupar": agrupar,
+                "fonte": fonte,
+                # Valores monetários como texto, no formato dos serializers
+                "resultados": [
+                    {**resultado, "receita": str(resultado["receita"])}
+                    for resultado in resultados
+                ],
+            }
+        )
     except Exception as error:
         # Se ocorrer um erro, retornar uma resposta de erro
         return Response(
@@ -144,6 +549,82 @@ def get_reservas(request):
         )
 
 
+@leitura_replica
+@require_GET
+async def aget_disponibilidade(request):
+    """
+    View assíncrona para verificar a disponibilidade de anúncios em um período.
+
+    Aceita os mesmos parâmetros e retorna as mesmas respostas de
+    "get_disponibilidade", lendo os anúncios com o ORM assíncrono ("aiterator").
+
+    Args:
+        request (HttpRequest): Requisição HTTP contendo os parâmetros "cod_anuncio",
+            "data_checkin" e "data_checkout".
+
+    Returns:
+        HttpResponse: Uma resposta HTTP indicando se cada anúncio está disponível no período.
+
+    Examples:
+        caminho_da_api.com/reserva/async/disponibilidade?cod_anuncio=1,2,10-20&data_checkin=2024-04-20&data_checkout=2024-04-23
+
+    """
+    request = requisicao_async(request)
+    try:
+        parametros = request.query_params
+        campos_faltantes = valida_campos_obrigatorios(
+            ["cod_anuncio", "data_checkin", "data_checkout"],
+            [campo for campo in parametros.keys() if parametros[campo]],
+        )
+        if campos_faltantes:
+            return resposta_async(
+                request,
+                {
+                    "error": f"Os campos a seguir são obrigatórios e não foram preenchidos.\
+                    {str(list(campos_faltantes))[1:][:-1]}"
+                },
+                status.HTTP_400_BAD_REQUEST,
+            )
+
+        if valida_data_checkin_checkout(parametros) == True:
+            return resposta_async(
+                request,
+                {
+                    "error": "A data de Check-Out não pode ser inferior a data de Check-In"
+                },
+                status.HTTP_400_BAD_REQUEST,
+            )
+
+        disponibilidade = await adisponibilidade_anuncios(
+            converte_ids(parametros["cod_anuncio"]),
+            parametros["data_checkin"],
+            parametros["data_checkout"],
+        )
+        if not disponibilidade:
+            return resposta_async(
+                request,
+                {"error": "Opa! Não há nenhum registro de anúncios com esse ID."},
+                status.HTTP_404_NOT_FOUND,
+            )
+
+        return resposta_async(
+            request,
+            {
+                "data_checkin": parametros["data_checkin"],
+                "data_checkout": parametros["data_checkout"],
+                "disponibilidade": [
+                    {"cod_anuncio": id_anuncio, "disponivel": disponivel}
+                    for id_anuncio, disponivel in disponibilidade.items()
+                ],
+            },
+        )
+    except Exception as error:
+        # Se ocorrer um erro, retornar uma resposta de erro
+        return resposta_async(
+            request, {"error": str(error)}, status.HTTP_400_BAD_REQUEST
+        )
+
+
 @api_view(["DELETE"])
 def del_reserva(request):
     """
@@ -165,6 +646,12 @@ def del_reserva(request):
             "id":1 int
         }
 
+        ou, para excluir vários registros de uma vez:
+
+        del_reserva_json_example = {
+            "id":[1, 2, 3] //list[int]
+        }
+
     """
     try:
         # Obter o ID da reserva a ser deletada dos dados da requisição
@@ -174,15 +661,22 @@ def del_reserva(request):
                 data={"error": "O campo id é obrigatório para essa operação."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        # Filtrar o registro de reserva com base no ID fornecido
-        registro = Reserva.objects.filter(id=filtro["id"])
-        if not registro:
+        ids = valida_ids_payload(filtro["id"])
+        if ids is None:
+            return Response(
+                data={
+                    "error": f"O campo id deve ser um inteiro ou uma lista de até {IDS_MAX_QUANTIDADE} inteiros."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # Excluir os registros e os seus dependentes com DELETEs por conjunto
+        result = exclui_registros(Reserva, ids)
+        if not result[1].get(Reserva._meta.label):
             return Response(
-                data={"error": f"id da reserva não encontrado"},
+                data={"error": "id da reserva não encontrado"},
                 status=status.HTTP_404_NOT_FOUND,
             )
-        # Deletar o registro de reserva
-        result = registro.delete()
         # Retornar uma resposta indicando o resultado da operação de deleção
         return Response(result)
     except KeyError as error:
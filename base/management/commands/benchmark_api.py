@@ -0,0 +1,627 @@
+import contextlib
+import itertools
+import json
+import math
+import platform
+import random
+import statistics
+import sys
+import time
+from array import array
+from datetime import date, timedelta
+import django
+from django.core.cache import cache, caches
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, connections
+from django.db.models import Max
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from base.models import Anuncio, Imovel, Reserva, ResumoDiario
+from utils.cache import CACHE_LISTAGENS_ALIAS, invalida_listagens
+from utils.exclusao import exclui_registros
+from utils.sinteticos import carrega_dados_sinteticos
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Itens enviados em cada cadastro em lote
+ITENS_LOTE = 100
+# Quantidade de IDs consultados nas rotas que aceitam intervalos ("?id=1-100")
+IDS_POR_CONSULTA = 100
+# Anúncios verificados por consulta de disponibilidade
+ANUNCIOS_DISPONIBILIDADE = 50
+# As reservas criadas pelo benchmark ficam após as reservas sintéticas (a partir
+# de 2020), para não se sobreporem a elas
+INICIO_RESERVAS_BENCHMARK = date(2100, 1, 1)
+
+ESCALAS = {"k": 1_000, "m": 1_000_000}
+
+
+def quantidade(texto):
+    """
+    Converte uma quantidade com sufixo opcional ("1k", "250k", "10m").
+
+    Examples:
+        >>> quantidade("10m")
+        10000000
+
+    """
+    texto = texto.strip().lower()
+    multiplicador = ESCALAS.get(texto[-1:], 1)
+    if multiplicador > 1:
+        texto = texto[:-1]
+    try:
+        valor = int(float(texto) * multiplicador)
+    except ValueError:
+        raise ValueError(f'Quantidade inválida: "{texto}"')
+    if valor < 1:
+        raise ValueError("A quantidade deve ser maior que zero.")
+    return valor
+
+
+def percentil(ordenados, p):
+    # Percentil pelo método do posto mais próximo, com os valores já ordenados
+    return ordenados[max(0, math.ceil(p * len(ordenados) / 100) - 1)]
+
+
+def em_cache(requisicao):
+    # Marca uma rota a ser medida com o cache das listagens preenchido
+    requisicao.cache = True
+    return requisicao
+
+
+def rss_pico_mb():
+    # Pico de memória residente do processo (ru_maxrss: KiB no Linux, bytes no macOS)
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(pico / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class Command(BaseCommand):
+    help = (
+        "Gera um conjunto de dados sintético reproduzível e mede a latência "
+        "(p50/p95/p99), a vazão, as consultas SQL e o pico de memória de cada "
+        "rota das APIs de imóveis, anúncios e reservas, com relatório em JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reservas",
+            type=quantidade,
+            default=None,
+            help=(
+                "Gera um conjunto sintético com essa quantidade de reservas antes "
+                'das medições (ex.: "1k", "100k", "1m", "10m"). Sem esta opção, '
+                "usa os dados já existentes no banco."
+            ),
+        )
+        parser.add_argument(
+            "--limpar",
+            action="store_true",
+            help="Apaga os imóveis, anúncios, reservas e o resumo diário antes de gerar os dados.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=42,
+            help="Semente dos dados gerados e dos parâmetros das requisições.",
+        )
+        parser.add_argument(
+            "--requisicoes", type=int, default=200, help="Requisições por rota."
+        )
+        parser.add_argument(
+            "--requisicoes-export",
+            type=int,
+            default=3,
+            help="Requisições por rota de exportação (percorrem a tabela inteira).",
+        )
+        parser.add_argument(
+            "--aquecimento",
+            type=int,
+            default=5,
+            help="Requisições iniciais de cada rota de leitura fora das medições.",
+        )
+        parser.add_argument(
+            "--rotas",
+            default=None,
+            help='Mede apenas as rotas que contêm um dos textos (ex.: "reservas,disponibilidade").',
+        )
+        parser.add_argument(
+            "--saida", default=None, help="Arquivo do relatório JSON (padrão: stdout)."
+        )
+        parser.add_argument(
+            "--comparar",
+            default=None,
+            help="Relatório JSON anterior, para comparar a latência de cada rota.",
+        )
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options["seed"])
+        relatorio = {
+            "versao": 1,
+            "data": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "ambiente": {
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "banco": connection.vendor,
+                "sistema": platform.platform(),
+            },
+            "parametros": {
+                nome: options[nome]
+                for nome in (
+                    "reservas",
+                    "seed",
+                    "requisicoes",
+                    "requisicoes_export",
+                    "aquecimento",
+                )
+            },
+        }
+
+        if options["limpar"]:
+            self.limpa()
+        if options["reservas"]:
+            if not options["limpar"] and Reserva.objects.exists():
+                raise CommandError(
+                    "O banco já possui reservas. Use --limpar para apagar os "
+                    "dados atuais ou omita --reservas para usá-los."
+                )
+            inicio = time.perf_counter()
+            criados = carrega_dados_sinteticos(options["reservas"], options["seed"])
+            duracao = time.perf_counter() - inicio
+            relatorio["geracao"] = {
+                **criados,
+                "segundos": round(duracao, 3),
+                "reservas_por_segundo": round(criados["reservas"] / duracao),
+            }
+            self.stderr.write(
+                f"Dados gerados em {duracao:.1f} s: {criados['imoveis']} imóveis, "
+                f"{criados['anuncios']} anúncios e {criados['reservas']} reservas."
+            )
+
+        # IDs existentes, sorteados nas consultas ("array" ocupa 8 bytes por ID)
+        self.ids = {
+            model: array(
+                "q",
+                model.objects.order_by("id")
+                .values_list("id", flat=True)
+                .iterator(chunk_size=10000),
+            )
+            for model in (Imovel, Anuncio, Reserva)
+        }
+        if not self.ids[Reserva]:
+            raise CommandError(
+                "Não há reservas no banco. Use --reservas para gerar os dados."
+            )
+        relatorio["escala"] = {
+            "imoveis": len(self.ids[Imovel]),
+            "anuncios": len(self.ids[Anuncio]),
+            "reservas": len(self.ids[Reserva]),
+        }
+
+        filtros = options["rotas"].split(",") if options["rotas"] else None
+        self.client = Client()
+        # IDs dos registros criados pelo benchmark, recarregados após os cadastros
+        self.criados = {}
+        # Maior ID existente antes das medições: os registros criados pelo
+        # benchmark são removidos ao final, mantendo o conjunto de dados intacto
+        self.ultimo_id = {
+            model: model.objects.aggregate(maximo=Max("id"))["maximo"] or 0
+            for model in (Imovel, Anuncio, Reserva)
+        }
+        rotas = {}
+        cache.clear()
+        try:
+            # Aceitar o host "testserver" do Client, mantendo as demais configurações
+            with override_settings(ALLOWED_HOSTS=["testserver"]):
+                for nome, metodo, requisicao, vezes, aquecimento in self.cenarios(
+                    options
+                ):
+                    if vezes < 1 or (
+                        filtros and not any(filtro in nome for filtro in filtros)
+                    ):
+                        continue
+                    self.stderr.write(f"Medindo {nome}...")
+                    rotas[nome] = self.mede(
+                        metodo, requisicao, vezes, aquecimento, nome
+                    )
+                    if metodo == "post":
+                        self.criados.clear()
+        finally:
+            self.remove_criados()
+
+        relatorio["rotas"] = rotas
+        relatorio["rss_pico_mb"] = rss_pico_mb()
+        conteudo = json.dumps(relatorio, ensure_ascii=False, indent=2)
+        if options["saida"]:
+            with open(options["saida"], "w", encoding="utf-8") as arquivo:
+                arquivo.write(conteudo + "\n")
+            self.escreve_tabela(rotas, options["comparar"])
+        else:
+            self.stdout.write(conteudo)
+            if options["comparar"]:
+                self.escreve_tabela(rotas, options["comparar"])
+
+    def limpa(self):
+        # Apagar as tabelas e reiniciar as sequências dos IDs, como o "flush"
+        tabelas = [
+            model._meta.db_table for model in (ResumoDiario, Reserva, Anuncio, Imovel)
+        ]
+        connection.ops.execute_sql_flush(
+            connection.ops.sql_flush(no_style(), tabelas, reset_sequences=True)
+        )
+        for model in (Imovel, Anuncio, Reserva):
+            invalida_listagens(model)
+
+    def remove_criados(self):
+        for model in (Reserva, Anuncio, Imovel):
+            ids = model.objects.filter(id__gt=self.ultimo_id[model]).values_list(
+                "id", flat=True
+            )
+            exclui_registros(model, list(ids))
+
+    def ids_criados(self, model):
+        # IDs criados pelas rotas (o cadastro individual não retorna o ID)
+        if model not in self.criados:
+            self.criados[model] = list(
+                model.objects.filter(id__gt=self.ultimo_id[model])
+                .order_by("id")
+                .values_list("id", flat=True)
+            )
+        if not self.criados[model]:
+            raise CommandError(
+                f"Não há registros de {model._meta.verbose_name_plural} criados "
+                'pelo benchmark. Inclua as rotas "add_" em --rotas.'
+            )
+        return self.criados[model]
+
+    def intervalo_ids(self, model):
+        # Intervalo de até IDS_POR_CONSULTA IDs existentes, ex.: "1500-1599"
+        ids = self.ids[model]
+        inicio = self.rng.randrange(max(1, len(ids) - IDS_POR_CONSULTA + 1))
+        fim = min(len(ids), inicio + IDS_POR_CONSULTA) - 1
+        return f"{ids[inicio]}-{ids[fim]}"
+
+    def cenarios(self, options):
+        """
+        Rotas medidas, na ordem de execução.
+
+        As escritas usam apenas os registros criados pelo próprio benchmark:
+        os cadastros vêm antes das alterações e das exclusões.
+
+        Yields:
+            tuple: Nome, método HTTP, função que gera (url, dados) a cada
+                requisição, quantidade de requisições e de aquecimento.
+
+        """
+        n, aquecimento = options["requisicoes"], options["aquecimento"]
+        rng = self.rng
+        listagens = [
+            ("imoveis", Imovel, "anuncios"),
+            ("anuncios", Anuncio, "imovel"),
+            ("reservas", Reserva, "anuncio,imovel"),
+        ]
+        for app, model, expand in listagens:
+            rota = reverse(f"api_{app}:get_{app}")
+            rota_async = reverse(f"api_{app}:aget_{app}")
+            yield f"get_{app}", "get", lambda r=rota: (r, None), n, aquecimento
+            # A mesma listagem servida pelo cache, medida separadamente
+            yield (
+                f"get_{app} (cache)",
+                "get",
+                em_cache(lambda r=rota: (r, None)),
+                n,
+                aquecimento,
+            )
+            yield (
+                f"get_{app} (paginação)",
+                "get",
+                self.paginacao(rota),
+                n,
+                0,
+            )
+            yield (
+                f"get_{app}?id",
+                "get",
+                lambda r=rota, m=model: (r, {"id": rng.choice(self.ids[m])}),
+                n,
+                aquecimento,
+            )
+            yield (
+                f"get_{app}?id=intervalo",
+                "get",
+                lambda r=rota, m=model: (r, {"id": self.intervalo_ids(m)}),
+                n,
+                aquecimento,
+            )
+            yield (
+                f"get_{app}?expand",
+                "get",
+                lambda r=rota, m=model, e=expand: (
+                    r,
+                    {"id": self.intervalo_ids(m), "expand": e},
+                ),
+                n,
+                aquecimento,
+            )
+            yield f"aget_{app}", "get", lambda r=rota_async: (r, None), n, aquecimento
+            yield (
+                f"aget_{app}?id=intervalo",
+                "get",
+                lambda r=rota_async, m=model: (r, {"id": self.intervalo_ids(m)}),
+                n,
+                aquecimento,
+            )
+            yield (
+                f"export_{app}",
+                "get",
+                lambda a=app: (reverse(f"api_{a}:export_{a}"), None),
+                options["requisicoes_export"],
+                0,
+            )
+
+        def disponibilidade(rota):
+            def requisicao():
+                checkin = date(2020, 1, 1) + timedelta(days=rng.randrange(1500))
+                anuncios = rng.sample(
+                    self.ids[Anuncio],
+                    min(ANUNCIOS_DISPONIBILIDADE, len(self.ids[Anuncio])),
+                )
+                return rota, {
+                    "cod_anuncio": ",".join(map(str, anuncios)),
+                    "data_checkin": checkin.isoformat(),
+                    "data_checkout": (
+                        checkin + timedelta(days=rng.randint(1, 7))
+                    ).isoformat(),
+                }
+
+            return requisicao
+
+        for nome in ("get_disponibilidade", "aget_disponibilidade"):
+            rota = reverse(f"api_reservas:{nome}")
+            yield nome, "get", disponibilidade(rota), n, aquecimento
+
+        def ocupacao(agrupar, fonte):
+            # Janela de um mês, em um período coberto pelas reservas sintéticas
+            rota = reverse("api_reservas:get_ocupacao")
+
+            def requisicao():
+                inicio = date(2020, 1, 1) + timedelta(days=rng.randrange(365))
+                return rota, {
+                    "data_inicio": inicio.isoformat(),
+                    "data_fim": (inicio + timedelta(days=30)).isoformat(),
+                    "agrupar": agrupar,
+                    "fonte": fonte,
+                }
+
+            return requisicao
+
+        for agrupar in ("imovel", "anuncio", "plataforma"):
+            yield (
+                f"get_ocupacao?agrupar={agrupar}",
+                "get",
+                ocupacao(agrupar, "reservas"),
+                n,
+                0,
+            )
+            yield (
+                f"get_ocupacao?agrupar={agrupar}&fonte=resumo",
+                "get",
+                ocupacao(agrupar, "resumo"),
+                n,
+                0,
+            )
+
+        yield from self.cenarios_escrita(n)
+
+    def paginacao(self, rota):
+        # Percorre as páginas seguindo o link "next", voltando ao início no fim
+        proxima = [rota]
+
+        def requisicao():
+            return proxima[0], None
+
+        def resposta(response):
+            proxima[0] = json.loads(response.content).get("next") or rota
+
+        requisicao.resposta = resposta
+        return requisicao
+
+    def cenarios_escrita(self, n):
+        rng = self.rng
+
+        def imovel():
+            return {
+                "limite_hospedes": rng.randint(1, 12),
+                "quantidade_banheiros": rng.randint(1, 4),
+                "aceita_animais": rng.random() < 0.35,
+                "valor_limpeza": round(rng.uniform(20, 300), 2),
+                "data_ativacao": (
+                    date(2015, 1, 1) + timedelta(days=rng.randint(0, 3650))
+                ).isoformat(),
+            }
+
+        def anuncio():
+            return {
+                "cod_imovel": rng.choice(self.ids_criados(Imovel)),
+                "plataforma": rng.choice(["airbnb", "booking", "vrbo"]),
+                "taxa_plataforma": round(rng.uniform(3, 20), 2),
+            }
+
+        # Cada reserva criada ocupa um período novo, após o da anterior
+        checkins = (
+            INICIO_RESERVAS_BENCHMARK + timedelta(days=3 * dia)
+            for dia in itertools.count()
+        )
+
+        def reserva():
+            checkin = next(checkins)
+            return {
+                "cod_anuncio": rng.choice(self.ids_criados(Anuncio)),
+                "data_checkin": checkin.isoformat(),
+                "data_checkout": (checkin + timedelta(days=2)).isoformat(),
+                "preco_total": round(rng.uniform(200, 3000), 2),
+                "comentario": "benchmark",
+                "numero_hospedes": 1,
+            }
+
+        cadastros = [
+            ("imoveis", "imovel", imovel),
+            ("anuncios", "anuncio", anuncio),
+            ("reservas", "reserva", reserva),
+        ]
+        for app, singular, dados in cadastros:
+            rota = reverse(f"api_{app}:add_{singular}")
+            rota_lote = reverse(f"api_{app}:add_{app}_lote")
+            yield f"add_{singular}", "post", lambda r=rota, d=dados: (r, d()), n, 0
+            yield (
+                f"add_{app}_lote",
+                "post",
+                lambda r=rota_lote, d=dados: (r, [d() for _ in range(ITENS_LOTE)]),
+                n,
+                0,
+            )
+
+        alteracoes = [
+            (
+                "imoveis",
+                "imovel",
+                Imovel,
+                lambda: {"limite_hospedes": rng.randint(1, 12)},
+            ),
+            (
+                "anuncios",
+                "anuncio",
+                Anuncio,
+                lambda: {"taxa_plataforma": round(rng.uniform(3, 20), 2)},
+            ),
+        ]
+        for app, singular, model, campos in alteracoes:
+            rota = reverse(f"api_{app}:alter_{singular}")
+            yield (
+                f"alter_{singular}",
+                "post",
+                lambda r=rota, m=model, c=campos: (
+                    r,
+                    {"id": rng.choice(self.ids_criados(m)), "fields": c()},
+                ),
+                n,
+                0,
+            )
+
+        # Exclusões dos registros criados, um por requisição, das reservas aos imóveis
+        exclusoes = [
+            ("reservas", "reserva", Reserva),
+            ("anuncios", "anuncio", Anuncio),
+            ("imoveis", "imovel", Imovel),
+        ]
+        for app, singular, model in exclusoes:
+            rota = reverse(f"api_{app}:del_{singular}")
+            yield (
+                f"del_{singular}",
+                "delete",
+                lambda r=rota, m=model: (r, {"id": self.ids_criados(m).pop()}),
+                n,
+                0,
+            )
+
+    def mede(self, metodo, requisicao, vezes, aquecimento, nome):
+        """
+        Executa as requisições de uma rota e resume as medições.
+
+        Cada requisição é medida do envio até a leitura completa do conteúdo
+        (inclusive das respostas em streaming). As consultas SQL são contadas
+        em todos os bancos, inclusive nas réplicas. O cache das listagens é
+        limpo antes de cada requisição, fora da medição, exceto nas rotas
+        marcadas com "em_cache".
+
+        """
+        usa_cache = getattr(requisicao, "cache", False)
+        tempos, consultas, tamanhos, erros = [], [], [], 0
+        for i in range(aquecimento + vezes):
+            url, dados = requisicao()
+            if not usa_cache:
+                caches[CACHE_LISTAGENS_ALIAS].clear()
+            contador = [0]
+
+            def conta(execute, sql, params, many, context):
+                contador[0] += 1
+                return execute(sql, params, many, context)
+
+            inicio = time.perf_counter()
+            with contextlib.ExitStack() as pilha:
+                for alias in connections:
+                    pilha.enter_context(connections[alias].execute_wrapper(conta))
+                if metodo == "get":
+                    response = self.client.get(url, dados)
+                else:
+                    response = getattr(self.client, metodo)(
+                        url, dados, content_type="application/json"
+                    )
+                if response.streaming:
+                    tamanho = sum(len(parte) for parte in response.streaming_content)
+                else:
+                    tamanho = len(response.content)
+            duracao = time.perf_counter() - inicio
+
+            if hasattr(requisicao, "resposta"):
+                requisicao.resposta(response)
+            if i < aquecimento:
+                continue
+            if response.status_code >= 400:
+                erros += 1
+                if erros == 1:
+                    self.stderr.write(
+                        f"{nome}: {response.status_code} "
+                        f"{getattr(response, 'content', b'')[:200].decode(errors='replace')}"
+                    )
+            tempos.append(duracao * 1000)
+            consultas.append(contador[0])
+            tamanhos.append(tamanho)
+
+        ordenados = sorted(tempos)
+        return {
+            "metodo": metodo.upper(),
+            "requisicoes": len(tempos),
+            "erros": erros,
+            "media_ms": round(statistics.fmean(tempos), 3),
+            "p50_ms": round(percentil(ordenados, 50), 3),
+            "p95_ms": round(percentil(ordenados, 95), 3),
+            "p99_ms": round(percentil(ordenados, 99), 3),
+            "max_ms": round(ordenados[-1], 3),
+            "req_s": round(len(tempos) / (sum(tempos) / 1000), 1),
+            "consultas_media": round(statistics.fmean(consultas), 2),
+            "consultas_max": max(consultas),
+            "bytes_media": round(statistics.fmean(tamanhos)),
+            "rss_pico_mb": rss_pico_mb(),
+        }
+
+    def escreve_tabela(self, rotas, comparar):
+        anteriores = {}
+        if comparar:
+            with open(comparar, encoding="utf-8") as arquivo:
+                anteriores = json.load(arquivo).get("rotas", {})
+        cabecalho = (
+            f"{'Rota':<32}{'p50 (ms)':>10}{'p95 (ms)':>10}{'p99 (ms)':>10}"
+            f"{'req/s':>9}{'SQL':>7}{'erros':>7}"
+        )
+        if anteriores:
+            cabecalho += f"{'Δp50':>9}{'Δp95':>9}"
+        self.stdout.write(cabecalho)
+        for nome, medicao in rotas.items():
+            linha = (
+                f"{nome:<32}{medicao['p50_ms']:>10.3f}{medicao['p95_ms']:>10.3f}"
+                f"{medicao['p99_ms']:>10.3f}{medicao['req_s']:>9.0f}"
+                f"{medicao['consultas_media']:>7.1f}{medicao['erros']:>7}"
+            )
+            anterior = anteriores.get(nome)
+            if anterior:
+                for chave in ("p50_ms", "p95_ms"):
+                    variacao = (medicao[chave] / anterior[chave] - 1) * 100
+                    linha += f"{variacao:>+8.1f}%"
+            self.stdout.write(linha)
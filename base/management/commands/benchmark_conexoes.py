@@ -0,0 +1,93 @@
+import statistics
+import time
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+# Rota padrão: a disponibilidade não usa o cache das listagens, então toda
+# requisição consulta o banco
+ROTA_PADRAO = "api_reservas:get_disponibilidade"
+PARAMETROS_PADRAO = (
+    "?cod_anuncio=1-100&data_checkin=2024-04-20&data_checkout=2024-04-23"
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara a latência das requisições abrindo uma conexão com o banco por "
+        "requisição (CONN_MAX_AGE=0) e reutilizando a conexão (CONN_MAX_AGE>0)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requisicoes", type=int, default=500, help="Requisições por cenário."
+        )
+        parser.add_argument(
+            "--url",
+            default=None,
+            help="URL consultada (padrão: disponibilidade dos anúncios 1 a 100).",
+        )
+        parser.add_argument(
+            "--database", default="default", help="Alias do banco avaliado."
+        )
+
+    def handle(self, *args, **options):
+        url = options["url"] or reverse(ROTA_PADRAO) + PARAMETROS_PADRAO
+        conexao = connections[options["database"]]
+        conn_max_age_original = conexao.settings_dict["CONN_MAX_AGE"]
+        cenarios = {
+            "Sem reutilização (CONN_MAX_AGE=0)": 0,
+            "Com reutilização (CONN_MAX_AGE=60)": 60,
+        }
+
+        try:
+            resultados = {
+                nome: self.mede(conexao, url, conn_max_age, options["requisicoes"])
+                for nome, conn_max_age in cenarios.items()
+            }
+        finally:
+            conexao.close()
+            conexao.settings_dict["CONN_MAX_AGE"] = conn_max_age_original
+
+        self.stdout.write(
+            f"{conexao.vendor} ({conexao.settings_dict['NAME']}), "
+            f"{options['requisicoes']} requisições a {url}"
+        )
+        self.stdout.write(
+            f"{'Cenário':<36}{'média (ms)':>12}{'p50 (ms)':>10}"
+            f"{'p95 (ms)':>10}{'req/s':>10}"
+        )
+        for nome, tempos in resultados.items():
+            media = statistics.fmean(tempos)
+            p50 = statistics.median(tempos)
+            p95 = statistics.quantiles(tempos, n=20)[-1]
+            self.stdout.write(
+                f"{nome:<36}{media * 1000:>12.3f}{p50 * 1000:>10.3f}"
+                f"{p95 * 1000:>10.3f}{len(tempos) / sum(tempos):>10.0f}"
+            )
+
+    def mede(self, conexao, url, conn_max_age, requisicoes):
+        # A idade máxima vale para as conexões abertas a partir daqui. O Client
+        # dispara "request_started" e "request_finished", que fecham a conexão ao
+        # final de cada requisição quando CONN_MAX_AGE=0, como no servidor
+        conexao.close()
+        conexao.settings_dict["CONN_MAX_AGE"] = conn_max_age
+        cache.clear()
+        client = Client()
+        tempos = []
+        # Aceitar o host "testserver" do Client, mantendo as demais configurações
+        with override_settings(ALLOWED_HOSTS=["testserver"]):
+            # A primeira requisição é de aquecimento e não entra nas medições
+            for _ in range(requisicoes + 1):
+                inicio = time.perf_counter()
+                response = client.get(url)
+                tempos.append(time.perf_counter() - inicio)
+                if response.status_code >= 400:
+                    raise CommandError(
+                        f"A requisição falhou ({response.status_code}): "
+                        f"{response.content[:200].decode(errors='replace')}"
+                    )
+        return tempos[1:]
@@ -0,0 +1,190 @@
+import itertools
+import random
+import statistics
+import threading
+import time
+from datetime import date, timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections, transaction
+from django.db.backends.signals import connection_created
+from api_reservas.disponibilidade import anuncio_disponivel, disponibilidade_anuncios
+from base.models import Anuncio, Reserva
+from base.signals import configura_conexao_sqlite
+from utils.exclusao import exclui_registros
+from utils.sqlite import SQLITE_PRAGMAS, aplica_pragmas
+
+# Valores padrão do SQLite (o Django já espera até 5 s por um bloqueio)
+PRAGMAS_PADRAO_SQLITE = {
+    "journal_mode": "DELETE",
+    "synchronous": "FULL",
+    "busy_timeout": 5000,
+    "mmap_size": 0,
+    "cache_size": -2000,
+}
+# Comentário das reservas criadas pelo benchmark, excluídas ao final de cada cenário
+MARCADOR = "benchmark_sqlite"
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede leituras e escritas simultâneas no SQLite com os PRAGMAs padrão e "
+        "com os de SQLITE_PRAGMAS. Use um banco de testes: reservas são criadas e "
+        "excluídas durante a execução."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--leitores", type=int, default=4)
+        parser.add_argument("--escritores", type=int, default=2)
+        parser.add_argument(
+            "--segundos", type=float, default=5.0, help="Duração de cada cenário."
+        )
+
+    def handle(self, *args, **options):
+        conexao = connections["default"]
+        if conexao.vendor != "sqlite":
+            raise CommandError('O banco "default" não é SQLite.')
+        ids_anuncios = list(Anuncio.objects.values_list("id", flat=True))
+        if not ids_anuncios:
+            raise CommandError(
+                'Nenhum anúncio cadastrado. Carregue as fixtures com "loaddata".'
+            )
+        journal_mode_original = (
+            conexao.cursor().execute("PRAGMA journal_mode").fetchone()[0]
+        )
+        conexao.close()
+
+        # PRAGMAs e modo das transações (OPTIONS["transaction_mode"]) de cada cenário
+        cenarios = {
+            "Padrão do SQLite": (PRAGMAS_PADRAO_SQLITE, "DEFERRED"),
+            "SQLITE_PRAGMAS": (SQLITE_PRAGMAS, "DEFERRED"),
+            "+ IMMEDIATE": (SQLITE_PRAGMAS, "IMMEDIATE"),
+        }
+        # Cada cenário aplica os próprios PRAGMAs às conexões das threads
+        connection_created.disconnect(configura_conexao_sqlite)
+        try:
+            resultados = {
+                nome: self.executa(pragmas, transaction_mode, ids_anuncios, options)
+                for nome, (pragmas, transaction_mode) in cenarios.items()
+            }
+        finally:
+            connection_created.connect(configura_conexao_sqlite)
+            aplica_pragmas(
+                self.conexao_aberta(conexao), {"journal_mode": journal_mode_original}
+            )
+            conexao.close()
+
+        self.stdout.write(
+            f"{options['leitores']} leitores e {options['escritores']} escritores, "
+            f"{options['segundos']:g} s por cenário ({conexao.settings_dict['NAME']})"
+        )
+        self.stdout.write(
+            f"{'Cenário':<20}{'leituras/s':>12}{'escritas/s':>12}"
+            f"{'p95 leitura (ms)':>18}{'p95 escrita (ms)':>18}"
+            f"{'bloqueios (leitura/escrita)':>29}"
+        )
+        for nome, resultado in resultados.items():
+            self.stdout.write(
+                f"{nome:<20}{resultado['leituras/s']:>12.0f}"
+                f"{resultado['escritas/s']:>12.0f}"
+                f"{resultado['p95 leitura'] * 1000:>18.2f}"
+                f"{resultado['p95 escrita'] * 1000:>18.2f}"
+                f"{resultado['bloqueios']:>29}"
+            )
+
+    def conexao_aberta(self, conexao):
+        conexao.ensure_connection()
+        return conexao
+
+    def executa(self, pragmas, transaction_mode, ids_anuncios, options):
+        # O journal_mode fica gravado no arquivo: alterá-lo uma vez, sem outras conexões
+        conexao = self.conexao_aberta(connections["default"])
+        aplica_pragmas(conexao, {"journal_mode": pragmas.get("journal_mode", "DELETE")})
+        conexao.close()
+        pragmas_conexao = {
+            nome: valor for nome, valor in pragmas.items() if nome != "journal_mode"
+        }
+
+        periodos = itertools.count()
+        tempos = {"leitura": [], "escrita": []}
+        bloqueios = []
+        fim = time.perf_counter() + options["segundos"]
+
+        def le():
+            disponibilidade_anuncios(ids_anuncios, "2024-04-20", "2024-04-23")
+            list(
+                Reserva.objects.order_by("-id").values_list(
+                    "id", "cod_anuncio", "data_checkin", "data_checkout"
+                )[:100]
+            )
+
+        def escreve():
+            # Mesmo fluxo do "add_reserva": bloquear o anúncio, verificar e salvar
+            data_checkin = date(2100, 1, 1) + timedelta(days=2 * next(periodos))
+            data_checkout = data_checkin + timedelta(days=1)
+            with transaction.atomic():
+                anuncio = (
+                    Anuncio.objects.select_for_update()
+                    .filter(id=random.choice(ids_anuncios))
+                    .first()
+                )
+                if anuncio_disponivel(anuncio.id, data_checkin, data_checkout):
+                    Reserva.objects.create(
+                        cod_anuncio=anuncio,
+                        data_checkin=data_checkin,
+                        data_checkout=data_checkout,
+                        preco_total=100,
+                        comentario=MARCADOR,
+                        numero_hospedes=1,
+                    )
+
+        def trabalha(operacao, tipo):
+            conexao = self.conexao_aberta(connections["default"])
+            aplica_pragmas(conexao, pragmas_conexao)
+            # Usado pelo backend "utils.sqlite" ao iniciar cada transação
+            conexao.transaction_mode = transaction_mode
+            try:
+                while time.perf_counter() < fim:
+                    inicio = time.perf_counter()
+                    try:
+                        operacao()
+                    except OperationalError:
+                        # "database is locked": a operação não foi concluída
+                        bloqueios.append(tipo)
+                        continue
+                    tempos[tipo].append(time.perf_counter() - inicio)
+            finally:
+                connections["default"].close()
+
+        threads = [
+            threading.Thread(target=trabalha, args=(le, "leitura"))
+            for _ in range(options["leitores"])
+        ] + [
+            threading.Thread(target=trabalha, args=(escreve, "escrita"))
+            for _ in range(options["escritores"])
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Pelo "exclui_registros", que também desconta as reservas do resumo diário
+        exclui_registros(
+            Reserva,
+            list(
+                Reserva.objects.filter(comentario=MARCADOR).values_list("id", flat=True)
+            ),
+        )
+        connections["default"].close()
+        return {
+            "leituras/s": len(tempos["leitura"]) / options["segundos"],
+            "escritas/s": len(tempos["escrita"]) / options["segundos"],
+            "p95 leitura": _p95(tempos["leitura"]),
+            "p95 escrita": _p95(tempos["escrita"]),
+            "bloqueios": f"{bloqueios.count('leitura')}/{bloqueios.count('escrita')}",
+        }
+
+
+def _p95(tempos):
+    if len(tempos) < 2:
+        return tempos[0] if tempos else 0.0
+    return statistics.quantiles(tempos, n=20)[-1]
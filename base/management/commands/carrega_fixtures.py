@@ -0,0 +1,72 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+from utils.fixtures import TAMANHO_LOTE, CarregadorFixtures, le_fixture
+
+
+class Command(BaseCommand):
+    help = (
+        "Carrega fixtures JSON ou JSON Lines grandes em lotes, lendo os arquivos "
+        "aos poucos e inserindo vários registros por comando (COPY no "
+        "PostgreSQL), em vez de salvar cada objeto como o loaddata."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "arquivos", nargs="+", help="Arquivos de fixture, em qualquer ordem."
+        )
+        parser.add_argument(
+            "--formato",
+            choices=["json", "jsonl"],
+            default=None,
+            help='Formato dos arquivos (padrão: pela extensão; ".jsonl" é JSON Lines).',
+        )
+        parser.add_argument(
+            "--lote",
+            type=int,
+            default=TAMANHO_LOTE,
+            help="Registros inseridos por transação.",
+        )
+        parser.add_argument(
+            "--adiar-indices",
+            action="store_true",
+            help="Remove os índices secundários durante a carga e os recria ao final.",
+        )
+        parser.add_argument(
+            "--database", default=DEFAULT_DB_ALIAS, help="Alias do banco de destino."
+        )
+
+    def handle(self, *args, **options):
+        if options["lote"] < 1:
+            raise CommandError("--lote deve ser maior que zero.")
+        inicio = time.perf_counter()
+        with CarregadorFixtures(
+            using=options["database"],
+            tamanho_lote=options["lote"],
+            adiar_indices=options["adiar_indices"],
+        ) as carregador:
+            for caminho in options["arquivos"]:
+                try:
+                    for objeto in le_fixture(caminho, options["formato"]):
+                        carregador.adiciona(objeto)
+                except (OSError, ValueError) as erro:
+                    raise CommandError(f"{caminho}: {erro}")
+            try:
+                contagem = carregador.finaliza()
+            except ValueError as erro:
+                raise CommandError(str(erro))
+            if carregador.indices_removidos:
+                self.stdout.write(
+                    "Recriando os índices: " + ", ".join(carregador.indices_removidos)
+                )
+        duracao = time.perf_counter() - inicio
+
+        total = sum(contagem.values())
+        for model, quantidade in contagem.items():
+            self.stdout.write(f"{model._meta.label}: {quantidade} registro(s)")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{total} registro(s) carregado(s) em {duracao:.2f} s "
+                f"({total / duracao if duracao else 0:.0f} registros/s)."
+            )
+        )
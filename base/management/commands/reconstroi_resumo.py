@@ -0,0 +1,52 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+from utils.resumo import TAMANHO_LOTE, reconstroi_resumo
+from utils.validations import converte_ids
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula o resumo diário das reservas por anúncio a partir das "
+        "reservas. Use após cargas que não disparam os signals ou para "
+        "preencher o resumo de dados já existentes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--anuncio",
+            default=None,
+            help='IDs dos anúncios, no formato das listagens (ex.: "1-50,60"; padrão: todos).',
+        )
+        parser.add_argument(
+            "--lote",
+            type=int,
+            default=TAMANHO_LOTE,
+            help="Linhas do resumo inseridas por comando.",
+        )
+        parser.add_argument(
+            "--database", default=DEFAULT_DB_ALIAS, help="Alias do banco de destino."
+        )
+
+    def handle(self, *args, **options):
+        if options["lote"] < 1:
+            raise CommandError("--lote deve ser maior que zero.")
+        anuncios = None
+        if options["anuncio"]:
+            try:
+                # Sem o limite de IDs das consultas da API
+                anuncios = converte_ids(options["anuncio"], float("inf"))
+            except ValueError as erro:
+                raise CommandError(f"--anuncio: {erro}")
+
+        inicio = time.perf_counter()
+        contagem = reconstroi_resumo(
+            anuncios, using=options["database"], tamanho_lote=options["lote"]
+        )
+        duracao = time.perf_counter() - inicio
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{contagem['linhas']} linha(s) do resumo gerada(s) a partir de "
+                f"{contagem['reservas']} reserva(s) em {duracao:.2f} s."
+            )
+        )
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.4 on 2026-10-18 15:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reserva',
+            index=models.Index(fields=['cod_anuncio', 'data_checkin', 'data_checkout'], name='reserva_anuncio_periodo_idx'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.0.4 on 2026-10-18 16:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("base", "0002_reserva_anuncio_periodo_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ResumoDiario",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("data", models.DateField()),
+                ("reservas", models.IntegerField(default=0)),
+                ("continuacoes", models.IntegerField(default=0)),
+                ("noites", models.IntegerField(default=0)),
+                (
+                    "receita",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                (
+                    "cod_anuncio",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="base.anuncio",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="resumodiario",
+            constraint=models.UniqueConstraint(
+                fields=("cod_anuncio", "data"), name="resumo_diario_anuncio_data_uniq"
+            ),
+        ),
+    ]
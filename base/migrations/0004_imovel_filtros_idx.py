@@ -0,0 +1,47 @@
+# Generated by Django 5.0.4 on 2026-10-18 16:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("base", "0003_resumodiario"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="imovel",
+            index=models.Index(
+                condition=models.Q(("aceita_animais", True)),
+                fields=["id"],
+                name="imovel_com_animais_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="imovel",
+            index=models.Index(
+                condition=models.Q(("aceita_animais", False)),
+                fields=["id"],
+                name="imovel_sem_animais_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="imovel",
+            index=models.Index(
+                fields=["quantidade_banheiros", "id"], name="imovel_banheiros_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="imovel",
+            index=models.Index(fields=["limite_hospedes"], name="imovel_hospedes_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="imovel",
+            index=models.Index(fields=["valor_limpeza"], name="imovel_limpeza_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="imovel",
+            index=models.Index(fields=["data_ativacao"], name="imovel_ativacao_idx"),
+        ),
+    ]
@@ -1,12 +1,12 @@
 from django.db import models
 from django.utils import timezone
+from utils.exclusao import ExclusaoPorConjunto
 import uuid
 
 # Create your models here.
 
 
-class Imovel(models.Model):
-    cod_imovel = models.Index(fields=["Sequence"])
+class Imovel(ExclusaoPorConjunto, models.Model):
     limite_hospedes = models.IntegerField()
     quantidade_banheiros = models.IntegerField()
     aceita_animais = models.BooleanField(default=False)
@@ -15,9 +15,33 @@ class Imovel(models.Model):
     data_criacao = models.DateTimeField(default=timezone.now)
     data_atualizacao = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Filtros da listagem (api_imoveis.serializer.FILTROS_IMOVEL). Nos
+            # filtros por igualdade, o "id" atende também a ordem da paginação
+            # por cursor. O filtro booleano é escrito como "WHERE aceita_animais",
+            # sem comparação, e só é atendido por índices parciais
+            models.Index(
+                fields=["id"],
+                condition=models.Q(aceita_animais=True),
+                name="imovel_com_animais_idx",
+            ),
+            models.Index(
+                fields=["id"],
+                condition=models.Q(aceita_animais=False),
+                name="imovel_sem_animais_idx",
+            ),
+            models.Index(
+                fields=["quantidade_banheiros", "id"], name="imovel_banheiros_idx"
+            ),
+            # Filtros por intervalo
+            models.Index(fields=["limite_hospedes"], name="imovel_hospedes_idx"),
+            models.Index(fields=["valor_limpeza"], name="imovel_limpeza_idx"),
+            models.Index(fields=["data_ativacao"], name="imovel_ativacao_idx"),
+        ]
 
-class Anuncio(models.Model):
-    cod_anuncio = models.Index(fields=["Sequence"])
+
+class Anuncio(ExclusaoPorConjunto, models.Model):
     cod_imovel = models.ForeignKey(Imovel, on_delete=models.CASCADE)
     plataforma = models.CharField(max_length=100)
     taxa_plataforma = models.DecimalField(max_digits=10, decimal_places=2)
@@ -25,7 +49,7 @@ class Anuncio(models.Model):
     data_atualizacao = models.DateTimeField(auto_now=True)
 
 
-class Reserva(models.Model):
+class Reserva(ExclusaoPorConjunto, models.Model):
     cod_reserva = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     cod_anuncio = models.ForeignKey(Anuncio, on_delete=models.CASCADE)
     data_checkin = models.DateField()
@@ -35,3 +59,38 @@ class Reserva(models.Model):
     numero_hospedes = models.IntegerField()
     data_criacao = models.DateTimeField(default=timezone.now)
     data_atualizacao = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Atende a consulta de sobreposição de períodos por anúncio
+            models.Index(
+                fields=["cod_anuncio", "data_checkin", "data_checkout"],
+                name="reserva_anuncio_periodo_idx",
+            ),
+        ]
+
+
+class ResumoDiario(models.Model):
+    # Métricas das reservas de um anúncio em um dia, mantidas por utils.resumo
+    cod_anuncio = models.ForeignKey(
+        Anuncio,
+        on_delete=models.CASCADE,
+        # A restrição única (cod_anuncio, data) já atende as consultas pelo anúncio
+        db_index=False,
+    )
+    data = models.DateField()
+    # Reservas com check-in no dia, inclusive as sem pernoite
+    reservas = models.IntegerField(default=0)
+    # Reservas que ocupam a noite do dia e começaram em um dia anterior
+    continuacoes = models.IntegerField(default=0)
+    # Reservas que ocupam a noite do dia
+    noites = models.IntegerField(default=0)
+    # Parte do preço das reservas atribuída ao dia
+    receita = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["cod_anuncio", "data"], name="resumo_diario_anuncio_data_uniq"
+            ),
+        ]
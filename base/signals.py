@@ -0,0 +1,105 @@
+from django.db.backends.signals import connection_created
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from base.models import Anuncio, Imovel, Reserva
+from utils.cache import invalida_listagens
+from utils.exclusao import (
+    exclusao_por_conjunto,
+    post_delete_conjunto,
+    pre_delete_conjunto,
+)
+from utils.metricas import instala_medicao
+from utils.resumo import CAMPOS_RESERVA, atualiza_resumo, dados_reserva, dados_salvos
+from utils.sqlite import aplica_pragmas
+
+
+@receiver(post_save, sender=Imovel)
+@receiver(post_save, sender=Anuncio)
+@receiver(post_save, sender=Reserva)
+def invalida_cache_ao_salvar(sender, **kwargs):
+    # Invalidar as listagens que dependem do model alterado
+    invalida_listagens(sender)
+
+
+@receiver(post_delete, sender=Imovel)
+@receiver(post_delete, sender=Anuncio)
+@receiver(post_delete, sender=Reserva)
+def invalida_cache_ao_excluir(sender, origin=None, **kwargs):
+    # As exclusões em cascata de Imovel -> Anuncio -> Reserva disparam este
+    # receiver para cada registro excluído; basta invalidar uma vez por model
+    # em cada "delete()", e "exclui_registros" invalida pelo sinal por conjunto
+    if exclusao_por_conjunto(sender):
+        return
+    invalidados = (
+        vars(origin).setdefault("_listagens_invalidadas", set())
+        if origin is not None
+        else set()
+    )
+    if sender not in invalidados:
+        invalidados.add(sender)
+        invalida_listagens(sender)
+
+
+@receiver(post_delete_conjunto, sender=Imovel)
+@receiver(post_delete_conjunto, sender=Anuncio)
+@receiver(post_delete_conjunto, sender=Reserva)
+def invalida_cache_ao_excluir_conjunto(sender, **kwargs):
+    invalida_listagens(sender)
+
+
+@receiver(pre_save, sender=Reserva)
+def guarda_reserva_anterior(
+    sender, instance, using, raw=False, update_fields=None, **kwargs
+):
+    # Guardar os valores gravados antes da alteração, descontados do resumo diário
+    # no "post_save"; um "update_fields" sem os campos do resumo não o altera.
+    # Fixtures ("raw") não atualizam o resumo, que é recalculado pelo
+    # "reconstroi_resumo", e um cadastro não tem valores anteriores a consultar
+    if raw:
+        return
+    campos = {"cod_anuncio", *CAMPOS_RESERVA}
+    if instance._state.adding:
+        instance._resumo_removidas = []
+    elif update_fields is None or campos & set(update_fields):
+        instance._resumo_removidas = dados_salvos(instance, using)
+
+
+@receiver(post_save, sender=Reserva)
+def atualiza_resumo_ao_salvar(sender, instance, using, **kwargs):
+    removidas = instance.__dict__.pop("_resumo_removidas", None)
+    if removidas is not None:
+        atualiza_resumo([dados_reserva(instance)], removidas, using)
+
+
+@receiver(pre_delete, sender=Reserva)
+def atualiza_resumo_ao_excluir(sender, instance, using, origin=None, **kwargs):
+    # Na exclusão em cascata de um anúncio ou imóvel, as linhas do resumo dos
+    # anúncios também são excluídas e não precisam ser descontadas
+    if exclusao_por_conjunto(sender):
+        return
+    if isinstance(origin, QuerySet):
+        origin = origin.model
+    if origin is None or origin._meta.model is Reserva:
+        atualiza_resumo(removidas=[dados_reserva(instance)], using=using)
+
+
+@receiver(pre_delete_conjunto, sender=Reserva)
+def atualiza_resumo_ao_excluir_conjunto(sender, registros, using, origin, **kwargs):
+    # Mesmo desconto de "atualiza_resumo_ao_excluir", com uma consulta por lote
+    if origin is Reserva:
+        atualiza_resumo(
+            removidas=registros.values_list(*CAMPOS_RESERVA).iterator(), using=using
+        )
+
+
+@receiver(connection_created)
+def configura_conexao_sqlite(sender, connection, **kwargs):
+    # Aplicar os PRAGMAs de SQLITE_PRAGMAS (WAL, synchronous, ...) a cada nova conexão
+    aplica_pragmas(connection)
+
+
+@receiver(connection_created)
+def mede_consultas_conexao(sender, connection, **kwargs):
+    # Contar as consultas e o tempo de SQL de cada requisição (utils.metricas)
+    instala_medicao(connection)
@@ -1,3 +1,26 @@
-from django.shortcuts import render
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from utils.metricas import registro_metricas
 
-# Create your views here.
+
+@api_view(["GET"])
+def metricas(request):
+    """
+    View que retorna os histogramas de desempenho por rota deste processo.
+
+    Para cada rota ("MÉTODO app:view") são retornados os histogramas do tempo
+    total, do tempo de SQL, de serialização e de renderização (em ms) e da
+    quantidade de consultas. "le" contém a quantidade acumulada de requisições
+    com valor menor ou igual a cada limite.
+
+    Args:
+        request (Request): Requisição HTTP.
+
+    Returns:
+        Response: Uma resposta HTTP com os histogramas de cada rota.
+
+    Examples:
+        caminho_da_api.com/metricas/
+
+    """
+    return Response(data={"rotas": registro_metricas.como_dict()})
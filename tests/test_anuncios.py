@@ -1,14 +1,22 @@
+import json
+from django.core.cache import cache
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
+from api_anuncios.serializer import AnuncioSerializer
 from base.models import Anuncio, Imovel
 
 
 class AnuncioAPITests(APITestCase):
     def setUp(self):
+        # Evitar que respostas em cache de um teste sejam usadas por outro
+        cache.clear()
         self.add_anuncio_url = reverse("api_anuncios:add_anuncio")
+        self.add_anuncios_lote_url = reverse("api_anuncios:add_anuncios_lote")
         self.get_anuncios_url = reverse("api_anuncios:get_anuncios")
         self.alter_anuncio_url = reverse("api_anuncios:alter_anuncio")
+        self.del_anuncio_url = reverse("api_anuncios:del_anuncio")
+        self.export_anuncios_url = reverse("api_anuncios:export_anuncios")
 
         self.imovel = Imovel.objects.create(
             limite_hospedes=4,
@@ -27,6 +35,26 @@ class AnuncioAPITests(APITestCase):
         response = self.client.post(self.add_anuncio_url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_add_anuncios_lote_erros_por_item_success(self):
+        data = [
+            {
+                "cod_imovel": self.imovel.id,
+                "plataforma": "airbnb",
+                "taxa_plataforma": 99.99,
+            },
+            # Imóvel inexistente
+            {"cod_imovel": 999999, "plataforma": "booking", "taxa_plataforma": 9.9},
+            # Campo obrigatório faltando
+            {"cod_imovel": self.imovel.id, "taxa_plataforma": 9.9},
+        ]
+        # Uma consulta para os imóveis e um único INSERT, dentro da transação
+        with self.assertNumQueries(4):
+            response = self.client.post(self.add_anuncios_lote_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["criados"], 1)
+        self.assertEqual(list(response.data["erros"].keys()), ["1", "2"])
+        self.assertEqual(Anuncio.objects.get().id, response.data["ids"][0])
+
     def test_get_anuncios_success(self):
         anuncio = Anuncio.objects.create(
             cod_imovel=self.imovel,
@@ -46,6 +74,27 @@ class AnuncioAPITests(APITestCase):
         response = self.client.get(url_param)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_export_anuncios_success(self):
+        for plataforma in ("airbnb", "booking", "vrbo"):
+            Anuncio.objects.create(
+                cod_imovel=self.imovel,
+                plataforma=plataforma,
+                taxa_plataforma=99.99,
+            )
+        response = self.client.get(self.export_anuncios_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+
+        # O conteúdo em streaming deve ser igual à serialização completa
+        conteudo = b"".join(response.streaming_content)
+        esperado = AnuncioSerializer(Anuncio.objects.order_by("id"), many=True).data
+        self.assertEqual(json.loads(conteudo), json.loads(json.dumps(esperado)))
+
+    def test_export_anuncios_vazio_success(self):
+        response = self.client.get(self.export_anuncios_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b"".join(response.streaming_content), b"[]")
+
     def test_alter_anuncio_success(self):
         anuncio = Anuncio.objects.create(
             cod_imovel=self.imovel,
@@ -64,6 +113,41 @@ class AnuncioAPITests(APITestCase):
             Anuncio.objects.get(id=anuncio.id).plataforma, "outra plataforma"
         )
 
+    def test_alter_anuncio_resposta_atualizada_success(self):
+        anuncio = Anuncio.objects.create(
+            cod_imovel=self.imovel,
+            plataforma="airbnb",
+            taxa_plataforma=99.99,
+        )
+        data = {
+            "id": anuncio.id,
+            "fields": {
+                "taxa_plataforma": 15.0,
+            },
+        }
+        response = self.client.post(self.alter_anuncio_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # A resposta já reflete o registro salvo no banco
+        anuncio.refresh_from_db()
+        self.assertEqual(response.data[0]["taxa_plataforma"], "15.00")
+        self.assertEqual(response.data[0]["plataforma"], "airbnb")
+        self.assertEqual(
+            response.data[0]["data_atualizacao"],
+            anuncio.data_atualizacao.isoformat().replace("+00:00", "Z"),
+        )
+
+    def test_del_anuncio_success(self):
+        anuncio = Anuncio.objects.create(
+            cod_imovel=self.imovel,
+            plataforma="airbnb",
+            taxa_plataforma=99.99,
+        )
+        data = {"id": [anuncio.id]}
+        response = self.client.delete(self.del_anuncio_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(Anuncio.objects.exists())
+        self.assertTrue(Imovel.objects.exists())
+
     """
 
     TESTES DE FALHAS
@@ -92,6 +176,17 @@ class AnuncioAPITests(APITestCase):
         response = self.client.post(self.add_anuncio_url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_add_anuncio_imovel_inexistente_failure(self):
+        # cod_imovel que não existe no banco de dados
+        data = {
+            "cod_imovel": 999999,
+            "plataforma": "airbnb",
+            "taxa_plataforma": 10.05,
+        }
+        response = self.client.post(self.add_anuncio_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Anuncio.objects.exists())
+
     # TESTES ADD ANUNCIO - FIM - FAILURE
 
     # TESTES GET ANUNCIO - INICIO - FAILURE
@@ -108,6 +203,15 @@ class AnuncioAPITests(APITestCase):
 
     # TESTES GET ANUNCIO - FIM - FAILURE
 
+    # TESTES DEL ANUNCIO - INICIO - FAILURE
+    def test_del_anuncio_failure(self):
+        # Tentando excluir um anuncio que não existe
+        data = {"id": 999999}
+        response = self.client.delete(self.del_anuncio_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    # TESTES DEL ANUNCIO - FIM - FAILURE
+
     # TESTES ALTER ANUNCIO - INICIO - FAILURE
     def test_alter_anuncio_not_exist_failure(self):
         # Tentando alterar um anuncio que não existe
@@ -163,5 +267,11 @@ class AnuncioAPITests(APITestCase):
         }
         response = self.client.post(self.alter_anuncio_url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(
+            response.data["error"].startswith(
+                "Registro não atualizado! Os campos a seguir não existem na tabela "
+                "Anuncio: 'campo_inexistente'."
+            )
+        )
 
     # TESTES ALTER ANUNCIO - FIM - FAILURE
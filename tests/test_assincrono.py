@@ -0,0 +1,168 @@
+import json
+import msgpack
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.pagination import CursorPagination
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+from base.models import Anuncio, Imovel, Reserva
+from utils.paginacao import PaginacaoCursor
+
+
+class ListagensAsyncAPITests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.imovel = Imovel.objects.create(
+            limite_hospedes=4,
+            quantidade_banheiros=1,
+            aceita_animais=True,
+            valor_limpeza=20.0,
+            data_ativacao="2022-01-01",
+        )
+        self.anuncio = Anuncio.objects.create(
+            cod_imovel=self.imovel, plataforma="airbnb", taxa_plataforma=10.0
+        )
+        Reserva.objects.bulk_create(
+            Reserva(
+                cod_anuncio=self.anuncio,
+                data_checkin="2024-04-20",
+                data_checkout="2024-04-23",
+                preco_total=25.99,
+                comentario="meu comentario",
+                numero_hospedes=2,
+            )
+            for _ in range(5)
+        )
+
+    def assertMesmaResposta(self, rota_sync, rota_async, parametros=""):
+        # A view assíncrona deve responder exatamente como a síncrona
+        esperado = self.client.get(reverse(rota_sync) + parametros)
+        response = self.client.get(reverse(rota_async) + parametros)
+        self.assertEqual(response.status_code, esperado.status_code)
+        self.assertEqual(response["Content-Type"], esperado["Content-Type"])
+        self.assertEqual(response.content, esperado.content)
+        return response
+
+    def test_aget_listagens_success(self):
+        for app, plural in (
+            ("api_imoveis", "imoveis"),
+            ("api_anuncios", "anuncios"),
+            ("api_reservas", "reservas"),
+        ):
+            with self.subTest(plural=plural):
+                self.assertMesmaResposta(f"{app}:get_{plural}", f"{app}:aget_{plural}")
+
+    def test_aget_reservas_paginacao_cursor_success(self):
+        ids_retornados = []
+        url = reverse("api_reservas:aget_reservas") + "?limite=2"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            dados = json.loads(response.content)
+            ids_retornados += [registro["id"] for registro in dados["results"]]
+            url = dados["next"]
+        self.assertEqual(
+            ids_retornados,
+            list(Reserva.objects.order_by("id").values_list("id", flat=True)),
+        )
+
+    def percorre_paginas(self, url):
+        # IDs de cada página seguindo "next" até o fim e depois "previous" até o início
+        paginas, voltando = [], []
+        for direcao, destino in (("next", paginas), ("previous", voltando)):
+            while url:
+                dados = json.loads(self.client.get(url).content)
+                destino.append([registro["id"] for registro in dados["results"]])
+                url = dados[direcao]
+            url = dados["previous"] if direcao == "next" else None
+        return paginas, voltando
+
+    def test_aget_reservas_cursor_anterior_success(self):
+        for parametros in ("?limite=2", "?limite=2&expand=anuncio"):
+            with self.subTest(parametros=parametros):
+                paginas, voltando = self.percorre_paginas(
+                    reverse("api_reservas:aget_reservas") + parametros
+                )
+                self.assertEqual(voltando, paginas[-2::-1])
+                self.assertEqual(
+                    (paginas, voltando),
+                    self.percorre_paginas(
+                        reverse("api_reservas:get_reservas") + parametros
+                    ),
+                )
+
+    def test_aget_reservas_mesmos_links_do_drf_success(self):
+        # Os links devem ser os mesmos do "paginate_queryset" original do DRF
+        class PaginacaoDRF(CursorPagination):
+            ordering = PaginacaoCursor.ordering
+            page_size_query_param = PaginacaoCursor.page_size_query_param
+
+        fabrica = APIRequestFactory()
+        registros = Reserva.objects.all()
+        url = "/?limite=2"
+        while url:
+            request = Request(fabrica.get(url))
+            drf, paginador = PaginacaoDRF(), PaginacaoCursor()
+            esperado = [r.id for r in drf.paginate_queryset(registros, request)]
+            pagina = [r.id for r in paginador.paginate_queryset(registros, request)]
+            self.assertEqual(pagina, esperado)
+            self.assertEqual(paginador.get_next_link(), drf.get_next_link())
+            self.assertEqual(paginador.get_previous_link(), drf.get_previous_link())
+            url = drf.get_next_link()
+
+    def test_aget_reservas_ids_expand_success(self):
+        ids = ",".join(
+            str(id_reserva)
+            for id_reserva in Reserva.objects.values_list("id", flat=True)
+        )
+        self.assertMesmaResposta(
+            "api_reservas:get_reservas",
+            "api_reservas:aget_reservas",
+            f"?id={ids}&expand=anuncio,imovel",
+        )
+
+    def test_aget_reservas_colunar_success(self):
+        response = self.assertMesmaResposta(
+            "api_reservas:get_reservas", "api_reservas:aget_reservas", "?format=colunar"
+        )
+        self.assertEqual(json.loads(response.content)["results"]["linhas"], 5)
+
+    def test_aget_reservas_msgpack_success(self):
+        self.assertMesmaResposta(
+            "api_reservas:get_reservas", "api_reservas:aget_reservas", "?format=msgpack"
+        )
+
+    def test_aget_disponibilidade_success(self):
+        self.assertMesmaResposta(
+            "api_reservas:get_disponibilidade",
+            "api_reservas:aget_disponibilidade",
+            f"?cod_anuncio={self.anuncio.id}"
+            + "&data_checkin=2024-04-22&data_checkout=2024-04-24",
+        )
+
+    def test_aget_reservas_id_inexistente_failure(self):
+        response = self.assertMesmaResposta(
+            "api_reservas:get_reservas", "api_reservas:aget_reservas", "?id=999999"
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_aget_reservas_expand_invalido_failure(self):
+        response = self.assertMesmaResposta(
+            "api_reservas:get_reservas",
+            "api_reservas:aget_reservas",
+            "?expand=inexistente",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_aget_disponibilidade_campos_faltantes_failure(self):
+        response = self.assertMesmaResposta(
+            "api_reservas:get_disponibilidade",
+            "api_reservas:aget_disponibilidade",
+            f"?cod_anuncio={self.anuncio.id}",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_aget_reservas_metodo_invalido_failure(self):
+        response = self.client.post(reverse("api_reservas:aget_reservas"))
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
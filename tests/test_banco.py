@@ -0,0 +1,67 @@
+from pathlib import Path
+from unittest import mock
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+from API_Khanto.banco import banco_padrao, bancos_replicas
+
+BASE_DIR = Path("/app")
+
+
+class BancoPadraoTests(SimpleTestCase):
+    def test_desenvolvimento_sqlite_success(self):
+        banco = banco_padrao("desenvolvimento", {}, BASE_DIR)
+        self.assertEqual(banco["ENGINE"], "utils.sqlite")
+        self.assertEqual(banco["OPTIONS"], {"transaction_mode": "IMMEDIATE"})
+        self.assertEqual(banco["NAME"], BASE_DIR / "db.sqlite3")
+        self.assertEqual(banco["CONN_MAX_AGE"], 0)
+
+    def test_producao_conexoes_persistentes_success(self):
+        banco = banco_padrao(
+            "producao",
+            {"DB_NAME": "reservas", "DB_HOST": "db", "DB_CONN_MAX_AGE": "300"},
+            BASE_DIR,
+        )
+        self.assertEqual(banco["ENGINE"], "django.db.backends.postgresql")
+        self.assertEqual(banco["NAME"], "reservas")
+        self.assertEqual(banco["HOST"], "db")
+        self.assertEqual(banco["CONN_MAX_AGE"], 300)
+        self.assertTrue(banco["CONN_HEALTH_CHECKS"])
+        self.assertNotIn("pool", banco["OPTIONS"])
+
+    @mock.patch("API_Khanto.banco.django.VERSION", (5, 1, 0, "final", 0))
+    def test_producao_pool_success(self):
+        banco = banco_padrao(
+            "producao", {"DB_POOL_MAX_SIZE": "20", "DB_CONN_MAX_AGE": "60"}, BASE_DIR
+        )
+        # O pool substitui as conexões persistentes
+        self.assertEqual(banco["CONN_MAX_AGE"], 0)
+        self.assertEqual(
+            banco["OPTIONS"]["pool"], {"min_size": 2, "max_size": 20, "timeout": 10}
+        )
+
+    @mock.patch("API_Khanto.banco.django.VERSION", (5, 0, 4, "final", 0))
+    def test_producao_pool_django_antigo_failure(self):
+        with self.assertRaises(ImproperlyConfigured):
+            banco_padrao("producao", {"DB_POOL_MAX_SIZE": "20"}, BASE_DIR)
+
+    def test_variaveis_invalidas_failure(self):
+        with self.assertRaises(ImproperlyConfigured):
+            banco_padrao("homologacao", {}, BASE_DIR)
+        with self.assertRaises(ImproperlyConfigured):
+            banco_padrao("producao", {"DB_CONN_MAX_AGE": "muito"}, BASE_DIR)
+
+    def test_replicas_success(self):
+        banco = banco_padrao("producao", {"DB_HOST": "principal"}, BASE_DIR)
+        bancos, pesos = bancos_replicas(
+            {"DB_REPLICAS": "replica-1=3, replica-2"}, banco
+        )
+        self.assertEqual(pesos, {"replica_1": 3, "replica_2": 1})
+        self.assertEqual(bancos["replica_1"]["HOST"], "replica-1")
+        self.assertEqual(bancos["replica_2"]["NAME"], banco["NAME"])
+        self.assertEqual(bancos["replica_2"]["TEST"], {"MIRROR": "default"})
+
+        # No SQLite, cada réplica é um arquivo
+        banco = banco_padrao("desenvolvimento", {}, BASE_DIR)
+        bancos, _ = bancos_replicas({"DB_REPLICAS": "/tmp/replica.sqlite3"}, banco)
+        self.assertEqual(bancos["replica_1"]["NAME"], "/tmp/replica.sqlite3")
+        self.assertEqual(bancos_replicas({}, banco), ({}, {}))
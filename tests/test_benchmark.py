@@ -0,0 +1,113 @@
+import json
+import random
+import tempfile
+from io import StringIO
+from pathlib import Path
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase
+from base.management.commands.benchmark_api import percentil, quantidade
+from base.models import Anuncio, Imovel, Reserva
+from utils.sinteticos import carrega_dados_sinteticos, gera_reservas
+
+
+class DadosSinteticosTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_carrega_dados_sinteticos_success(self):
+        self.assertEqual(
+            carrega_dados_sinteticos(1000, tamanho_lote=300),
+            {"imoveis": 20, "anuncios": 45, "reservas": 1000},
+        )
+        self.assertEqual(Reserva.objects.count(), 1000)
+        self.assertEqual(Anuncio.objects.count(), 45)
+        # Reservas de um mesmo anúncio não se sobrepõem
+        anterior = {}
+        for reserva in Reserva.objects.order_by("cod_anuncio", "data_checkin"):
+            if reserva.cod_anuncio_id in anterior:
+                self.assertGreaterEqual(
+                    reserva.data_checkin, anterior[reserva.cod_anuncio_id]
+                )
+            self.assertGreater(reserva.data_checkout, reserva.data_checkin)
+            anterior[reserva.cod_anuncio_id] = reserva.data_checkout
+
+    def test_gera_reservas_reproduzivel_success(self):
+        anuncios = [(1, 4, 50), (2, 2, 80)]
+        primeira = list(gera_reservas(random.Random(7), anuncios, 11))
+        segunda = list(gera_reservas(random.Random(7), anuncios, 11))
+        self.assertEqual(primeira, segunda)
+        self.assertEqual([r["cod_anuncio_id"] for r in primeira].count(1), 6)
+
+
+class BenchmarkApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_benchmark_api_success(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            saida = Path(diretorio) / "relatorio.json"
+            call_command(
+                "benchmark_api",
+                reservas=500,
+                requisicoes=2,
+                requisicoes_export=1,
+                aquecimento=0,
+                saida=str(saida),
+                stdout=StringIO(),
+                stderr=StringIO(),
+            )
+            relatorio = json.loads(saida.read_text(encoding="utf-8"))
+
+        self.assertEqual(relatorio["escala"]["reservas"], 500)
+        for nome in (
+            "get_imoveis",
+            "aget_anuncios?id=intervalo",
+            "export_reservas",
+            "get_disponibilidade",
+            "get_ocupacao?agrupar=plataforma",
+            "add_reservas_lote",
+            "alter_anuncio",
+            "del_imovel",
+        ):
+            self.assertIn(nome, relatorio["rotas"])
+        for nome, medicao in relatorio["rotas"].items():
+            self.assertEqual(medicao["erros"], 0, nome)
+            self.assertLessEqual(medicao["p50_ms"], medicao["p99_ms"])
+        # Sem o cache, toda requisição consulta os registros; com ele, apenas a primeira
+        rotas = relatorio["rotas"]
+        self.assertEqual(
+            rotas["get_imoveis"]["consultas_media"],
+            rotas["get_imoveis"]["consultas_max"],
+        )
+        self.assertLess(
+            rotas["get_imoveis (cache)"]["consultas_media"],
+            rotas["get_imoveis"]["consultas_media"],
+        )
+        # Os registros criados pelas rotas de escrita são removidos ao final
+        self.assertEqual(Imovel.objects.count(), relatorio["escala"]["imoveis"])
+        self.assertEqual(Reserva.objects.count(), 500)
+
+    def test_benchmark_api_sem_dados_failure(self):
+        with self.assertRaises(CommandError):
+            call_command("benchmark_api", stdout=StringIO(), stderr=StringIO())
+
+
+class BenchmarkFuncoesTests(SimpleTestCase):
+    def test_quantidade_success(self):
+        self.assertEqual(quantidade("1k"), 1000)
+        self.assertEqual(quantidade("2.5M"), 2_500_000)
+        self.assertEqual(quantidade("300"), 300)
+
+    def test_quantidade_failure(self):
+        for texto in ("abc", "0", "-1k"):
+            with self.assertRaises(ValueError):
+                quantidade(texto)
+
+    def test_percentil_success(self):
+        valores = list(range(1, 101))
+        self.assertEqual(percentil(valores, 50), 50)
+        self.assertEqual(percentil(valores, 95), 95)
+        self.assertEqual(percentil(valores, 99), 99)
+        self.assertEqual(percentil([3], 99), 3)
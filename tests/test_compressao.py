@@ -0,0 +1,93 @@
+import gzip
+import json
+import unittest
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from base.models import Anuncio, Imovel, Reserva
+from utils.compressao import brotli, escolhe_codificacao
+
+
+class EscolheCodificacaoTests(SimpleTestCase):
+    def test_escolhe_codificacao_success(self):
+        self.assertEqual(escolhe_codificacao("gzip, deflate"), "gzip")
+        self.assertEqual(escolhe_codificacao("br;q=0.5, gzip;q=0.8"), "gzip")
+        self.assertIsNone(escolhe_codificacao(""))
+        self.assertIsNone(escolhe_codificacao("gzip;q=0, identity"))
+        if brotli:
+            self.assertEqual(escolhe_codificacao("gzip, deflate, br"), "br")
+            self.assertEqual(escolhe_codificacao("*"), "br")
+
+
+class CompressaoAPITests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.get_reservas_url = reverse("api_reservas:get_reservas")
+        self.export_reservas_url = reverse("api_reservas:export_reservas")
+        imovel = Imovel.objects.create(
+            limite_hospedes=4,
+            quantidade_banheiros=1,
+            aceita_animais=True,
+            valor_limpeza=20.0,
+            data_ativacao="2022-01-01",
+        )
+        anuncio = Anuncio.objects.create(
+            cod_imovel=imovel, plataforma="airbnb", taxa_plataforma=10.0
+        )
+        Reserva.objects.bulk_create(
+            Reserva(
+                cod_anuncio=anuncio,
+                data_checkin="2024-04-20",
+                data_checkout="2024-04-23",
+                preco_total=25.99,
+                comentario="meu comentario",
+                numero_hospedes=2,
+            )
+            for _ in range(50)
+        )
+
+    def test_get_reservas_gzip_success(self):
+        esperado = self.client.get(self.get_reservas_url).content
+        response = self.client.get(self.get_reservas_url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertLess(len(response.content), len(esperado))
+        self.assertEqual(gzip.decompress(response.content), esperado)
+
+    @unittest.skipIf(brotli is None, "brotli não instalado")
+    def test_get_reservas_brotli_success(self):
+        esperado = self.client.get(self.get_reservas_url).content
+        response = self.client.get(
+            self.get_reservas_url, HTTP_ACCEPT_ENCODING="gzip, deflate, br"
+        )
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(response.content), esperado)
+
+    def test_get_reservas_pequena_sem_compressao_success(self):
+        url_param = self.get_reservas_url + "?limite=1"
+        response = self.client.get(url_param, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_get_reservas_etag_comprimido_success(self):
+        response = self.client.get(self.get_reservas_url, HTTP_ACCEPT_ENCODING="gzip")
+        etag = response["ETag"]
+        self.assertTrue(etag.startswith('W/"'))
+        response = self.client.get(
+            self.get_reservas_url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_export_reservas_gzip_em_pedacos_success(self):
+        response = self.client.get(
+            self.export_reservas_url, HTTP_ACCEPT_ENCODING="gzip"
+        )
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        pedacos = list(response.streaming_content)
+        # Cada pedaço comprimido pode ser enviado ao cliente antes do próximo
+        self.assertGreater(len(pedacos), 2)
+        registros = json.loads(gzip.decompress(b"".join(pedacos)))
+        self.assertEqual(len(registros), 50)
@@ -0,0 +1,189 @@
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count, Max
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, APITestCase
+from api_imoveis.serializer import FILTROS_IMOVEL
+from base.models import Imovel
+from utils.condicional import querysets_listagem
+
+
+class FiltrosImoveisTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.get_imoveis_url = reverse("api_imoveis:get_imoveis")
+        self.imoveis = [
+            Imovel.objects.create(
+                limite_hospedes=hospedes,
+                quantidade_banheiros=banheiros,
+                aceita_animais=animais,
+                valor_limpeza=limpeza,
+                data_ativacao=ativacao,
+            )
+            for hospedes, banheiros, animais, limpeza, ativacao in (
+                (2, 1, False, 10.00, "2021-01-10"),
+                (4, 1, True, 25.50, "2022-06-01"),
+                (6, 2, True, 40.00, "2023-03-15"),
+                (8, 3, False, 60.00, "2024-01-20"),
+            )
+        ]
+
+    def ids_filtrados(self, url, parametros):
+        response = self.client.get(url, parametros)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # Com "id" a resposta é uma lista; sem ele, uma página
+        dados = response.json()
+        if isinstance(dados, dict):
+            dados = dados["results"]
+        return [registro["id"] for registro in dados]
+
+    def test_get_imoveis_filtros_success(self):
+        ids = [imovel.id for imovel in self.imoveis]
+        for parametros, esperados in (
+            ({"limite_hospedes_min": 6}, ids[2:]),
+            ({"aceita_animais": "true"}, ids[1:3]),
+            ({"aceita_animais": "0"}, [ids[0], ids[3]]),
+            ({"quantidade_banheiros": 1}, ids[:2]),
+            ({"valor_limpeza_min": "25.50", "valor_limpeza_max": "60"}, ids[1:]),
+            ({"data_ativacao_max": "2022-06-01"}, ids[:2]),
+            (
+                {
+                    "data_ativacao_min": "2022-01-01",
+                    "limite_hospedes_min": 4,
+                    "aceita_animais": "false",
+                },
+                ids[3:],
+            ),
+            # Os filtros combinam com o parâmetro "id"
+            ({"id": f"{ids[0]}-{ids[2]}", "aceita_animais": "true"}, ids[1:3]),
+        ):
+            self.assertEqual(
+                self.ids_filtrados(self.get_imoveis_url, parametros), esperados
+            )
+            self.assertEqual(
+                self.ids_filtrados(reverse("api_imoveis:aget_imoveis"), parametros),
+                esperados,
+            )
+
+    def test_get_imoveis_filtros_paginacao_success(self):
+        response = self.client.get(
+            self.get_imoveis_url, {"limite_hospedes_min": 4, "limite": 1}
+        )
+        self.assertEqual(len(response.data["results"]), 1)
+        # O link da próxima página mantém os filtros
+        self.assertIn("limite_hospedes_min=4", response.data["next"])
+        ids = []
+        url = response.data["next"]
+        while url:
+            response = self.client.get(url)
+            ids += [registro["id"] for registro in response.data["results"]]
+            url = response.data["next"]
+        self.assertEqual(ids, [imovel.id for imovel in self.imoveis[2:]])
+
+    def test_get_imoveis_filtros_cache_e_etag_success(self):
+        response = self.client.get(self.get_imoveis_url, {"aceita_animais": "true"})
+        etag = response["ETag"]
+        # Cada filtro tem a sua resposta em cache e o seu ETag
+        response = self.client.get(self.get_imoveis_url, {"aceita_animais": "false"})
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(response.data["results"]), 2)
+
+        response = self.client.get(
+            self.get_imoveis_url, {"aceita_animais": "true"}, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # Uma alteração em um imóvel filtrado muda o ETag
+        self.imoveis[1].save()
+        response = self.client.get(
+            self.get_imoveis_url, {"aceita_animais": "true"}, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_get_imoveis_filtros_failure(self):
+        for parametros in (
+            {"limite_hospedes_min": "quatro"},
+            {"aceita_animais": "talvez"},
+            {"valor_limpeza_max": "1.001"},
+            {"data_ativacao_min": "01-01-2022"},
+        ):
+            response = self.client.get(self.get_imoveis_url, parametros)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn(next(iter(parametros)), response.data["error"])
+
+        response = self.client.get(self.get_imoveis_url, {"limite_hospedes_min": 99})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertIn("filtros", response.data["error"])
+
+
+class IndicesFiltrosImoveisTests(APITestCase):
+    """
+    Verifica, pelo plano de execução do SQLite (EXPLAIN QUERY PLAN), que as
+    consultas dos filtros de "get_imoveis" usam os índices de Imovel.
+
+    """
+
+    def setUp(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("Os planos verificados são os do SQLite.")
+
+    def plano(self, sql, parametros=()):
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", parametros)
+            return " | ".join(linha[-1] for linha in cursor.fetchall())
+
+    def plano_queryset(self, registros):
+        return self.plano(*registros.query.sql_with_params())
+
+    def filtrados(self, parametros):
+        request = APIRequestFactory().get("/", parametros)
+        return FILTROS_IMOVEL.aplica(Imovel.objects.all(), request.GET)
+
+    def test_indices_paginacao_filtros_igualdade_success(self):
+        # Uma página da listagem: filtro, cursor e ordem atendidos pelo mesmo índice
+        for parametros, indice in (
+            ({"aceita_animais": "true"}, "imovel_com_animais_idx"),
+            ({"aceita_animais": "false"}, "imovel_sem_animais_idx"),
+            ({"quantidade_banheiros": "2"}, "imovel_banheiros_idx"),
+        ):
+            plano = self.plano_queryset(
+                self.filtrados(parametros).filter(id__gt=10).order_by("id")[:101]
+            )
+            self.assertIn(f"USING INDEX {indice}", plano)
+            self.assertNotIn("TEMP B-TREE", plano)
+
+    def test_indices_filtros_intervalo_success(self):
+        for parametros, indice in (
+            (
+                {"valor_limpeza_min": "20", "valor_limpeza_max": "30"},
+                "imovel_limpeza_idx",
+            ),
+            (
+                {"data_ativacao_min": "2022-01-01", "data_ativacao_max": "2022-12-31"},
+                "imovel_ativacao_idx",
+            ),
+        ):
+            plano = self.plano_queryset(self.filtrados(parametros).order_by("id")[:101])
+            self.assertIn(f"USING INDEX {indice}", plano)
+
+    def test_indices_validador_listagem_success(self):
+        # A agregação do ETag (MAX e COUNT) percorre apenas a página solicitada:
+        # a subconsulta dos IDs usa o índice do filtro e os registros são lidos
+        # pela chave primária, sem percorrer a tabela
+        for parametros, indice in (
+            ({"aceita_animais": "true"}, "imovel_com_animais_idx"),
+            ({"aceita_animais": "false"}, "imovel_sem_animais_idx"),
+            ({"quantidade_banheiros": "2"}, "imovel_banheiros_idx"),
+        ):
+            request = APIRequestFactory().get("/", dict(parametros, limite=50))
+            (registros,) = querysets_listagem(Imovel, request, FILTROS_IMOVEL)
+            with CaptureQueriesContext(connection) as consultas:
+                registros.aggregate(
+                    ultima_atualizacao=Max("data_atualizacao"), quantidade=Count("id")
+                )
+            self.assertIn("LIMIT 51", consultas[0]["sql"])
+            plano = self.plano(consultas[0]["sql"])
+            self.assertRegex(plano, f"USING (COVERING )?INDEX {indice}")
+            self.assertIn("USING INTEGER PRIMARY KEY", plano)
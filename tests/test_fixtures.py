@@ -0,0 +1,109 @@
+import io
+import json
+import tempfile
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase
+from base.models import Anuncio, Imovel, Reserva
+from utils.carga import indices_adiaveis
+from utils.fixtures import carrega_fixtures, le_objetos_json, le_objetos_jsonl
+
+FIXTURES = [
+    "fixtures/reserva_fixture.json",
+    "fixtures/anuncio_fixture.json",
+    "fixtures/imoveis_fixture.json",
+]
+
+
+class LeitoresFixtureTests(SimpleTestCase):
+    def test_le_objetos_json_success(self):
+        objetos = [
+            {"model": "base.Imovel", "pk": i, "fields": {"valor_limpeza": 10.05}}
+            for i in range(20)
+        ]
+        conteudo = json.dumps(objetos, indent=4)
+        # Blocos pequenos: os objetos ficam divididos entre várias leituras
+        for tamanho_bloco in (1, 7, 1 << 20):
+            lidos = list(le_objetos_json(io.StringIO(conteudo), tamanho_bloco))
+            self.assertEqual(len(lidos), 20)
+            self.assertEqual(lidos[3]["pk"], 3)
+            self.assertEqual(lidos[3]["fields"]["valor_limpeza"], Decimal("10.05"))
+        self.assertEqual(list(le_objetos_json(io.StringIO(" [ ] "))), [])
+
+    def test_le_objetos_json_failure(self):
+        for conteudo in ('{"pk": 1}', '[{"pk": 1} {"pk": 2}]', '[{"pk": 1}, {"pk"'):
+            with self.assertRaises(ValueError):
+                list(le_objetos_json(io.StringIO(conteudo), 4))
+
+    def test_le_objetos_jsonl_success(self):
+        conteudo = b'{"pk": 1}\n\n{"pk": 2}\n'
+        self.assertEqual(
+            list(le_objetos_jsonl(io.BytesIO(conteudo))), [{"pk": 1}, {"pk": 2}]
+        )
+        with self.assertRaises(ValueError):
+            list(le_objetos_jsonl(io.BytesIO(b'{"pk": 1}\n{"pk"\n')))
+
+
+class CarregadorFixturesTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_carrega_fixtures_fora_de_ordem_success(self):
+        # As reservas vêm antes dos anúncios e imóveis que elas referenciam
+        contagem = carrega_fixtures(FIXTURES, tamanho_lote=3)
+        self.assertEqual(contagem, {Reserva: 10, Anuncio: 10, Imovel: 10})
+        reserva = Reserva.objects.get(pk=1)
+        self.assertEqual(reserva.cod_anuncio_id, 1)
+        self.assertEqual(reserva.preco_total, Decimal("25.99"))
+        # Os valores da fixture são gravados como estão, como no "loaddata"
+        self.assertEqual(
+            reserva.data_atualizacao, datetime(2024, 4, 1, tzinfo=timezone.utc)
+        )
+        self.assertIsNotNone(reserva.cod_reserva)
+
+    def test_carrega_fixtures_jsonl_success(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = Path(diretorio) / "imoveis.jsonl"
+            objetos = json.loads(Path(FIXTURES[2]).read_text(encoding="utf-8"))
+            caminho.write_text(
+                "\n".join(json.dumps(objeto) for objeto in objetos), encoding="utf-8"
+            )
+            self.assertEqual(carrega_fixtures([caminho]), {Imovel: 10})
+        self.assertEqual(Imovel.objects.get(pk=1).valor_limpeza, Decimal("50.00"))
+
+    def test_carrega_fixtures_adiar_indices_success(self):
+        antes = sorted(indices_adiaveis(Reserva, "default"))
+        self.assertTrue(antes)
+        carrega_fixtures(FIXTURES, adiar_indices=True)
+        self.assertEqual(sorted(indices_adiaveis(Reserva, "default")), antes)
+        self.assertEqual(Reserva.objects.count(), 10)
+
+    def test_carrega_fixtures_referencia_inexistente_failure(self):
+        with self.assertRaisesMessage(ValueError, "cod_anuncio"):
+            carrega_fixtures(FIXTURES[:1])
+        self.assertFalse(Reserva.objects.exists())
+
+    def test_carrega_fixtures_campo_invalido_failure(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = Path(diretorio) / "imoveis.json"
+            for fields in ({"andares": 2}, {"data_ativacao": "20-12-2020"}):
+                caminho.write_text(
+                    json.dumps([{"model": "base.Imovel", "pk": 1, "fields": fields}]),
+                    encoding="utf-8",
+                )
+                with self.assertRaises(ValueError):
+                    carrega_fixtures([caminho])
+
+    def test_comando_carrega_fixtures_success(self):
+        saida = io.StringIO()
+        call_command("carrega_fixtures", *FIXTURES, stdout=saida)
+        self.assertIn("30 registro(s) carregado(s)", saida.getvalue())
+        self.assertEqual(Anuncio.objects.count(), 10)
+
+    def test_comando_carrega_fixtures_failure(self):
+        with self.assertRaises(CommandError):
+            call_command("carrega_fixtures", "fixtures/inexistente.json")
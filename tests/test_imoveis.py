@@ -1,15 +1,25 @@
+import json
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
-from base.models import Imovel
+from api_imoveis.serializer import ImovelSerializer
+from base.models import Anuncio, Imovel, Reserva
 
 
 class ImovelAPITests(APITestCase):
     def setUp(self):
+        # Evitar que respostas em cache de um teste sejam usadas por outro
+        cache.clear()
         self.add_imovel_url = reverse("api_imoveis:add_imovel")
+        self.add_imoveis_lote_url = reverse("api_imoveis:add_imoveis_lote")
         self.get_imoveis_url = reverse("api_imoveis:get_imoveis")
         self.del_imovel_url = reverse("api_imoveis:del_imovel")
         self.alter_imovel_url = reverse("api_imoveis:alter_imovel")
+        self.export_imoveis_url = reverse("api_imoveis:export_imoveis")
 
     # TESTES ADD IMOVEL - INICIO - SUCCESS
     def test_add_imovel_success(self):
@@ -23,6 +33,21 @@ class ImovelAPITests(APITestCase):
         response = self.client.post(self.add_imovel_url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_add_imoveis_lote_success(self):
+        item = {
+            "limite_hospedes": 6,
+            "quantidade_banheiros": 2,
+            "aceita_animais": True,
+            "valor_limpeza": 10.05,
+            "data_ativacao": "2020-12-21",
+        }
+        data = [item, dict(item, limite_hospedes=2), dict(item, aceita_animais=False)]
+        response = self.client.post(self.add_imoveis_lote_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["criados"], 3)
+        self.assertEqual(response.data["erros"], {})
+        self.assertEqual(Imovel.objects.count(), 3)
+
     # TESTES GET IMOVEL - INICIO - SUCCESS
     def test_get_imoveis_success(self):
         imovel = Imovel.objects.create(
@@ -47,6 +72,222 @@ class ImovelAPITests(APITestCase):
         response = self.client.get(url_param)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_get_imoveis_intervalo_ids_success(self):
+        imoveis = [
+            Imovel.objects.create(
+                limite_hospedes=4,
+                quantidade_banheiros=1,
+                aceita_animais=True,
+                valor_limpeza=20.0,
+                data_ativacao="2022-01-01",
+            )
+            for _ in range(3)
+        ]
+        url_param = (
+            self.get_imoveis_url
+            + f"?id={imoveis[0].id}-{imoveis[1].id},{imoveis[0].id}"
+        )
+        response = self.client.get(url_param)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [registro["id"] for registro in response.data],
+            [imoveis[0].id, imoveis[1].id],
+        )
+
+    def test_get_imoveis_limite_pagina_success(self):
+        for _ in range(3):
+            Imovel.objects.create(
+                limite_hospedes=4,
+                quantidade_banheiros=1,
+                aceita_animais=True,
+                valor_limpeza=20.0,
+                data_ativacao="2022-01-01",
+            )
+        # Solicitar páginas com no máximo 2 registros
+        url_param = self.get_imoveis_url + "?limite=2"
+        response = self.client.get(url_param)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertIsNotNone(response.data["next"])
+
+    def test_get_imoveis_cache_invalidado_ao_alterar_success(self):
+        imovel = Imovel.objects.create(
+            limite_hospedes=4,
+            quantidade_banheiros=1,
+            aceita_animais=True,
+            valor_limpeza=20.0,
+            data_ativacao="2022-01-01",
+        )
+        url_param = self.get_imoveis_url + "?id=" + str(imovel.id)
+        response = self.client.get(url_param)
+        self.assertEqual(response.data[0]["limite_hospedes"], 4)
+
+        data = {"id": imovel.id, "fields": {"limite_hospedes": 8}}
+        self.client.post(self.alter_imovel_url, data, format="json")
+        response = self.client.get(url_param)
+        self.assertEqual(response.data[0]["limite_hospedes"], 8)
+
+    def test_get_imoveis_etag_nao_modificado_success(self):
+        imovel = Imovel.objects.create(
+            limite_hospedes=4,
+            quantidade_banheiros=1,
+            aceita_animais=True,
+            valor_limpeza=20.0,
+            data_ativacao="2022-01-01",
+        )
+        response = self.client.get(self.get_imoveis_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+        self.assertTrue(response.has_header("Last-Modified"))
+
+        # Sem alterações, a resposta é "304" apenas com a agregação do validador,
+        # sem consultar nem serializar os registros
+        with self.assertNumQueries(1):
+            response = self.client.get(self.get_imoveis_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        data = {"id": imovel.id, "fields": {"limite_hospedes": 8}}
+        self.client.post(self.alter_imovel_url, data, format="json")
+        response = self.client.get(self.get_imoveis_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_get_imoveis_etag_alteracao_sem_signals_success(self):
+        imovel = self.cria_imovel_com_reservas(1)
+        url_param = self.get_imoveis_url + "?expand=anuncios"
+        response = self.client.get(url_param)
+        etag = response["ETag"]
+
+        # "update()" não dispara os signals: o validador e a resposta em cache
+        # mudam mesmo assim, inclusive para os registros expandidos
+        Anuncio.objects.filter(cod_imovel=imovel).update(
+            plataforma="booking", data_atualizacao=timezone.now()
+        )
+        response = self.client.get(url_param, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(
+            response.data["results"][0]["anuncios"][0]["plataforma"], "booking"
+        )
+
+    def test_get_imoveis_etag_apenas_pagina_success(self):
+        imoveis = [
+            Imovel.objects.create(
+                limite_hospedes=limite_hospedes,
+                quantidade_banheiros=1,
+                aceita_animais=True,
+                valor_limpeza=20.0,
+                data_ativacao="2022-01-01",
+            )
+            for limite_hospedes in range(1, 5)
+        ]
+        # Data de atualização mais antiga no último imóvel, para que apenas a
+        # troca de registros na página (e não o MAX) altere o validador
+        Imovel.objects.filter(id=imoveis[3].id).update(
+            data_atualizacao=imoveis[0].data_atualizacao
+        )
+        url_param = self.get_imoveis_url + "?limite=2"
+        etag = self.client.get(url_param)["ETag"]
+
+        # Registros fora da página (e do registro seguinte) não alteram o validador
+        Imovel.objects.filter(id=imoveis[3].id).update(limite_hospedes=9)
+        response = self.client.get(url_param, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # Excluir um registro da página traz o seguinte para dentro dela
+        Imovel.objects.filter(id=imoveis[1].id).delete()
+        response = self.client.get(url_param, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [registro["id"] for registro in response.data["results"]],
+            [imoveis[0].id, imoveis[2].id],
+        )
+
+    def cria_imovel_com_reservas(self, quantidade_anuncios):
+        imovel = Imovel.objects.create(
+            limite_hospedes=4,
+            quantidade_banheiros=1,
+            aceita_animais=True,
+            valor_limpeza=20.0,
+            data_ativacao="2022-01-01",
+        )
+        for _ in range(quantidade_anuncios):
+            anuncio = Anuncio.objects.create(
+                cod_imovel=imovel, plataforma="airbnb", taxa_plataforma=10.0
+            )
+            Reserva.objects.create(
+                cod_anuncio=anuncio,
+                data_checkin="2022-01-10",
+                data_checkout="2022-01-15",
+                preco_total=500.0,
+                comentario="",
+                numero_hospedes=2,
+            )
+        return imovel
+
+    def test_get_imoveis_expand_success(self):
+        imovel = self.cria_imovel_com_reservas(2)
+        url_param = self.get_imoveis_url + "?expand=anuncios,reservas"
+        response = self.client.get(url_param)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        resultado = response.data["results"][0]
+        self.assertEqual(resultado["id"], imovel.id)
+        self.assertEqual(len(resultado["anuncios"]), 2)
+        self.assertEqual(len(resultado["anuncios"][0]["reservas"]), 1)
+
+        # Sem "expand", apenas as colunas do imóvel são retornadas
+        response = self.client.get(self.get_imoveis_url)
+        self.assertNotIn("anuncios", response.data["results"][0])
+
+    def test_get_imoveis_expand_consultas_constantes_success(self):
+        url_param = self.get_imoveis_url + "?expand=anuncios,reservas"
+        self.cria_imovel_com_reservas(1)
+        with CaptureQueriesContext(connection) as consultas_pequeno:
+            self.client.get(url_param)
+
+        for _ in range(5):
+            self.cria_imovel_com_reservas(3)
+        with CaptureQueriesContext(connection) as consultas_grande:
+            response = self.client.get(url_param)
+        self.assertEqual(len(response.data["results"]), 6)
+        self.assertEqual(len(consultas_pequeno), len(consultas_grande))
+
+    def test_get_imoveis_expand_cache_invalidado_success(self):
+        imovel = self.cria_imovel_com_reservas(1)
+        url_param = self.get_imoveis_url + "?expand=anuncios"
+        response = self.client.get(url_param)
+        self.assertEqual(len(response.data["results"][0]["anuncios"]), 1)
+
+        # Um novo anúncio altera a resposta expandida, mesmo sem alterar o imóvel
+        Anuncio.objects.create(
+            cod_imovel=imovel, plataforma="booking", taxa_plataforma=5.0
+        )
+        response = self.client.get(url_param)
+        self.assertEqual(len(response.data["results"][0]["anuncios"]), 2)
+
+    def test_export_imoveis_success(self):
+        for limite_hospedes in range(1, 4):
+            Imovel.objects.create(
+                limite_hospedes=limite_hospedes,
+                quantidade_banheiros=1,
+                aceita_animais=True,
+                valor_limpeza=20.0,
+                data_ativacao="2022-01-01",
+            )
+        response = self.client.get(self.export_imoveis_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+
+        # O conteúdo em streaming deve ser igual à serialização completa
+        conteudo = b"".join(response.streaming_content)
+        esperado = ImovelSerializer(Imovel.objects.order_by("id"), many=True).data
+        self.assertEqual(json.loads(conteudo), json.loads(json.dumps(esperado)))
+
+    def test_export_imoveis_vazio_success(self):
+        response = self.client.get(self.export_imoveis_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b"".join(response.streaming_content), b"[]")
+
     # TESTES DEL IMOVEL - INICIO - SUCCESS
     def test_del_imovel_success(self):
         imovel = Imovel.objects.create(
@@ -60,6 +301,52 @@ class ImovelAPITests(APITestCase):
         response = self.client.delete(self.del_imovel_url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_del_imovel_lista_cascata_success(self):
+        imoveis = [
+            Imovel.objects.create(
+                limite_hospedes=4,
+                quantidade_banheiros=1,
+                aceita_animais=True,
+                valor_limpeza=20.0,
+                data_ativacao="2022-01-01",
+            )
+            for _ in range(3)
+        ]
+        for imovel in imoveis:
+            anuncio = Anuncio.objects.create(
+                cod_imovel=imovel, plataforma="airbnb", taxa_plataforma=99.99
+            )
+            Reserva.objects.create(
+                cod_anuncio=anuncio,
+                data_checkin="2024-04-20",
+                data_checkout="2024-04-23",
+                preco_total=25.99,
+                comentario="meu comentario",
+                numero_hospedes=1,
+            )
+        data = {"id": [imoveis[0].id, imoveis[1].id]}
+        # Um DELETE por model (com o resumo diário); os registros dos models com
+        # receivers de "pre_delete"/"post_delete" são lidos uma vez para os sinais
+        with self.assertNumQueries(9):
+            response = self.client.delete(self.del_imovel_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            (
+                12,
+                {
+                    "base.Reserva": 2,
+                    "base.ResumoDiario": 6,
+                    "base.Anuncio": 2,
+                    "base.Imovel": 2,
+                },
+            ),
+        )
+        self.assertEqual(
+            list(Imovel.objects.values_list("id", flat=True)), [imoveis[2].id]
+        )
+        self.assertEqual(Reserva.objects.count(), 1)
+
     # TESTES ALTER IMOVEL - INICIO - SUCCESS
     def test_alter_imovel_success(self):
         imovel = Imovel.objects.create(
@@ -83,6 +370,29 @@ class ImovelAPITests(APITestCase):
         self.assertEqual(Imovel.objects.get(id=imovel.id).aceita_animais, False)
         self.assertEqual(Imovel.objects.get(id=imovel.id).valor_limpeza, 25.0)
 
+    def test_alter_imovel_update_unico_success(self):
+        imovel = Imovel.objects.create(
+            limite_hospedes=4,
+            quantidade_banheiros=1,
+            aceita_animais=True,
+            valor_limpeza=20.0,
+            data_ativacao="2022-01-01",
+        )
+        data = {
+            "id": imovel.id,
+            "fields": {
+                "limite_hospedes": 6,
+                "valor_limpeza": 25.5,
+            },
+        }
+        # Um SELECT para obter o registro e um único UPDATE, sem reconsultar
+        with self.assertNumQueries(2):
+            response = self.client.post(self.alter_imovel_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]["limite_hospedes"], 6)
+        self.assertEqual(response.data[0]["valor_limpeza"], "25.50")
+        self.assertEqual(response.data[0]["quantidade_banheiros"], 1)
+
     """
 
     TESTES DE FALHAS
@@ -114,6 +424,12 @@ class ImovelAPITests(APITestCase):
         response = self.client.post(self.add_imovel_url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_add_imoveis_lote_payload_invalido_failure(self):
+        # O cadastro em lote espera uma lista de imóveis
+        data = {"limite_hospedes": 6}
+        response = self.client.post(self.add_imoveis_lote_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     # TESTES ADD IMOVEL - FIM - FAILURE
 
     # TESTES GET IMOVEL - INICIO - FAILURE
@@ -122,6 +438,14 @@ class ImovelAPITests(APITestCase):
         response = self.client.get(self.get_imoveis_url)
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
+    def test_get_imoveis_expand_invalido_failure(self):
+        self.cria_imovel_com_reservas(1)
+        response = self.client.get(self.get_imoveis_url + "?expand=hospedes")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        # As reservas são listadas dentro dos anúncios
+        response = self.client.get(self.get_imoveis_url + "?expand=reservas")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_get_imoveis_url_param_failure(self):
         # ID de imóvel inválido
         url_param = self.get_imoveis_url + "?id=999999"  # ID que não existe
@@ -143,6 +467,12 @@ class ImovelAPITests(APITestCase):
         response = self.client.delete(self.del_imovel_url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_del_imovel_id_invalido_failure(self):
+        # Tentando excluir passando um id que não é inteiro
+        data = {"id": ["1"]}
+        response = self.client.delete(self.del_imovel_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     # TESTES DEL IMOVEL - FIM - FAILURE
 
     # TESTES ALTER IMOVEL - INICIO - FAILURE
@@ -210,5 +540,12 @@ class ImovelAPITests(APITestCase):
         }
         response = self.client.post(self.alter_imovel_url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data["error"],
+            "Registro não atualizado! Os campos a seguir não existem na tabela "
+            "Imovel: 'campo_inexistente'. Campos permitidos: 'limite_hospedes', "
+            "'quantidade_banheiros', 'aceita_animais', 'valor_limpeza', "
+            "'data_ativacao'",
+        )
 
     # TESTES ALTER IMOVEL - FIM - FAILURE
@@ -0,0 +1,65 @@
+import io
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from zoneinfo import ZoneInfo
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from utils.json_rapido import JSONParserRapido, JSONRendererRapido, codifica_json
+
+
+class JSONRapidoTests(SimpleTestCase):
+    def setUp(self):
+        self.dados = {
+            "decimal": Decimal("10.50"),
+            "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "data": date(2024, 4, 20),
+            "data_hora_utc": datetime(2024, 4, 20, 12, 30, tzinfo=timezone.utc),
+            "data_hora_local": datetime(
+                2024, 4, 20, 12, 30, 0, 1500, tzinfo=ZoneInfo("America/Sao_Paulo")
+            ),
+            "data_hora_ingenua": datetime(2024, 4, 20, 12, 30),
+            "hora": time(8, 15),
+            "duracao": timedelta(days=1, seconds=5),
+            "erros": {0: "erro", 3: {"campo": ["inválido"]}},
+            "texto": "acentuação\u2028linha\u2029",
+            "lista": [1, 2.5, None, True, "a"],
+        }
+
+    def test_renderer_mesmo_formato_do_drf_success(self):
+        self.assertEqual(
+            JSONRendererRapido().render(self.dados), JSONRenderer().render(self.dados)
+        )
+
+    def test_renderer_inteiro_acima_de_64_bits_success(self):
+        dados = {"grande": 2**70}
+        self.assertEqual(
+            JSONRendererRapido().render(dados), JSONRenderer().render(dados)
+        )
+
+    def test_renderer_indentado_success(self):
+        media_type = "application/json; indent=4"
+        self.assertEqual(
+            JSONRendererRapido().render(self.dados, media_type),
+            JSONRenderer().render(self.dados, media_type),
+        )
+
+    def test_codifica_json_success(self):
+        self.assertEqual(codifica_json([{"a": Decimal("1.10")}]), b'[{"a":1.1}]')
+
+    def test_parser_mesmo_resultado_do_drf_success(self):
+        for conteudo in (
+            b'{"valor_limpeza": 10.05, "aceita_animais": true, "id": [1, 2]}',
+            b'{"comentario": "acentua\\u00e7\\u00e3o", "preco_total": 1e400}',
+        ):
+            self.assertEqual(
+                JSONParserRapido().parse(io.BytesIO(conteudo)),
+                JSONParser().parse(io.BytesIO(conteudo)),
+            )
+
+    def test_parser_json_invalido_failure(self):
+        for conteudo in (b'{"id": 1', b'{"valor": NaN}'):
+            with self.assertRaises(ParseError):
+                JSONParserRapido().parse(io.BytesIO(conteudo))
@@ -0,0 +1,99 @@
+import json
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from base.models import Anuncio, Imovel, Reserva
+from utils.metricas import Histograma, registro_metricas
+
+
+def server_timing(response):
+    # {"sql": {"dur": 1.2, "desc": "consultas: 3"}, "total": {"dur": ...}, ...}
+    metricas = {}
+    for item in response["Server-Timing"].split(","):
+        nome, *parametros = item.strip().split(";")
+        metricas[nome] = {
+            chave: valor.strip('"')
+            for chave, _, valor in (p.partition("=") for p in parametros)
+        }
+    return metricas
+
+
+class HistogramaTests(SimpleTestCase):
+    def test_histograma_success(self):
+        histograma = Histograma((1, 5, 10))
+        for valor in (0.5, 1, 3, 7, 50):
+            histograma.registra(valor)
+        self.assertEqual(
+            histograma.como_dict(),
+            {
+                "contagem": 5,
+                "soma": 61.5,
+                "le": {"1": 2, "5": 3, "10": 4, "+Inf": 5},
+            },
+        )
+
+
+class MetricasAPITests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        registro_metricas.limpa()
+        self.get_reservas_url = reverse("api_reservas:get_reservas")
+        imovel = Imovel.objects.create(
+            limite_hospedes=4,
+            quantidade_banheiros=1,
+            aceita_animais=True,
+            valor_limpeza=20.0,
+            data_ativacao="2022-01-01",
+        )
+        anuncio = Anuncio.objects.create(
+            cod_imovel=imovel, plataforma="airbnb", taxa_plataforma=10.0
+        )
+        Reserva.objects.create(
+            cod_anuncio=anuncio,
+            data_checkin="2024-04-20",
+            data_checkout="2024-04-23",
+            preco_total=25.99,
+            comentario="meu comentario",
+            numero_hospedes=2,
+        )
+
+    def test_server_timing_success(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(self.get_reservas_url + "?expand=anuncio")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        metricas = server_timing(response)
+        self.assertEqual(metricas["sql"]["desc"], "consultas: 2")
+        for nome in ("sql", "serializacao", "render", "total"):
+            self.assertGreaterEqual(float(metricas[nome]["dur"]), 0)
+        self.assertGreaterEqual(
+            float(metricas["total"]["dur"]), float(metricas["sql"]["dur"])
+        )
+
+        # Resposta em cache: apenas a agregação do validador
+        response = self.client.get(self.get_reservas_url + "?expand=anuncio")
+        self.assertEqual(server_timing(response)["sql"]["desc"], "consultas: 1")
+
+    def test_log_estruturado_success(self):
+        with self.assertLogs("khanto.metricas", "INFO") as logs:
+            self.client.get(self.get_reservas_url)
+        linha = json.loads(logs.records[0].getMessage())
+        self.assertEqual(linha["rota"], "GET api_reservas:get_reservas")
+        self.assertEqual(linha["status"], status.HTTP_200_OK)
+        self.assertEqual(linha["consultas"], logs.records[0].metricas["consultas"])
+
+    def test_metricas_por_rota_success(self):
+        for _ in range(3):
+            self.client.get(self.get_reservas_url)
+        self.client.get(reverse("api_reservas:get_disponibilidade"))
+
+        response = self.client.get(reverse("metricas"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rotas = response.data["rotas"]
+        reservas = rotas["GET api_reservas:get_reservas"]
+        self.assertEqual(reservas["total_ms"]["contagem"], 3)
+        self.assertEqual(reservas["consultas"]["le"]["+Inf"], 3)
+        self.assertEqual(
+            rotas["GET api_reservas:get_disponibilidade"]["total_ms"]["contagem"], 1
+        )
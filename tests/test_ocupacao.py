@@ -0,0 +1,227 @@
+from datetime import date
+from decimal import Decimal
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from api_reservas.ocupacao import relatorio_ocupacao
+from base.models import Anuncio, Imovel, Reserva
+
+INICIO, FIM = date(2024, 4, 1), date(2024, 5, 1)
+
+
+class OcupacaoAPITests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.ocupacao_url = reverse("api_reservas:get_ocupacao")
+
+        self.imovel = Imovel.objects.create(
+            limite_hospedes=4,
+            quantidade_banheiros=1,
+            aceita_animais=True,
+            valor_limpeza=20.0,
+            data_ativacao="2022-01-01",
+        )
+        # Ativado no meio da janela: 20 noites disponíveis
+        self.imovel_novo = Imovel.objects.create(
+            limite_hospedes=2,
+            quantidade_banheiros=1,
+            aceita_animais=False,
+            valor_limpeza=10.0,
+            data_ativacao="2024-04-11",
+        )
+        self.airbnb = Anuncio.objects.create(
+            cod_imovel=self.imovel, plataforma="airbnb", taxa_plataforma=10
+        )
+        self.booking = Anuncio.objects.create(
+            cod_imovel=self.imovel, plataforma="booking", taxa_plataforma=15
+        )
+        self.airbnb_novo = Anuncio.objects.create(
+            cod_imovel=self.imovel_novo, plataforma="airbnb", taxa_plataforma=10
+        )
+
+        for anuncio, checkin, checkout, preco in (
+            # Começa antes da janela: 2 de 4 noites, metade da receita
+            (self.airbnb, "2024-03-30", "2024-04-03", 100),
+            (self.airbnb, "2024-04-10", "2024-04-15", 250),
+            # Termina depois da janela: 3 de 6 noites
+            (self.booking, "2024-04-28", "2024-05-04", 600),
+            # Sem pernoite: receita inteira, nenhuma noite
+            (self.booking, "2024-04-20", "2024-04-20", 30),
+            (self.airbnb_novo, "2024-04-11", "2024-04-12", 80),
+            # Fora da janela (o check-out de "2024-04-01" não ocupa a janela)
+            (self.airbnb_novo, "2024-05-01", "2024-05-05", 400),
+            (self.airbnb_novo, "2024-03-01", "2024-04-01", 900),
+        ):
+            Reserva.objects.create(
+                cod_anuncio=anuncio,
+                data_checkin=checkin,
+                data_checkout=checkout,
+                preco_total=preco,
+                numero_hospedes=1,
+            )
+
+    def test_relatorio_ocupacao_imovel_success(self):
+        with self.assertNumQueries(1):
+            resultados = relatorio_ocupacao("imovel", INICIO, FIM)
+        self.assertEqual(
+            resultados,
+            [
+                {
+                    "cod_imovel": self.imovel.id,
+                    "reservas": 4,
+                    "noites_vendidas": 10,
+                    "noites_disponiveis": 30,
+                    "taxa_ocupacao": 0.3333,
+                    "receita": Decimal("630.00"),
+                },
+                {
+                    "cod_imovel": self.imovel_novo.id,
+                    "reservas": 1,
+                    "noites_vendidas": 1,
+                    "noites_disponiveis": 20,
+                    "taxa_ocupacao": 0.05,
+                    "receita": Decimal("80.00"),
+                },
+            ],
+        )
+
+    def test_relatorio_ocupacao_anuncio_success(self):
+        with self.assertNumQueries(1):
+            resultados = relatorio_ocupacao(
+                "anuncio", INICIO, FIM, ids=[self.airbnb.id, self.booking.id]
+            )
+        self.assertEqual(
+            [
+                (
+                    r["cod_anuncio"],
+                    r["cod_imovel"],
+                    r["plataforma"],
+                    r["noites_vendidas"],
+                    r["receita"],
+                )
+                for r in resultados
+            ],
+            [
+                (self.airbnb.id, self.imovel.id, "airbnb", 7, Decimal("300.00")),
+                (self.booking.id, self.imovel.id, "booking", 3, Decimal("330.00")),
+            ],
+        )
+
+    def test_relatorio_ocupacao_plataforma_success(self):
+        with self.assertNumQueries(1):
+            resultados = relatorio_ocupacao("plataforma", INICIO, FIM)
+        self.assertEqual(
+            resultados,
+            [
+                {
+                    "plataforma": "airbnb",
+                    "anuncios": 2,
+                    "reservas": 3,
+                    "noites_vendidas": 8,
+                    "noites_disponiveis": 50,
+                    "taxa_ocupacao": 0.16,
+                    "receita": Decimal("380.00"),
+                },
+                {
+                    "plataforma": "booking",
+                    "anuncios": 1,
+                    "reservas": 2,
+                    "noites_vendidas": 3,
+                    "noites_disponiveis": 30,
+                    "taxa_ocupacao": 0.1,
+                    "receita": Decimal("330.00"),
+                },
+            ],
+        )
+
+    def test_relatorio_ocupacao_antes_da_ativacao_success(self):
+        resultados = relatorio_ocupacao(
+            "imovel", date(2024, 3, 1), date(2024, 4, 1), ids=[self.imovel_novo.id]
+        )
+        # A reserva anterior à ativação conta como vendida, sem noites disponíveis
+        self.assertEqual(resultados[0]["noites_disponiveis"], 0)
+        self.assertIsNone(resultados[0]["taxa_ocupacao"])
+        self.assertEqual(resultados[0]["receita"], Decimal("900.00"))
+
+    def test_relatorio_ocupacao_receita_proporcional_success(self):
+        # Preços inteiros divididos entre as noites não perdem as casas decimais
+        for checkin, preco in (("2024-05-29", 100), ("2024-05-30", Decimal("0.10"))):
+            Reserva.objects.create(
+                cod_anuncio=self.booking,
+                data_checkin=checkin,
+                data_checkout="2024-06-01",
+                preco_total=preco,
+                numero_hospedes=1,
+            )
+        resultados = relatorio_ocupacao(
+            "anuncio", date(2024, 5, 31), date(2024, 6, 1), ids=[self.booking.id]
+        )
+        # 100 / 3 + 0.10 / 2 = 33.3833...
+        self.assertEqual(resultados[0]["receita"], Decimal("33.38"))
+
+    def test_relatorio_ocupacao_resumo_success(self):
+        # O resumo diário, mantido pelos signals, gera os mesmos valores
+        for agrupar in ("imovel", "anuncio", "plataforma"):
+            with self.assertNumQueries(1):
+                resultados = relatorio_ocupacao(agrupar, INICIO, FIM, fonte="resumo")
+            self.assertEqual(resultados, relatorio_ocupacao(agrupar, INICIO, FIM))
+        self.assertEqual(
+            relatorio_ocupacao(
+                "imovel",
+                date(2024, 3, 1),
+                date(2024, 4, 1),
+                ids=[self.imovel_novo.id],
+                fonte="resumo",
+            )[0]["receita"],
+            Decimal("900.00"),
+        )
+
+    def test_get_ocupacao_success(self):
+        response = self.client.get(
+            self.ocupacao_url,
+            {
+                "data_inicio": "2024-04-01",
+                "data_fim": "2024-05-01",
+                "agrupar": "plataforma",
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        dados = response.json()
+        self.assertEqual(dados["data_inicio"], "2024-04-01")
+        self.assertEqual(dados["agrupar"], "plataforma")
+        self.assertEqual(dados["resultados"][0]["receita"], "380.00")
+
+        response = self.client.get(
+            self.ocupacao_url,
+            {
+                "data_inicio": "2024-04-01",
+                "data_fim": "2024-05-01",
+                "id": self.imovel_novo.id,
+            },
+        )
+        self.assertEqual(response.json()["resultados"][0]["noites_vendidas"], 1)
+
+        response = self.client.get(
+            self.ocupacao_url,
+            {"data_inicio": "2024-04-01", "data_fim": "2024-05-01", "fonte": "resumo"},
+        )
+        self.assertEqual(response.json()["fonte"], "resumo")
+        self.assertEqual(response.json()["resultados"][0]["receita"], "630.00")
+
+    def test_get_ocupacao_failure(self):
+        for parametros in (
+            {"data_inicio": "2024-04-01"},
+            {"data_inicio": "2024-04-01", "data_fim": "2024-04-01"},
+            {"data_inicio": "2024-04-01", "data_fim": "01-05-2024"},
+            {
+                "data_inicio": "2024-04-01",
+                "data_fim": "2024-05-01",
+                "agrupar": "cidade",
+            },
+            {"data_inicio": "2024-04-01", "data_fim": "2024-05-01", "id": "a"},
+            {"data_inicio": "2024-04-01", "data_fim": "2024-05-01", "fonte": "cubo"},
+        ):
+            response = self.client.get(self.ocupacao_url, parametros)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("error", response.json())
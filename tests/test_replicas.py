@@ -0,0 +1,115 @@
+import json
+import shutil
+import tempfile
+from pathlib import Path
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from base.models import Imovel
+from utils.replicas import REPLICA_COOKIE, sequencia_ponderada
+
+REPLICA = "replica_teste"
+
+
+class SequenciaPonderadaTests(SimpleTestCase):
+    def test_sequencia_ponderada_success(self):
+        self.assertEqual(
+            sequencia_ponderada({"replica_1": 1, "replica_2": 1}),
+            ["replica_1", "replica_2"],
+        )
+        sequencia = sequencia_ponderada({"replica_1": 3, "replica_2": 1})
+        self.assertEqual(sequencia.count("replica_1"), 3)
+        self.assertEqual(sequencia.count("replica_2"), 1)
+        # A réplica de maior peso não recebe todas as leituras seguidas
+        self.assertEqual(sequencia_ponderada({"a": 2, "b": 1}), ["a", "b", "a"])
+
+
+@override_settings(
+    DATABASE_REPLICAS={REPLICA: 1},
+    DATABASE_ROUTERS=["utils.replicas.RoteadorReplicas"],
+)
+class RoteadorReplicasTests(TransactionTestCase):
+    # Dois bancos SQLite: o banco de testes como principal e um arquivo como réplica,
+    # criado apenas para estes testes
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.diretorio = tempfile.mkdtemp()
+        connections.settings[REPLICA] = {
+            **connections["default"].settings_dict,
+            "NAME": str(Path(cls.diretorio) / "replica.sqlite3"),
+        }
+        call_command("migrate", database=REPLICA, verbosity=0)
+
+    @classmethod
+    def tearDownClass(cls):
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+        shutil.rmtree(cls.diretorio)
+        super().tearDownClass()
+
+    def tearDown(self):
+        Imovel.objects.using(REPLICA).all().delete()
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.get_imoveis_url = reverse("api_imoveis:get_imoveis")
+        # Dados diferentes em cada banco, para identificar de onde veio a leitura
+        for banco, limite_hospedes in (("default", 4), (REPLICA, 8)):
+            Imovel.objects.using(banco).create(
+                limite_hospedes=limite_hospedes,
+                quantidade_banheiros=1,
+                aceita_animais=True,
+                valor_limpeza=20.0,
+                data_ativacao="2022-01-01",
+            )
+
+    def limites_hospedes(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [
+            registro["limite_hospedes"]
+            for registro in json.loads(response.content)["results"]
+        ]
+
+    def test_leitura_replica_success(self):
+        self.assertEqual(self.limites_hospedes(self.get_imoveis_url), [8])
+        self.assertEqual(
+            self.limites_hospedes(reverse("api_imoveis:aget_imoveis")), [8]
+        )
+
+    def test_leitura_apos_escrita_primario_success(self):
+        response = self.client.post(
+            reverse("api_imoveis:add_imovel"),
+            {
+                "limite_hospedes": 6,
+                "quantidade_banheiros": 2,
+                "aceita_animais": True,
+                "valor_limpeza": 10.05,
+                "data_ativacao": "2020-12-21",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(REPLICA_COOKIE, response.cookies)
+
+        # O mesmo cliente lê o que acabou de escrever, no banco principal
+        self.assertEqual(self.limites_hospedes(self.get_imoveis_url), [4, 6])
+        # Outros clientes continuam usando a réplica (sem a resposta em cache)
+        cache.clear()
+        self.assertEqual(
+            APIClient().get(self.get_imoveis_url).data["results"][0]["limite_hospedes"],
+            8,
+        )
+
+    def test_escrita_sempre_primario_success(self):
+        self.client.get(self.get_imoveis_url)
+        Imovel.objects.update(aceita_animais=False)
+        self.assertFalse(Imovel.objects.using("default").get().aceita_animais)
+        self.assertTrue(Imovel.objects.using(REPLICA).get().aceita_animais)
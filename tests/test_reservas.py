@@ -1,14 +1,31 @@
+import json
+import msgpack
+from django.db.models.signals import post_delete
+from django.core.cache import cache
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
-from base.models import Imovel, Anuncio, Reserva
+from rest_framework.renderers import JSONRenderer
+from api_reservas.disponibilidade import periodos_ocupados
+from utils.cache import versao_model
+from utils.validations import IDS_POR_CONSULTA
+from utils.exclusao import post_delete_conjunto
+from api_anuncios.serializer import REPRESENTACAO_ANUNCIO, AnuncioSerializer
+from api_imoveis.serializer import REPRESENTACAO_IMOVEL, ImovelSerializer
+from api_reservas.serializer import REPRESENTACAO_RESERVA, ReservaSerializer
+from base.models import Imovel, Anuncio, Reserva, ResumoDiario
 
 
 class ReservaAPITests(APITestCase):
     def setUp(self):
+        # Evitar que respostas em cache de um teste sejam usadas por outro
+        cache.clear()
         self.add_reserva_url = reverse("api_reservas:add_reserva")
+        self.add_reservas_lote_url = reverse("api_reservas:add_reservas_lote")
         self.get_reservas_url = reverse("api_reservas:get_reservas")
+        self.export_reservas_url = reverse("api_reservas:export_reservas")
         self.del_reserva_url = reverse("api_reservas:del_reserva")
+        self.disponibilidade_url = reverse("api_reservas:get_disponibilidade")
 
         self.imovel = Imovel.objects.create(
             limite_hospedes=4,
@@ -36,6 +53,65 @@ class ReservaAPITests(APITestCase):
         response = self.client.post(self.add_reserva_url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_add_reservas_lote_sobreposicao_success(self):
+        item = {
+            "cod_anuncio": self.anuncio.id,
+            "data_checkin": "2024-04-20",
+            "data_checkout": "2024-04-23",
+            "preco_total": 25.99,
+            "comentario": "meu comentario",
+            "numero_hospedes": 1,
+        }
+        data = [
+            item,
+            # Sobrepõe o primeiro item do próprio lote
+            dict(item, data_checkin="2024-04-22", data_checkout="2024-04-24"),
+            dict(item, data_checkin="2024-04-23", data_checkout="2024-04-25"),
+            # Check-out anterior ao check-in
+            dict(item, data_checkin="2024-05-10", data_checkout="2024-05-01"),
+        ]
+        response = self.client.post(self.add_reservas_lote_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["criados"], 2)
+        self.assertEqual(list(response.data["erros"].keys()), ["1", "3"])
+        self.assertEqual(Reserva.objects.count(), 2)
+
+    def test_add_reservas_lote_muitos_anuncios_success(self):
+        # Mais anúncios que IDS_POR_CONSULTA: os anúncios e os períodos ocupados
+        # são consultados em pedaços, dentro do limite de parâmetros do banco
+        anuncios = Anuncio.objects.bulk_create(
+            Anuncio(cod_imovel=self.imovel, plataforma="airbnb", taxa_plataforma=10)
+            for _ in range(IDS_POR_CONSULTA + 1)
+        )
+        Reserva.objects.create(
+            cod_anuncio=anuncios[-1],
+            data_checkin="2024-04-21",
+            data_checkout="2024-04-22",
+            preco_total=25.99,
+            numero_hospedes=1,
+        )
+        with self.assertNumQueries(2):
+            periodos = periodos_ocupados(
+                [anuncio.id for anuncio in anuncios], "2024-04-20", "2024-04-23"
+            )
+        self.assertEqual(list(periodos), [anuncios[-1].id])
+
+        data = [
+            {
+                "cod_anuncio": anuncio.id,
+                "data_checkin": "2024-04-20",
+                "data_checkout": "2024-04-23",
+                "preco_total": 25.99,
+                "comentario": "",
+                "numero_hospedes": 1,
+            }
+            for anuncio in anuncios
+        ]
+        response = self.client.post(self.add_reservas_lote_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["criados"], IDS_POR_CONSULTA)
+        self.assertEqual(list(response.data["erros"]), [str(IDS_POR_CONSULTA)])
+
     def test_get_reservas_success(self):
         reserva = Reserva.objects.create(
             cod_anuncio=self.anuncio,
@@ -61,6 +137,178 @@ class ReservaAPITests(APITestCase):
         response = self.client.get(url_param)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_get_reservas_expand_success(self):
+        reservas = [
+            Reserva.objects.create(
+                cod_anuncio=self.anuncio,
+                data_checkin=f"2024-04-{dia}",
+                data_checkout=f"2024-04-{dia + 2}",
+                preco_total=25.99,
+                comentario="",
+                numero_hospedes=1,
+            )
+            for dia in (10, 15, 20)
+        ]
+        url_param = (
+            self.get_reservas_url
+            + f"?id={reservas[0].id}-{reservas[2].id}&expand=anuncio,imovel"
+        )
+        # O anúncio e o imóvel são obtidos no mesmo SELECT das reservas (JOIN):
+        # uma consulta para o validador do ETag e uma para os registros
+        with self.assertNumQueries(2):
+            response = self.client.get(url_param)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 3)
+        self.assertEqual(response.data[0]["anuncio"]["id"], self.anuncio.id)
+        self.assertEqual(response.data[0]["anuncio"]["imovel"]["id"], self.imovel.id)
+
+    def test_representacao_rapida_identica_ao_serializer_success(self):
+        for dia, preco in ((10, 25.5), (15, 1234.01), (20, 0)):
+            Reserva.objects.create(
+                cod_anuncio=self.anuncio,
+                data_checkin=f"2024-04-{dia}",
+                data_checkout=f"2024-04-{dia + 2}",
+                preco_total=preco,
+                comentario="comentário com acentuação",
+                numero_hospedes=1,
+            )
+        renderer = JSONRenderer()
+        for model, serializer_class, representacao in (
+            (Imovel, ImovelSerializer, REPRESENTACAO_IMOVEL),
+            (Anuncio, AnuncioSerializer, REPRESENTACAO_ANUNCIO),
+            (Reserva, ReservaSerializer, REPRESENTACAO_RESERVA),
+        ):
+            registros = model.objects.order_by("id")
+            esperado = renderer.render(serializer_class(registros, many=True).data)
+            obtido = renderer.render(
+                representacao.representa(representacao.valores(registros))
+            )
+            self.assertEqual(obtido, esperado)
+
+    def cria_reservas(self, quantidade):
+        return [
+            Reserva.objects.create(
+                cod_anuncio=self.anuncio,
+                data_checkin="2024-04-20",
+                data_checkout="2024-04-23",
+                preco_total=25.99,
+                comentario="",
+                numero_hospedes=indice + 1,
+            )
+            for indice in range(quantidade)
+        ]
+
+    def test_get_reservas_formato_colunar_success(self):
+        reservas = self.cria_reservas(3)
+        response = self.client.get(self.get_reservas_url + "?format=colunar")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response["Content-Type"], "application/vnd.khanto.colunar+json"
+        )
+        resultados = json.loads(response.content)["results"]
+        self.assertEqual(resultados["linhas"], 3)
+        self.assertEqual(
+            resultados["colunas"]["id"], [reserva.id for reserva in reservas]
+        )
+        self.assertEqual(resultados["colunas"]["numero_hospedes"], [1, 2, 3])
+        self.assertEqual(resultados["colunas"]["preco_total"], ["25.99"] * 3)
+
+    def test_get_reservas_formato_msgpack_success(self):
+        reservas = self.cria_reservas(2)
+        url_param = self.get_reservas_url + f"?id={reservas[0].id},{reservas[1].id}"
+        esperado = self.client.get(url_param).json()
+
+        # O formato pode ser escolhido pelo cabeçalho Accept ou por "?format="
+        for response in (
+            self.client.get(url_param, HTTP_ACCEPT="application/msgpack"),
+            self.client.get(url_param + "&format=msgpack"),
+        ):
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response["Content-Type"], "application/msgpack")
+            self.assertEqual(msgpack.unpackb(response.content), esperado)
+
+        response = self.client.get(url_param + "&format=colunar-msgpack")
+        colunas = msgpack.unpackb(response.content)["colunas"]
+        self.assertEqual(
+            colunas["cod_reserva"], [item["cod_reserva"] for item in esperado]
+        )
+
+    def test_export_reservas_success(self):
+        for _ in range(3):
+            Reserva.objects.create(
+                cod_anuncio=self.anuncio,
+                data_checkin="2024-04-20",
+                data_checkout="2024-04-23",
+                preco_total=25.99,
+                comentario="meu comentario",
+                numero_hospedes=1,
+            )
+        response = self.client.get(self.export_reservas_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+
+        # O conteúdo em streaming deve ser igual à serialização completa
+        conteudo = b"".join(response.streaming_content)
+        esperado = ReservaSerializer(Reserva.objects.order_by("id"), many=True).data
+        self.assertEqual(json.loads(conteudo), json.loads(json.dumps(esperado)))
+
+    def test_export_reservas_vazio_success(self):
+        response = self.client.get(self.export_reservas_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b"".join(response.streaming_content), b"[]")
+
+    def test_add_reserva_checkin_no_dia_do_checkout_success(self):
+        Reserva.objects.create(
+            cod_anuncio=self.anuncio,
+            data_checkin="2024-04-20",
+            data_checkout="2024-04-23",
+            preco_total=25.99,
+            comentario="meu comentario",
+            numero_hospedes=1,
+        )
+        # O dia de check-out de uma reserva fica livre para um novo check-in
+        data = {
+            "cod_anuncio": self.anuncio.id,
+            "data_checkin": "2024-04-23",
+            "data_checkout": "2024-04-25",
+            "preco_total": 25.99,
+            "comentario": "meu comentario",
+            "numero_hospedes": 1,
+        }
+        response = self.client.post(self.add_reserva_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_get_disponibilidade_success(self):
+        outro_anuncio = Anuncio.objects.create(
+            cod_imovel=self.imovel,
+            plataforma="booking",
+            taxa_plataforma=10.00,
+        )
+        Reserva.objects.create(
+            cod_anuncio=self.anuncio,
+            data_checkin="2024-04-20",
+            data_checkout="2024-04-23",
+            preco_total=25.99,
+            comentario="meu comentario",
+            numero_hospedes=1,
+        )
+        url_param = (
+            self.disponibilidade_url
+            + f"?cod_anuncio={self.anuncio.id},{outro_anuncio.id}"
+            + "&data_checkin=2024-04-22&data_checkout=2024-04-24"
+        )
+        # Todos os anúncios devem ser verificados em uma única consulta
+        with self.assertNumQueries(1):
+            response = self.client.get(url_param)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["disponibilidade"],
+            [
+                {"cod_anuncio": self.anuncio.id, "disponivel": False},
+                {"cod_anuncio": outro_anuncio.id, "disponivel": True},
+            ],
+        )
+
     def test_del_reserva_success(self):
         reserva = Reserva.objects.create(
             cod_anuncio=self.anuncio,
@@ -74,6 +322,146 @@ class ReservaAPITests(APITestCase):
         response = self.client.delete(self.del_reserva_url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_get_reservas_paginacao_cursor_success(self):
+        for _ in range(5):
+            Reserva.objects.create(
+                cod_anuncio=self.anuncio,
+                data_checkin="2024-04-20",
+                data_checkout="2024-04-23",
+                preco_total=25.99,
+                comentario="meu comentario",
+                numero_hospedes=1,
+            )
+        ids_esperados = list(
+            Reserva.objects.order_by("id").values_list("id", flat=True)
+        )
+
+        # Percorrer todas as páginas seguindo o cursor "next"
+        ids_retornados = []
+        url = self.get_reservas_url + "?limite=2"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data["results"]), 2)
+            ids_retornados += [registro["id"] for registro in response.data["results"]]
+            url = response.data["next"]
+
+        self.assertEqual(ids_retornados, ids_esperados)
+
+    def test_del_reserva_lista_com_sinais_success(self):
+        reservas = [
+            Reserva.objects.create(
+                cod_anuncio=self.anuncio,
+                data_checkin="2024-04-20",
+                data_checkout="2024-04-23",
+                preco_total=25.99,
+                comentario="meu comentario",
+                numero_hospedes=1,
+            )
+            for _ in range(2)
+        ]
+        excluidas = []
+
+        def receiver(sender, instance, **kwargs):
+            excluidas.append(instance.id)
+
+        # Com um receiver conectado, a exclusão deve passar pelo delete() do Django
+        post_delete.connect(receiver, sender=Reserva)
+        try:
+            data = {"id": [reserva.id for reserva in reservas]}
+            response = self.client.delete(self.del_reserva_url, data, format="json")
+        finally:
+            post_delete.disconnect(receiver, sender=Reserva)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, (2, {"base.Reserva": 2}))
+        self.assertEqual(sorted(excluidas), [reserva.id for reserva in reservas])
+        # Os sinais da exclusão por conjunto também são enviados nesse caminho
+        self.assertFalse(ResumoDiario.objects.exists())
+
+    def test_del_reserva_sinais_conjunto_assincronos_success(self):
+        reserva = Reserva.objects.create(
+            cod_anuncio=self.anuncio,
+            data_checkin="2024-04-20",
+            data_checkout="2024-04-23",
+            preco_total=25.99,
+            comentario="meu comentario",
+            numero_hospedes=1,
+        )
+        recebidos = []
+
+        async def receiver(sender, quantidade, origin, **kwargs):
+            recebidos.append((sender, quantidade, origin))
+
+        post_delete_conjunto.connect(receiver, sender=Reserva)
+        try:
+            reserva.delete()
+        finally:
+            post_delete_conjunto.disconnect(receiver, sender=Reserva)
+        self.assertIsNone(reserva.id)
+        self.assertEqual(recebidos, [(Reserva, 1, Reserva)])
+
+    def test_del_reserva_queryset_invalida_cache_success(self):
+        reservas = [
+            Reserva.objects.create(
+                cod_anuncio=self.anuncio,
+                data_checkin="2024-04-20",
+                data_checkout="2024-04-23",
+                preco_total=25.99,
+                comentario="meu comentario",
+                numero_hospedes=1,
+            )
+            for _ in range(2)
+        ]
+        # Um "QuerySet.delete()" fora das rotas também invalida as listagens
+        versao = versao_model(Reserva)
+        Reserva.objects.filter(id__in=[reserva.id for reserva in reservas]).delete()
+        self.assertNotEqual(versao_model(Reserva), versao)
+
+    def test_del_reserva_instancia_sem_id_failure(self):
+        with self.assertRaises(ValueError):
+            Reserva(cod_anuncio=self.anuncio).delete()
+
+    def test_get_reservas_cache_success(self):
+        reserva = Reserva.objects.create(
+            cod_anuncio=self.anuncio,
+            data_checkin="2024-04-20",
+            data_checkout="2024-04-23",
+            preco_total=25.99,
+            comentario="meu comentario",
+            numero_hospedes=1,
+        )
+        response = self.client.get(self.get_reservas_url + f"?id={reserva.id}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # A mesma consulta, com o id normalizado, é respondida pelo cache (apenas a
+        # agregação do validador é executada)
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                self.get_reservas_url + f"?id={reserva.id},{reserva.id}"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]["id"], reserva.id)
+
+    def test_get_reservas_cache_invalidado_em_cascata_success(self):
+        Reserva.objects.create(
+            cod_anuncio=self.anuncio,
+            data_checkin="2024-04-20",
+            data_checkout="2024-04-23",
+            preco_total=25.99,
+            comentario="meu comentario",
+            numero_hospedes=1,
+        )
+        response = self.client.get(self.get_reservas_url)
+        self.assertEqual(len(response.data["results"]), 1)
+
+        # Excluir o imóvel exclui as reservas em cascata e invalida a listagem
+        response = self.client.delete(
+            reverse("api_imoveis:del_imovel"), {"id": self.imovel.id}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get(self.get_reservas_url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
     """
 
     TESTES DE FALHAS
@@ -108,6 +496,28 @@ class ReservaAPITests(APITestCase):
         response = self.client.post(self.add_reserva_url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_add_reserva_periodo_sobreposto_failure(self):
+        # Já existe uma reserva para o anúncio que se sobrepõe ao período
+        Reserva.objects.create(
+            cod_anuncio=self.anuncio,
+            data_checkin="2024-04-20",
+            data_checkout="2024-04-23",
+            preco_total=25.99,
+            comentario="meu comentario",
+            numero_hospedes=1,
+        )
+        data = {
+            "cod_anuncio": self.anuncio.id,
+            "data_checkin": "2024-04-22",
+            "data_checkout": "2024-04-25",
+            "preco_total": 25.99,
+            "comentario": "meu comentario",
+            "numero_hospedes": 1,
+        }
+        response = self.client.post(self.add_reserva_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Reserva.objects.count(), 1)
+
     # TESTES ADD RESERVA - FIM - FAILURE
 
     # TESTES GET RESERVA - INICIO - FAILURE
@@ -122,6 +532,18 @@ class ReservaAPITests(APITestCase):
         response = self.client.get(url_param)
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
+    def test_get_reservas_cursor_invalido_failure(self):
+        # Cursor que não foi gerado pela API
+        url_param = self.get_reservas_url + "?cursor=invalido"
+        response = self.client.get(url_param)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_get_disponibilidade_campos_faltantes_failure(self):
+        # Sem informar o período desejado
+        url_param = self.disponibilidade_url + f"?cod_anuncio={self.anuncio.id}"
+        response = self.client.get(url_param)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     # TESTES GET RESERVA - FIM - FAILURE
 
     # TESTES DEL RESERVA - INICIO - FAILURE
@@ -0,0 +1,254 @@
+import io
+from datetime import date
+from decimal import Decimal
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from base.models import Anuncio, Imovel, Reserva, ResumoDiario
+from utils.fixtures import carrega_fixtures
+from utils.resumo import reconstroi_resumo
+from utils.sinteticos import carrega_dados_sinteticos
+
+
+def linhas_resumo():
+    return list(
+        ResumoDiario.objects.order_by("cod_anuncio", "data").values_list(
+            "cod_anuncio", "data", "reservas", "continuacoes", "noites", "receita"
+        )
+    )
+
+
+class ResumoDiarioTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.imovel = Imovel.objects.create(
+            limite_hospedes=4,
+            quantidade_banheiros=1,
+            aceita_animais=True,
+            valor_limpeza=20.0,
+            data_ativacao="2022-01-01",
+        )
+        self.anuncio = Anuncio.objects.create(
+            cod_imovel=self.imovel, plataforma="airbnb", taxa_plataforma=10
+        )
+        self.outro_anuncio = Anuncio.objects.create(
+            cod_imovel=self.imovel, plataforma="booking", taxa_plataforma=15
+        )
+
+    def cria_reserva(self, checkin, checkout, preco, anuncio=None):
+        return Reserva.objects.create(
+            cod_anuncio=anuncio or self.anuncio,
+            data_checkin=checkin,
+            data_checkout=checkout,
+            preco_total=preco,
+            numero_hospedes=1,
+        )
+
+    def test_resumo_ao_criar_success(self):
+        self.cria_reserva("2024-04-20", "2024-04-23", 25.99)
+        # Reserva sem pernoite no dia do check-out da anterior
+        self.cria_reserva("2024-04-23", "2024-04-23", 10)
+        id_anuncio = self.anuncio.id
+        # Os centavos restantes da divisão vão para as primeiras noites
+        self.assertEqual(
+            linhas_resumo(),
+            [
+                (id_anuncio, date(2024, 4, 20), 1, 0, 1, Decimal("8.67")),
+                (id_anuncio, date(2024, 4, 21), 0, 1, 1, Decimal("8.66")),
+                (id_anuncio, date(2024, 4, 22), 0, 1, 1, Decimal("8.66")),
+                (id_anuncio, date(2024, 4, 23), 1, 0, 0, Decimal("10.00")),
+            ],
+        )
+
+    def test_resumo_consultas_ao_salvar_success(self):
+        def valores_anteriores(consultas):
+            # SELECTs dos valores gravados da reserva, feitos pelo "pre_save"
+            tabela = Reserva._meta.db_table
+            return [
+                consulta
+                for consulta in consultas
+                if consulta["sql"].startswith(f'SELECT "{tabela}"')
+            ]
+
+        # Cadastro: INSERT da reserva e, em um savepoint, SELECT e INSERT do resumo
+        with self.assertNumQueries(5) as consultas:
+            reserva = self.cria_reserva("2024-04-20", "2024-04-23", 30)
+        self.assertEqual(valores_anteriores(consultas), [])
+
+        # Alteração: os valores anteriores são consultados uma única vez
+        reserva.preco_total = Decimal("45")
+        with self.assertNumQueries(6) as consultas:
+            reserva.save()
+        self.assertEqual(len(valores_anteriores(consultas)), 1)
+
+    def test_resumo_fixture_raw_success(self):
+        reserva = Reserva(
+            cod_anuncio=self.anuncio,
+            data_checkin=date(2024, 4, 20),
+            data_checkout=date(2024, 4, 23),
+            preco_total=Decimal("30"),
+            numero_hospedes=1,
+            # Com "raw" o "auto_now" não é aplicado: as fixtures trazem o valor
+            data_atualizacao=timezone.now(),
+        )
+        # Como no "loaddata": nenhum valor anterior é consultado e o resumo não muda
+        with self.assertNumQueries(1):
+            reserva.save_base(raw=True)
+        self.assertEqual(linhas_resumo(), [])
+
+    def test_resumo_ao_alterar_success(self):
+        reserva = self.cria_reserva("2024-04-20", "2024-04-23", 30)
+        reserva.cod_anuncio = self.outro_anuncio
+        reserva.data_checkin = date(2024, 4, 22)
+        reserva.data_checkout = date(2024, 4, 24)
+        reserva.preco_total = Decimal("50")
+        reserva.save()
+        self.assertEqual(
+            linhas_resumo(),
+            [
+                (self.outro_anuncio.id, date(2024, 4, 22), 1, 0, 1, Decimal("25.00")),
+                (self.outro_anuncio.id, date(2024, 4, 23), 0, 1, 1, Decimal("25.00")),
+            ],
+        )
+
+        # Alterações em campos dos quais o resumo não depende não o consultam
+        reserva.comentario = "Chegada tarde"
+        with self.assertNumQueries(1):
+            reserva.save(update_fields=["comentario"])
+
+    def test_resumo_ao_excluir_success(self):
+        reservas = [
+            self.cria_reserva("2024-04-20", "2024-04-23", 30),
+            self.cria_reserva("2024-04-23", "2024-04-25", 20),
+        ]
+        response = self.client.delete(
+            reverse("api_reservas:del_reserva"),
+            {"id": [reservas[0].id]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [linha[1] for linha in linhas_resumo()],
+            [date(2024, 4, 23), date(2024, 4, 24)],
+        )
+
+        # "delete()" de uma instância
+        reservas[1].delete()
+        self.assertEqual(linhas_resumo(), [])
+
+    def test_resumo_ao_excluir_conjunto_consultas_success(self):
+        # Pelas rotas, o resumo é descontado uma vez por lote, e não por reserva
+        consultas = []
+        for quantidade in (1, 3):
+            ids = [
+                self.cria_reserva("2024-04-20", "2024-04-23", 30).id
+                for _ in range(quantidade)
+            ]
+            with CaptureQueriesContext(connection) as capturadas:
+                response = self.client.delete(
+                    reverse("api_reservas:del_reserva"), {"id": ids}, format="json"
+                )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            consultas.append(len(capturadas))
+        self.assertEqual(consultas[0], consultas[1])
+        self.assertEqual(linhas_resumo(), [])
+
+    def test_resumo_ao_excluir_queryset_success(self):
+        # Exclusões fora das rotas (admin, shell, scripts) também atualizam o resumo
+        reservas = [
+            self.cria_reserva("2024-04-20", "2024-04-23", 30),
+            self.cria_reserva("2024-04-20", "2024-04-22", 20),
+        ]
+        Reserva.objects.filter(id=reservas[0].id).delete()
+        self.assertEqual(
+            linhas_resumo(),
+            [
+                (self.anuncio.id, date(2024, 4, 20), 1, 0, 1, Decimal("10.00")),
+                (self.anuncio.id, date(2024, 4, 21), 0, 1, 1, Decimal("10.00")),
+            ],
+        )
+
+    def test_resumo_excluido_em_cascata_success(self):
+        self.cria_reserva("2024-04-20", "2024-04-23", 30)
+        self.cria_reserva("2024-04-20", "2024-04-21", 30, self.outro_anuncio)
+        response = self.client.delete(
+            reverse("api_anuncios:del_anuncio"), {"id": self.anuncio.id}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            linhas_resumo(),
+            [(self.outro_anuncio.id, date(2024, 4, 20), 1, 0, 1, Decimal("30.00"))],
+        )
+
+    def test_resumo_cadastro_em_lote_success(self):
+        data = [
+            {
+                "cod_anuncio": anuncio.id,
+                "data_checkin": "2024-04-20",
+                "data_checkout": "2024-04-22",
+                "preco_total": 25.99,
+                "comentario": "",
+                "numero_hospedes": 1,
+            }
+            for anuncio in (self.anuncio, self.outro_anuncio)
+        ]
+        response = self.client.post(
+            reverse("api_reservas:add_reservas_lote"), data, format="json"
+        )
+        self.assertEqual(response.data["criados"], 2)
+        incremental = linhas_resumo()
+        self.assertEqual(len(incremental), 4)
+        reconstroi_resumo()
+        self.assertEqual(linhas_resumo(), incremental)
+
+    def test_reconstroi_resumo_success(self):
+        self.cria_reserva("2024-04-20", "2024-04-23", 25.99)
+        self.cria_reserva("2024-04-25", "2024-04-25", 10)
+        self.cria_reserva("2024-04-20", "2024-04-22", 30, self.outro_anuncio)
+        incremental = linhas_resumo()
+
+        ResumoDiario.objects.all().delete()
+        self.assertEqual(
+            reconstroi_resumo([self.anuncio.id]), {"reservas": 2, "linhas": 4}
+        )
+        self.assertEqual(len(linhas_resumo()), 4)
+        # Os lotes pequenos dividem as linhas de um mesmo anúncio
+        reconstroi_resumo(tamanho_lote=1)
+        self.assertEqual(linhas_resumo(), incremental)
+
+    def test_resumo_cargas_em_lote_success(self):
+        # As fixtures usam PKs fixos, que podem coincidir com os criados no setUp
+        Imovel.objects.all().delete()
+        carrega_fixtures(
+            [
+                "fixtures/imoveis_fixture.json",
+                "fixtures/anuncio_fixture.json",
+                "fixtures/reserva_fixture.json",
+            ]
+        )
+        carrega_dados_sinteticos(200, seed=3)
+        carregado = linhas_resumo()
+        self.assertTrue(carregado)
+        reconstroi_resumo()
+        self.assertEqual(linhas_resumo(), carregado)
+
+    def test_comando_reconstroi_resumo_success(self):
+        self.cria_reserva("2024-04-20", "2024-04-23", 30)
+        ResumoDiario.objects.all().delete()
+        saida = io.StringIO()
+        call_command(
+            "reconstroi_resumo", "--anuncio", f"{self.anuncio.id},999999", stdout=saida
+        )
+        self.assertIn("3 linha(s) do resumo", saida.getvalue())
+        self.assertEqual(ResumoDiario.objects.count(), 3)
+
+    def test_comando_reconstroi_resumo_failure(self):
+        for argumentos in (["--anuncio", "a"], ["--lote", "0"]):
+            with self.assertRaises(CommandError):
+                call_command("reconstroi_resumo", *argumentos)
@@ -0,0 +1,79 @@
+import sqlite3
+import tempfile
+from pathlib import Path
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+from django.test import SimpleTestCase
+from utils.sqlite import SQLITE_PRAGMAS, comandos_pragmas
+
+
+class SQLitePragmasTests(SimpleTestCase):
+    def test_comandos_pragmas_success(self):
+        self.assertEqual(
+            comandos_pragmas({"journal_mode": "WAL", "cache_size": -20000}),
+            ["PRAGMA journal_mode = WAL", "PRAGMA cache_size = -20000"],
+        )
+
+    def test_comandos_pragmas_invalidos_failure(self):
+        for pragmas in (
+            {"journal_mode": "WAL; DROP TABLE base_reserva"},
+            {"busy timeout": 5000},
+        ):
+            with self.assertRaises(ImproperlyConfigured):
+                comandos_pragmas(pragmas)
+
+    def test_nova_conexao_arquivo_success(self):
+        # Uma nova conexão com um arquivo recebe os PRAGMAs de SQLITE_PRAGMAS
+        with tempfile.TemporaryDirectory() as diretorio:
+            padrao = connections["default"]
+            conexao = padrao.__class__(
+                {**padrao.settings_dict, "NAME": Path(diretorio) / "teste.sqlite3"},
+                alias="teste_pragmas",
+            )
+            try:
+                with conexao.cursor() as cursor:
+                    valores = {}
+                    for nome in SQLITE_PRAGMAS:
+                        cursor.execute(f"PRAGMA {nome}")
+                        valores[nome] = cursor.fetchone()[0]
+            finally:
+                conexao.close()
+
+        self.assertEqual(valores["journal_mode"], "wal")
+        # synchronous: 0=OFF, 1=NORMAL, 2=FULL
+        self.assertEqual(valores["synchronous"], 1)
+        self.assertEqual(valores["busy_timeout"], SQLITE_PRAGMAS["busy_timeout"])
+        self.assertEqual(valores["cache_size"], SQLITE_PRAGMAS["cache_size"])
+        self.assertEqual(valores["mmap_size"], SQLITE_PRAGMAS["mmap_size"])
+
+    def test_transacao_immediate_success(self):
+        # Com "transaction_mode" IMMEDIATE, o bloqueio de escrita é obtido no início
+        # da transação e outra conexão não consegue iniciar uma escrita
+        with tempfile.TemporaryDirectory() as diretorio:
+            arquivo = Path(diretorio) / "teste.sqlite3"
+            padrao = connections["default"]
+            conexao = padrao.__class__(
+                {
+                    **padrao.settings_dict,
+                    "NAME": arquivo,
+                    "OPTIONS": {"transaction_mode": "IMMEDIATE"},
+                },
+                alias="teste_transacao",
+            )
+            outra = sqlite3.connect(arquivo, timeout=0, isolation_level=None)
+            try:
+                conexao.ensure_connection()
+                conexao._start_transaction_under_autocommit()
+                with self.assertRaises(sqlite3.OperationalError):
+                    outra.execute("BEGIN IMMEDIATE")
+            finally:
+                outra.close()
+                conexao.close()
+
+    def test_transacao_modo_invalido_failure(self):
+        padrao = connections["default"]
+        with self.assertRaises(ImproperlyConfigured):
+            padrao.__class__(
+                {**padrao.settings_dict, "OPTIONS": {"transaction_mode": "LENTO"}},
+                alias="teste_transacao",
+            )
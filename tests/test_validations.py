@@ -0,0 +1,97 @@
+from datetime import date
+from decimal import Decimal
+from django.test import SimpleTestCase
+from api_anuncios.serializer import ESQUEMA_ALTERACAO_ANUNCIO
+from api_imoveis.serializer import ESQUEMA_CADASTRO_IMOVEL
+from utils.validations import converte_ids, divide_ids, valida_ids_payload
+
+
+class ValidationsTests(SimpleTestCase):
+    def test_converte_ids_lista_e_intervalo_success(self):
+        self.assertEqual(converte_ids("7, 3,1-3"), [1, 2, 3, 7])
+
+    def test_converte_ids_unico_success(self):
+        self.assertEqual(converte_ids("5"), [5])
+
+    def test_divide_ids_success(self):
+        self.assertEqual(list(divide_ids([1, 2, 3, 4, 5], 2)), [[1, 2], [3, 4], [5]])
+
+    def test_valida_ids_payload_success(self):
+        self.assertEqual(valida_ids_payload([3, 1, 3]), [1, 3])
+        self.assertEqual(valida_ids_payload(2), [2])
+
+    def test_esquema_cadastro_converte_valores_success(self):
+        dados, erro = ESQUEMA_CADASTRO_IMOVEL.valida(
+            {
+                "limite_hospedes": 6,
+                "quantidade_banheiros": 2,
+                "aceita_animais": True,
+                "valor_limpeza": 10.05,
+                "data_ativacao": "2020-12-21",
+                "campo_ignorado": 1,
+            }
+        )
+        self.assertIsNone(erro)
+        self.assertEqual(dados["valor_limpeza"], Decimal("10.05"))
+        self.assertEqual(dados["data_ativacao"], date(2020, 12, 21))
+        self.assertNotIn("campo_ignorado", dados)
+
+    def test_esquema_alteracao_chave_estrangeira_success(self):
+        dados, erro = ESQUEMA_ALTERACAO_ANUNCIO.valida(
+            {"cod_imovel": 3, "plataforma": " airbnb "}
+        )
+        self.assertIsNone(erro)
+        self.assertEqual(dados, {"cod_imovel_id": 3, "plataforma": "airbnb"})
+
+    """
+
+    TESTES DE FALHAS
+
+    """
+
+    def test_converte_ids_literal_python_failure(self):
+        # O parâmetro não deve ser interpretado como um literal Python
+        for param in ["[1, 2]", "(1,2)", "1e3", "-1", "1_000", "abc"]:
+            with self.assertRaises(ValueError):
+                converte_ids(param)
+
+    def test_converte_ids_intervalo_invertido_failure(self):
+        with self.assertRaises(ValueError):
+            converte_ids("10-1")
+
+    def test_converte_ids_quantidade_maxima_failure(self):
+        # O intervalo é recusado antes de ser expandido
+        with self.assertRaises(ValueError):
+            converte_ids("1-1000000000", max_quantidade=1000)
+        with self.assertRaises(ValueError):
+            converte_ids("1,2,3", max_quantidade=2)
+
+    def test_valida_ids_payload_failure(self):
+        self.assertIsNone(valida_ids_payload([]))
+        self.assertIsNone(valida_ids_payload([1, True]))
+        self.assertIsNone(valida_ids_payload([1, 2, 3], max_quantidade=2))
+
+    def test_esquema_cadastro_campo_faltante_failure(self):
+        _, erro = ESQUEMA_CADASTRO_IMOVEL.valida({"limite_hospedes": 6})
+        self.assertIn("obrigatórios", erro)
+
+    def test_esquema_alteracao_campo_inexistente_failure(self):
+        _, erro = ESQUEMA_ALTERACAO_ANUNCIO.valida({"campo_inexistente": 1})
+        self.assertIn("campo_inexistente", erro)
+
+    def test_esquema_tipo_e_conversao_failure(self):
+        _, erro = ESQUEMA_ALTERACAO_ANUNCIO.valida({"taxa_plataforma": "9.99"})
+        self.assertEqual(list(erro), ["taxa_plataforma"])
+        # Mais casas decimais do que o campo do model permite
+        _, erro = ESQUEMA_ALTERACAO_ANUNCIO.valida({"taxa_plataforma": 9.999})
+        self.assertEqual(list(erro), ["taxa_plataforma"])
+        _, erro = ESQUEMA_CADASTRO_IMOVEL.valida(
+            {
+                "limite_hospedes": 6,
+                "quantidade_banheiros": 2,
+                "aceita_animais": True,
+                "valor_limpeza": 10.05,
+                "data_ativacao": "2020-13-40",
+            }
+        )
+        self.assertEqual(list(erro), ["data_ativacao"])
@@ -0,0 +1,66 @@
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.exceptions import NotAcceptable
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.request import Request
+from utils.formatos import RENDERERS_LISTAGEM
+from utils.json_rapido import JSONRendererRapido
+from utils.metricas import cronometro
+
+# Formatos das listagens assíncronas (a API navegável depende de uma view do DRF)
+RENDERERS_ASYNC = [
+    renderer
+    for renderer in RENDERERS_LISTAGEM
+    if not issubclass(renderer, BrowsableAPIRenderer)
+]
+
+
+def requisicao_async(request):
+    """
+    Envolve a requisição do Django em uma Request do DRF.
+
+    As views assíncronas não passam pelo "@api_view", mas usam os mesmos
+    parâmetros ("query_params"), a mesma paginação e a mesma negociação de
+    formato das views síncronas.
+
+    Args:
+        request (HttpRequest): Requisição HTTP recebida pela view.
+
+    Returns:
+        Request: Requisição do DRF.
+
+    """
+    return Request(request)
+
+
+def resposta_async(request, dados, status_code=status.HTTP_200_OK):
+    """
+    Renderiza a resposta de uma view assíncrona no formato negociado.
+
+    O formato é escolhido pelo cabeçalho Accept ou por "?format=", como nas
+    views do DRF (JSON, colunar e MessagePack).
+
+    Args:
+        request (Request): Requisição retornada por "requisicao_async".
+        dados (object): Dados da resposta.
+        status_code (int): Status HTTP da resposta.
+
+    Returns:
+        HttpResponse: Resposta renderizada.
+
+    """
+    try:
+        renderer, media_type = DefaultContentNegotiation().select_renderer(
+            request, [renderer_class() for renderer_class in RENDERERS_ASYNC]
+        )
+    except NotAcceptable as erro:
+        renderer, media_type = JSONRendererRapido(), JSONRendererRapido.media_type
+        dados, status_code = {"detail": str(erro.detail)}, erro.status_code
+
+    content_type = media_type
+    if renderer.charset:
+        content_type = f"{media_type}; charset={renderer.charset}"
+    with cronometro("render"):
+        conteudo = renderer.render(dados, media_type, {})
+    return HttpResponse(conteudo, status=status_code, content_type=content_type)
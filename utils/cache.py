@@ -0,0 +1,149 @@
+import functools
+import hashlib
+import uuid
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+from utils.expansao import models_expandidos
+from utils.validations import converte_ids
+
+# Alias do cache (settings.CACHES) usado pelas listagens e tempo de expiração em segundos
+CACHE_LISTAGENS_ALIAS = getattr(settings, "CACHE_LISTAGENS_ALIAS", "default")
+CACHE_LISTAGENS_TIMEOUT = getattr(settings, "CACHE_LISTAGENS_TIMEOUT", 300)
+
+
+def _cache():
+    return caches[CACHE_LISTAGENS_ALIAS]
+
+
+def _chave_versao(model):
+    return f"listagem:versao:{model._meta.label_lower}"
+
+
+def versao_model(model):
+    """
+    Obtém a versão atual dos dados de um model no cache.
+
+    A versão faz parte da chave das respostas em cache; trocá-la torna todas as
+    respostas anteriores do model inacessíveis.
+
+    Args:
+        model (Model): Model consultado.
+
+    Returns:
+        str: Versão atual do model.
+
+    """
+    cache = _cache()
+    chave = _chave_versao(model)
+    versao = cache.get(chave)
+    if versao is None:
+        # Nunca reaproveitar uma versão antiga caso a chave tenha sido descartada
+        cache.add(chave, uuid.uuid4().hex, None)
+        versao = cache.get(chave)
+    return versao
+
+
+def invalida_listagens(*models):
+    """
+    Invalida as respostas em cache que dependem dos models informados.
+
+    A invalidação é feita imediatamente e repetida após o commit da transação,
+    para que uma leitura concorrente não mantenha em cache dados anteriores ao commit.
+
+    Args:
+        *models (Model): Models cujos dados foram alterados.
+
+    """
+
+    def troca_versoes():
+        _cache().set_many(
+            {_chave_versao(model): uuid.uuid4().hex for model in models}, None
+        )
+
+    troca_versoes()
+    transaction.on_commit(troca_versoes)
+
+
+def chave_listagem(request, endpoint, models):
+    """
+    Monta a chave de cache de uma listagem.
+
+    O parâmetro "id" é normalizado (ordenado e sem repetições), de modo que
+    "?id=3,1" e "?id=1-3" com os mesmos registros compartilham a mesma chave.
+
+    Args:
+        request (HttpRequest | Request): Requisição HTTP.
+        endpoint (str): Nome do endpoint.
+        models (list): Models dos quais a resposta depende.
+
+    Returns:
+        str: Chave da resposta no cache.
+
+    """
+    parametros = []
+    for nome, valor in sorted(request.GET.items()):
+        if nome == "id" and valor:
+            valor = ",".join(map(str, converte_ids(valor)))
+        parametros.append(f"{nome}={valor}")
+    versoes = ",".join(versao_model(model) for model in models)
+    assinatura = "&".join(parametros)
+    # O host faz parte da chave porque os links de paginação são absolutos
+    resumo = hashlib.md5(
+        f"{request.get_host()}|{assinatura}".encode(), usedforsecurity=False
+    ).hexdigest()
+    return f"listagem:{endpoint}:{versoes}:{resumo}"
+
+
+def cache_listagem(*models, expansoes=None):
+    """
+    Decorator que guarda em cache as respostas de sucesso de uma view de listagem.
+
+    Deve ser aplicado abaixo de "@api_view". Apenas respostas 200 são guardadas.
+
+    Args:
+        *models (Model): Models dos quais a resposta da view depende.
+        expansoes (dict): Expansões aceitas em "?expand="; os models expandidos
+            também passam a invalidar a resposta.
+
+    Examples:
+        @api_view(["GET"])
+        @cache_listagem(Imovel)
+        def get_imoveis(request):
+            ...
+
+    """
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            # A versão dos dados calculada por "condicao_listagem" (utils.condicional),
+            # quando presente, faz parte da chave: alterações que não passam pelos
+            # signals também trocam a resposta em cache
+            versao = getattr(request, "_versao_listagem", "")
+            try:
+                chave = chave_listagem(
+                    request,
+                    f"{view.__name__}:{versao}",
+                    [*models, *models_expandidos(request, expansoes)],
+                )
+            except ValueError:
+                # Parâmetros inválidos são tratados pela própria view
+                return view(request, *args, **kwargs)
+
+            dados = _cache().get(chave)
+            if dados is not None:
+                return Response(dados)
+
+            response = view(request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK and isinstance(
+                response, Response
+            ):
+                _cache().set(chave, response.data, CACHE_LISTAGENS_TIMEOUT)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,143 @@
+import contextlib
+from django.db import connections, transaction
+
+
+def prepara_linhas(campos, registros, conexao, fixos=None):
+    """
+    Converte registros em tuplas com os valores prontos para o banco.
+
+    Os valores são convertidos pelo próprio campo ("get_db_prep_save"), como
+    no ORM, sem instanciar o model.
+
+    Args:
+        campos (list): Campos do model, na ordem das colunas.
+        registros (iterable): Dicionários {attname: valor}.
+        conexao (BaseDatabaseWrapper): Conexão de destino.
+        fixos (dict): Valores iguais em todos os registros, convertidos uma única vez.
+
+    Returns:
+        list: Uma tupla por registro.
+
+    """
+    fixos = {
+        campo.attname: campo.get_db_prep_save(fixos[campo.attname], conexao)
+        for campo in campos
+        if fixos and campo.attname in fixos
+    }
+    conversores = [(campo.attname, campo.get_db_prep_save) for campo in campos]
+    return [
+        tuple(
+            fixos[attname] if attname in fixos else prepara(registro[attname], conexao)
+            for attname, prepara in conversores
+        )
+        for registro in registros
+    ]
+
+
+def insere_linhas(model, campos, linhas, using):
+    """
+    Insere linhas já convertidas em uma tabela, sem instanciar o model.
+
+    No PostgreSQL com psycopg 3, usa "COPY ... FROM STDIN"; nos demais bancos,
+    um único INSERT preparado com "executemany", evitando a montagem do SQL a
+    cada lote do "bulk_create". Não dispara signals nem preenche campos
+    "auto_now": os valores das linhas são gravados como estão.
+
+    Args:
+        model (Model): Model da tabela.
+        campos (list): Campos do model, na ordem dos valores de cada linha.
+        linhas (list): Tuplas de valores (ver "prepara_linhas").
+        using (str): Alias do banco.
+
+    """
+    conexao = connections[using]
+    quote = conexao.ops.quote_name
+    tabela = quote(model._meta.db_table)
+    colunas = ", ".join(quote(campo.column) for campo in campos)
+    with conexao.cursor() as cursor:
+        copy = getattr(cursor.cursor, "copy", None)
+        if conexao.vendor == "postgresql" and copy is not None:
+            with copy(f"COPY {tabela} ({colunas}) FROM STDIN") as copia:
+                for linha in linhas:
+                    copia.write_row(linha)
+            return
+        cursor.executemany(
+            f"INSERT INTO {tabela} ({colunas}) "
+            f"VALUES ({', '.join(['%s'] * len(campos))})",
+            linhas,
+        )
+
+
+def indices_adiaveis(model, using):
+    """
+    Lista os índices secundários (não únicos) da tabela de um model.
+
+    Índices únicos e chaves primárias não são listados: eles garantem a
+    integridade dos dados durante a carga.
+
+    Args:
+        model (Model): Model da tabela.
+        using (str): Alias do banco.
+
+    Returns:
+        list: Tuplas (nome, SQL de criação). Vazia em bancos sem suporte
+            (apenas SQLite e PostgreSQL são suportados).
+
+    """
+    conexao = connections[using]
+    tabela = model._meta.db_table
+    with conexao.cursor() as cursor:
+        if conexao.vendor == "sqlite":
+            # Índices automáticos (UNIQUE, chave primária) não possuem SQL
+            cursor.execute(
+                "SELECT name, sql FROM sqlite_master "
+                "WHERE type = 'index' AND tbl_name = %s AND sql IS NOT NULL",
+                [tabela],
+            )
+        elif conexao.vendor == "postgresql":
+            cursor.execute(
+                "SELECT indexname, indexdef FROM pg_indexes "
+                "WHERE tablename = %s AND schemaname = current_schema()",
+                [tabela],
+            )
+        else:
+            return []
+        indices = cursor.fetchall()
+    return [
+        (nome, sql)
+        for nome, sql in indices
+        if not sql.upper().startswith("CREATE UNIQUE")
+    ]
+
+
+@contextlib.contextmanager
+def indices_adiados(models, using):
+    """
+    Remove os índices secundários das tabelas e os recria ao final.
+
+    Inserir sem manter os índices e criá-los depois, de uma só vez, é mais
+    rápido em cargas grandes. Os índices são recriados mesmo se a carga falhar.
+
+    Args:
+        models (iterable): Models das tabelas.
+        using (str): Alias do banco.
+
+    Yields:
+        list: Nomes dos índices removidos.
+
+    Examples:
+        >>> with indices_adiados([Reserva], "default"):
+        ...     insere_linhas(Reserva, campos, linhas, "default")
+
+    """
+    conexao = connections[using]
+    indices = [indice for model in models for indice in indices_adiaveis(model, using)]
+    with transaction.atomic(using=using), conexao.cursor() as cursor:
+        for nome, _ in indices:
+            cursor.execute(f"DROP INDEX {conexao.ops.quote_name(nome)}")
+    try:
+        yield [nome for nome, _ in indices]
+    finally:
+        with transaction.atomic(using=using), conexao.cursor() as cursor:
+            for _, sql in indices:
+                cursor.execute(sql)
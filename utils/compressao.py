@@ -0,0 +1,190 @@
+import zlib
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depende do ambiente
+    brotli = None
+
+# Respostas menores que este tamanho (em bytes) não são comprimidas
+COMPRESSAO_TAMANHO_MINIMO = getattr(settings, "COMPRESSAO_TAMANHO_MINIMO", 1024)
+# Nível do gzip (1 a 9) e qualidade do brotli (0 a 11). Valores intermediários
+# comprimem bem o JSON repetitivo das listagens sem pesar na CPU a cada requisição
+COMPRESSAO_GZIP_NIVEL = getattr(settings, "COMPRESSAO_GZIP_NIVEL", 6)
+COMPRESSAO_BROTLI_QUALIDADE = getattr(settings, "COMPRESSAO_BROTLI_QUALIDADE", 5)
+
+
+def codificacoes_aceitas(accept_encoding):
+    """
+    Interpreta o cabeçalho Accept-Encoding.
+
+    Args:
+        accept_encoding (str): Valor do cabeçalho, ex.: "gzip, br;q=0.8".
+
+    Returns:
+        dict: Peso (q) de cada codificação aceita.
+
+    """
+    aceitas = {}
+    for item in accept_encoding.split(","):
+        nome, *parametros = item.split(";")
+        nome = nome.strip().lower()
+        if not nome:
+            continue
+        peso = 1.0
+        for parametro in parametros:
+            chave, _, valor = parametro.partition("=")
+            if chave.strip().lower() == "q":
+                try:
+                    peso = float(valor)
+                except ValueError:
+                    peso = 0.0
+        aceitas[nome] = peso
+    return aceitas
+
+
+def escolhe_codificacao(accept_encoding):
+    """
+    Escolhe a codificação da resposta: brotli (se instalado) ou gzip.
+
+    Entre codificações com o mesmo peso, o brotli é preferido.
+
+    Args:
+        accept_encoding (str): Valor do cabeçalho Accept-Encoding.
+
+    Returns:
+        str | None: "br", "gzip" ou None se nenhuma for aceita.
+
+    """
+    aceitas = codificacoes_aceitas(accept_encoding)
+    padrao = aceitas.get("*", 0.0)
+    escolhida, maior_peso = None, 0.0
+    for codificacao in ("br", "gzip") if brotli else ("gzip",):
+        peso = aceitas.get(codificacao, padrao)
+        if peso > maior_peso:
+            escolhida, maior_peso = codificacao, peso
+    return escolhida
+
+
+def _compressor(codificacao):
+    # Retorna as funções que comprimem um pedaço (com flush) e finalizam o fluxo
+    if codificacao == "br":
+        compressor = brotli.Compressor(quality=COMPRESSAO_BROTLI_QUALIDADE)
+        return (
+            lambda pedaco: compressor.process(pedaco) + compressor.flush(),
+            compressor.finish,
+        )
+    # wbits=31: formato gzip (cabeçalho e CRC)
+    compressor = zlib.compressobj(COMPRESSAO_GZIP_NIVEL, zlib.DEFLATED, 31)
+
+    def comprime_pedaco(pedaco):
+        return compressor.compress(pedaco) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    return comprime_pedaco, compressor.flush
+
+
+def comprime(conteudo, codificacao):
+    """
+    Comprime um conteúdo completo.
+
+    Args:
+        conteudo (bytes): Conteúdo a ser comprimido.
+        codificacao (str): "br" ou "gzip".
+
+    Returns:
+        bytes: Conteúdo comprimido.
+
+    """
+    if codificacao == "br":
+        return brotli.compress(conteudo, quality=COMPRESSAO_BROTLI_QUALIDADE)
+    return zlib.compress(conteudo, COMPRESSAO_GZIP_NIVEL, wbits=31)
+
+
+def comprime_pedacos(pedacos, codificacao):
+    """
+    Comprime uma sequência de pedaços, um a um, sem acumular o conteúdo.
+
+    Cada pedaço é enviado ao cliente assim que é comprimido (flush), então a
+    resposta continua sendo entregue em streaming.
+
+    Args:
+        pedacos (iterable): Pedaços (bytes) da resposta.
+        codificacao (str): "br" ou "gzip".
+
+    Yields:
+        bytes: Pedaços comprimidos.
+
+    """
+    comprime_pedaco, finaliza = _compressor(codificacao)
+    for pedaco in pedacos:
+        dados = comprime_pedaco(pedaco)
+        if dados:
+            yield dados
+    yield finaliza()
+
+
+async def acomprime_pedacos(pedacos, codificacao):
+    # Versão de "comprime_pedacos" para respostas em streaming assíncronas
+    comprime_pedaco, finaliza = _compressor(codificacao)
+    async for pedaco in pedacos:
+        dados = comprime_pedaco(pedaco)
+        if dados:
+            yield dados
+    yield finaliza()
+
+
+class CompressaoMiddleware(MiddlewareMixin):
+    """
+    Comprime as respostas com brotli ou gzip, conforme o Accept-Encoding.
+
+    Respostas comuns menores que "COMPRESSAO_TAMANHO_MINIMO" não são
+    comprimidas. Respostas em streaming (ex.: exportações) são comprimidas
+    pedaço a pedaço, sem carregar o corpo inteiro em memória. Assim como o
+    GZipMiddleware do Django, o ETag passa a ser fraco ("W/"), o que continua
+    permitindo respostas "304 Not Modified".
+
+    Deve ser incluído no início de "MIDDLEWARE", para comprimir o conteúdo
+    final da resposta.
+
+    """
+
+    def process_response(self, request, response):
+        if not response.streaming and len(response.content) < COMPRESSAO_TAMANHO_MINIMO:
+            return response
+
+        # Não comprimir novamente uma resposta que já possui Content-Encoding
+        if response.has_header("Content-Encoding"):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        codificacao = escolhe_codificacao(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if codificacao is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = acomprime_pedacos(
+                    response.streaming_content, codificacao
+                )
+            else:
+                response.streaming_content = comprime_pedacos(
+                    response.streaming_content, codificacao
+                )
+            # O tamanho final só é conhecido ao término do streaming
+            del response.headers["Content-Length"]
+        else:
+            conteudo = comprime(response.content, codificacao)
+            # Enviar o conteúdo comprimido apenas se ele for menor
+            if len(conteudo) >= len(response.content):
+                return response
+            response.content = conteudo
+            response.headers["Content-Length"] = str(len(conteudo))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = codificacao
+        return response
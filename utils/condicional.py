@@ -0,0 +1,163 @@
+import hashlib
+from django.db.models import Count, Max
+from django.views.decorators.http import condition
+from rest_framework.exceptions import NotFound
+from utils.expansao import caminhos_expandidos
+from utils.paginacao import ids_pagina
+from utils.validations import converte_ids, divide_ids
+
+
+def querysets_listagem(model, request, filtros=None):
+    """
+    Monta os querysets com os registros que uma listagem retorna.
+
+    Sem o parâmetro "id", apenas os registros da página solicitada (pelo cursor
+    e pelo "limite") e o registro seguinte, que define o link "next".
+
+    Args:
+        model (Model): Model da listagem.
+        request (HttpRequest): Requisição HTTP contendo o parâmetro "id".
+        filtros (FiltrosListagem): Filtros aceitos na URL da listagem.
+
+    Returns:
+        list: Querysets (um por pedaço de IDs) com os registros filtrados.
+
+    Raises:
+        ValueError: Se o parâmetro "id" ou algum filtro for inválido.
+        NotFound: Se o cursor informado for inválido.
+
+    """
+    registros = model.objects.all()
+    if filtros is not None:
+        registros = filtros.aplica(registros, request.GET)
+    param = request.GET.get("id")
+    if not param:
+        return [model.objects.filter(id__in=ids_pagina(request, registros))]
+    return [
+        registros.filter(id__in=lote_ids)
+        for lote_ids in divide_ids(converte_ids(param))
+    ]
+
+
+def validador_listagem(model, request, expansoes=None, filtros=None):
+    """
+    Calcula o validador (ETag e Last-Modified) de uma listagem.
+
+    Usa uma única agregação MAX(data_atualizacao), MAX(id) e COUNT sobre os
+    registros que a resposta contém, calculada a cada requisição: qualquer
+    alteração atualiza o MAX e qualquer exclusão altera o COUNT ou o último ID
+    da página, inclusive as feitas por outros processos ou sem os signals dos
+    models ("update()", "bulk_create", cargas em lote). A agregação percorre
+    apenas a página solicitada (ou os IDs de "?id="), de modo que o custo não
+    cresce com o tamanho da tabela. O resultado é guardado na requisição para
+    ser calculado uma só vez. Exclusões não alteram o Last-Modified, por isso o
+    ETag deve ser preferido. Com "?expand=", a mesma agregação inclui os
+    registros expandidos.
+
+    Args:
+        model (Model): Model da listagem.
+        request (HttpRequest): Requisição HTTP.
+        expansoes (dict): Expansões aceitas em "?expand=".
+        filtros (FiltrosListagem): Filtros aceitos na URL; o validador considera
+            apenas os registros filtrados.
+
+    Returns:
+        tuple: ETag (str) e data da última atualização (datetime), ou
+            (None, None) se os parâmetros forem inválidos.
+
+    """
+    if hasattr(request, "_validador_listagem"):
+        return request._validador_listagem
+
+    try:
+        querysets = querysets_listagem(model, request, filtros)
+        um, muitos = caminhos_expandidos(request, expansoes)
+    except (ValueError, NotFound):
+        # Parâmetros inválidos são tratados pela própria view
+        request._validador_listagem = (None, None)
+        return request._validador_listagem
+
+    request._validador_listagem = _calcula_validador(request, querysets, um, muitos)
+    return request._validador_listagem
+
+
+def _calcula_validador(request, querysets, um, muitos):
+    # Um MAX e um COUNT por caminho ("" para os próprios registros). Os JOINs das
+    # expansões "muitos" repetem os registros, que então são contados sem repetições.
+    # O último ID muda quando um registro da página é excluído e o seguinte entra
+    caminhos = ["", *um, *muitos]
+    agregacoes = {"ultimo_id": Max("id")}
+    for indice, caminho in enumerate(caminhos):
+        prefixo = f"{caminho}__" if caminho else ""
+        agregacoes[f"ultima_{indice}"] = Max(f"{prefixo}data_atualizacao")
+        agregacoes[f"quantidade_{indice}"] = Count(
+            f"{prefixo}id", distinct=bool(muitos)
+        )
+
+    ultimas = [None] * len(caminhos)
+    quantidades = [0] * len(caminhos)
+    ultimos_ids = []
+    for registros in querysets:
+        agregado = registros.aggregate(**agregacoes)
+        ultimos_ids.append(str(agregado["ultimo_id"]))
+        for indice in range(len(caminhos)):
+            quantidades[indice] += agregado[f"quantidade_{indice}"]
+            ultima = agregado[f"ultima_{indice}"]
+            if ultima and (ultimas[indice] is None or ultima > ultimas[indice]):
+                ultimas[indice] = ultima
+
+    # Versão dos dados, usada também na chave do cache das listagens (utils.cache)
+    dados = "|".join(
+        [
+            ",".join(ultimos_ids),
+            *(
+                f"{ultima.isoformat() if ultima else ''}:{quantidade}"
+                for ultima, quantidade in zip(ultimas, quantidades)
+            ),
+        ]
+    )
+    request._versao_listagem = hashlib.md5(
+        dados.encode(), usedforsecurity=False
+    ).hexdigest()
+
+    # A representação também depende dos parâmetros e do formato solicitado
+    assinatura = "|".join(
+        [
+            request.path,
+            request.GET.urlencode(),
+            request.META.get("HTTP_ACCEPT", ""),
+            request._versao_listagem,
+        ]
+    )
+    etag = hashlib.md5(assinatura.encode(), usedforsecurity=False).hexdigest()
+    return f'"{etag}"', ultimas[0]
+
+
+def condicao_listagem(model, expansoes=None, filtros=None):
+    """
+    Decorator que responde "304 Not Modified" quando a listagem não mudou.
+
+    Deve ser aplicado acima de "@api_view". Quando o "If-None-Match" (ou o
+    "If-Modified-Since") enviado pelo cliente corresponde ao validador atual, a
+    view não é executada e nada é serializado.
+
+    Args:
+        model (Model): Model da listagem.
+        expansoes (dict): Expansões aceitas em "?expand=".
+        filtros (FiltrosListagem): Filtros aceitos na URL da listagem.
+
+    Examples:
+        @condicao_listagem(Imovel)
+        @api_view(["GET"])
+        def get_imoveis(request):
+            ...
+
+    """
+
+    def etag(request, *args, **kwargs):
+        return validador_listagem(model, request, expansoes, filtros)[0]
+
+    def ultima_atualizacao(request, *args, **kwargs):
+        return validador_listagem(model, request, expansoes, filtros)[1]
+
+    return condition(etag_func=etag, last_modified_func=ultima_atualizacao)
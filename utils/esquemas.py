@@ -0,0 +1,216 @@
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from django.db import models
+
+
+def _conversor_decimal(campo_model):
+    # Reproduz as validações de precisão do DecimalField do DRF
+    casas_decimais = campo_model.decimal_places
+    max_digitos_inteiros = campo_model.max_digits - casas_decimais
+    quantum = Decimal(1).scaleb(-casas_decimais)
+    mensagem_casas = (
+        f"Certifique-se de que não haja mais de {casas_decimais} casas decimais."
+    )
+    mensagem_digitos = (
+        f"Certifique-se de que não haja mais de {max_digitos_inteiros} dígitos "
+        "antes do ponto decimal."
+    )
+
+    def converte(valor):
+        try:
+            numero = Decimal(str(valor))
+        except InvalidOperation:
+            raise ValueError("Um número válido é necessário.")
+        if not numero.is_finite():
+            raise ValueError("Um número válido é necessário.")
+        _, digitos, expoente = numero.as_tuple()
+        if expoente >= 0:
+            decimais = 0
+            inteiros = len(digitos) + expoente
+        else:
+            decimais = -expoente
+            inteiros = max(len(digitos), decimais) - decimais
+        if decimais > casas_decimais:
+            raise ValueError(mensagem_casas)
+        if inteiros > max_digitos_inteiros:
+            raise ValueError(mensagem_digitos)
+        return numero.quantize(quantum)
+
+    return converte
+
+
+def _conversor_data(campo_model):
+    mensagem = "Data em formato inválido. Use o formato YYYY-MM-DD."
+
+    def converte(valor):
+        # Aceitar apenas o formato YYYY-MM-DD
+        if len(valor) != 10:
+            raise ValueError(mensagem)
+        try:
+            return date.fromisoformat(valor)
+        except ValueError:
+            raise ValueError(mensagem)
+
+    return converte
+
+
+def _conversor_texto(campo_model):
+    max_length = campo_model.max_length
+    permite_vazio = campo_model.blank
+
+    def converte(valor):
+        # Remover espaços nas extremidades, como o CharField do DRF
+        valor = valor.strip()
+        if not valor and not permite_vazio:
+            raise ValueError("Este campo não pode ser em branco.")
+        if max_length is not None and len(valor) > max_length:
+            raise ValueError(
+                f"Certifique-se de que este campo não tenha mais de {max_length} caracteres."
+            )
+        return valor
+
+    return converte
+
+
+CONVERSORES = {
+    models.DecimalField: _conversor_decimal,
+    models.DateField: _conversor_data,
+    models.CharField: _conversor_texto,
+    models.TextField: _conversor_texto,
+}
+
+
+class EsquemaPayload:
+    """
+    Especificação compilada dos campos aceitos no payload de um endpoint.
+
+    O esquema é montado uma única vez, na importação do módulo, a partir dos
+    tipos esperados no JSON e dos campos do model. A validação percorre o payload
+    uma única vez, verificando campos obrigatórios, campos inexistentes e tipos,
+    e já converte os valores para os tipos do model (Decimal, date, ...), de modo
+    que o serializer do DRF não precisa validar os dados novamente.
+
+    Args:
+        model (Model): Model cujos campos são recebidos no payload.
+        tipos (dict): Campos aceitos e o tipo esperado no JSON de cada um.
+        obrigatorios (bool): Se todos os campos do esquema são obrigatórios.
+        recusa_desconhecidos (bool): Se campos fora do esquema tornam o payload
+            inválido. Caso contrário, eles são ignorados, como faz o serializer.
+        prefixo_desconhecidos (str): Texto no início da mensagem de campos
+            inexistentes (ex.: "Registro não atualizado! ").
+
+    Examples:
+        >>> esquema = EsquemaPayload(Anuncio, {"cod_imovel": int, "plataforma": str})
+        >>> esquema.valida({"cod_imovel": 1, "plataforma": " airbnb "})
+        ({'cod_imovel_id': 1, 'plataforma': 'airbnb'}, None)
+
+    """
+
+    def __init__(
+        self,
+        model,
+        tipos,
+        obrigatorios=True,
+        recusa_desconhecidos=True,
+        prefixo_desconhecidos="",
+    ):
+        self.model = model
+        self.recusa_desconhecidos = recusa_desconhecidos
+        self.prefixo_desconhecidos = prefixo_desconhecidos
+        self.tipos = dict(tipos)
+        self.obrigatorios = frozenset(self.tipos) if obrigatorios else frozenset()
+        self.mensagens_tipo = {
+            campo: f"Tipo de dado incorreto! Esperado: {tipo}. "
+            for campo, tipo in self.tipos.items()
+        }
+        self.campos_permitidos = str(list(self.tipos))[1:][:-1]
+
+        self.conversores = {}
+        self.nomes_destino = {}
+        self.relacionados = {}
+        for campo in self.tipos:
+            campo_model = model._meta.get_field(campo)
+            if campo_model.is_relation:
+                # Chaves estrangeiras são salvas pelo ID, sem buscar o objeto
+                self.nomes_destino[campo] = campo_model.attname
+                self.relacionados[campo] = campo_model.related_model
+                continue
+            self.nomes_destino[campo] = campo
+            for classe, fabrica in CONVERSORES.items():
+                if isinstance(campo_model, classe):
+                    self.conversores[campo] = fabrica(campo_model)
+                    break
+
+    def valida(self, payload):
+        """
+        Valida e converte um payload em uma única passagem.
+
+        Args:
+            payload (dict): Dados recebidos na requisição.
+
+        Returns:
+            tuple: Dicionário com os valores convertidos (chaves estrangeiras
+                como "<campo>_id") e o erro encontrado, ou None se for válido.
+
+        """
+        if not isinstance(payload, dict):
+            return None, "O payload deve ser um objeto JSON."
+
+        tipos = self.tipos
+        conversores = self.conversores
+        nomes_destino = self.nomes_destino
+        dados = {}
+        campos_invalidos = []
+        tipos_incorretos = {}
+        erros_conversao = {}
+        for campo, valor in payload.items():
+            tipo = tipos.get(campo)
+            if tipo is None:
+                campos_invalidos.append(campo)
+            elif type(valor) is not tipo:
+                tipos_incorretos[campo] = self.mensagens_tipo[campo]
+            elif campo in conversores:
+                try:
+                    dados[nomes_destino[campo]] = conversores[campo](valor)
+                except ValueError as erro:
+                    erros_conversao[campo] = [str(erro)]
+            else:
+                dados[nomes_destino[campo]] = valor
+
+        campos_faltantes = self.obrigatorios.difference(payload)
+        if campos_faltantes:
+            return dados, (
+                "Os campos a seguir são obrigatórios e não foram preenchidos. "
+                f"{str(sorted(campos_faltantes))[1:][:-1]}"
+            )
+        if campos_invalidos and self.recusa_desconhecidos:
+            return dados, (
+                f"{self.prefixo_desconhecidos}Os campos a seguir não existem na tabela "
+                f"{self.model.__name__}: {str(campos_invalidos)[1:][:-1]}. "
+                f"Campos permitidos: {self.campos_permitidos}"
+            )
+        if tipos_incorretos:
+            return dados, tipos_incorretos
+        if erros_conversao:
+            return dados, erros_conversao
+        return dados, None
+
+    def valida_relacionados(self, dados):
+        """
+        Verifica se os registros referenciados pelas chaves estrangeiras existem.
+
+        Args:
+            dados (dict): Valores retornados por "valida".
+
+        Returns:
+            dict | None: Erro por campo, ou None se todos os registros existirem.
+
+        """
+        erros = {}
+        for campo, model in self.relacionados.items():
+            id_relacionado = dados.get(self.nomes_destino[campo])
+            if id_relacionado is None:
+                continue
+            if not model.objects.filter(pk=id_relacionado).exists():
+                erros[campo] = [f'Pk inválido "{id_relacionado}" - objeto não existe.']
+        return erros or None
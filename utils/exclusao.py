@@ -0,0 +1,157 @@
+from collections import Counter
+from contextvars import ContextVar
+from django.db import models, router, transaction
+from django.dispatch import Signal
+from utils.validations import divide_ids
+
+# Models cujas exclusões em andamento são notificadas pelos sinais por conjunto
+_models_por_conjunto = ContextVar("models_por_conjunto", default=frozenset())
+
+
+def plano_exclusao(model, lookup="id__in"):
+    """
+    Monta a lista de exclusões em cascata necessárias para excluir um model.
+
+    Os models dependentes aparecem antes do model principal, na ordem em que
+    devem ser excluídos. Cada item contém o model e o lookup que seleciona os
+    seus registros a partir dos IDs do model principal.
+
+    Args:
+        model (Model): Model cujos registros serão excluídos.
+        lookup (str): Lookup que filtra os registros do model pelos IDs.
+
+    Returns:
+        list | None: Lista de tuplas (model, lookup), ou None se algum
+            relacionamento não usar "on_delete=CASCADE".
+
+    """
+    plano = []
+    for relacionado in model._meta.related_objects:
+        if relacionado.on_delete is not models.CASCADE:
+            return None
+        plano_relacionado = plano_exclusao(
+            relacionado.related_model, f"{relacionado.field.name}__{lookup}"
+        )
+        if plano_relacionado is None:
+            return None
+        plano += plano_relacionado
+    plano.append((model, lookup))
+    return plano
+
+
+# Sinais da exclusão por conjunto, enviados por "exclui_registros" uma vez por
+# model e por lote de IDs, com o queryset dos registros ("registros") antes do
+# DELETE e com a quantidade excluída ("quantidade") depois dele. Os argumentos
+# "using" e "origin" (model cujos IDs foram informados) seguem os do
+# "pre_delete"/"post_delete" do Django, que continuam sendo enviados para cada
+# registro.
+pre_delete_conjunto = Signal()
+post_delete_conjunto = Signal()
+
+
+def exclusao_por_conjunto(model):
+    """
+    Verifica se a exclusão em andamento de um model é feita por "exclui_registros".
+
+    Os receivers de "pre_delete"/"post_delete" que têm um equivalente nos sinais
+    por conjunto usam esta função para não repetir, registro a registro, o
+    trabalho já feito uma vez por model. Em qualquer outra exclusão
+    ("QuerySet.delete()" no admin, no shell ou em scripts), eles continuam
+    responsáveis por manter os dados derivados.
+
+    Args:
+        model (Model): Model do registro excluído ("sender" do sinal).
+
+    Returns:
+        bool: Se os sinais por conjunto já notificam a exclusão do model.
+
+    """
+    return model in _models_por_conjunto.get()
+
+
+def exclui_registros(model, ids, using=None):
+    """
+    Exclui registros e os seus dependentes, notificando cada model uma única vez.
+
+    A exclusão é feita pelo "delete()" padrão do Django, por lotes de IDs, e
+    "pre_delete_conjunto" e "post_delete_conjunto" são enviados para cada model
+    da cascata. Os receivers dos sinais por conjunto fazem o trabalho uma vez
+    por model (ex.: descontar do resumo diário todas as reservas com uma única
+    consulta) e os receivers equivalentes de "pre_delete"/"post_delete" deixam
+    de repeti-lo para cada registro (ver "exclusao_por_conjunto"). Models sem
+    receivers de "pre_delete"/"post_delete" são excluídos pelo Django com um
+    único DELETE, sem carregar os objetos em memória.
+
+    Args:
+        model (Model): Model cujos registros serão excluídos.
+        ids (list): IDs dos registros a serem excluídos.
+        using (str): Alias do banco (opcional; padrão: o do roteador).
+
+    Returns:
+        tuple: Total de registros excluídos e dicionário com a quantidade por
+            model, no mesmo formato retornado por "QuerySet.delete()".
+
+    """
+    using = using or router.db_for_write(model)
+    # Sem o plano (relacionamento sem CASCADE), apenas o próprio model é notificado
+    plano = plano_exclusao(model) or [(model, "id__in")]
+    contador = Counter()
+    token = _models_por_conjunto.set(
+        _models_por_conjunto.get() | {item_model for item_model, _ in plano}
+    )
+    try:
+        with transaction.atomic(using=using):
+            for lote_ids in divide_ids(ids):
+                for item_model, lookup in plano:
+                    pre_delete_conjunto.send(
+                        sender=item_model,
+                        registros=item_model._base_manager.using(using).filter(
+                            **{lookup: lote_ids}
+                        ),
+                        using=using,
+                        origin=model,
+                    )
+                registros = model._base_manager.using(using).filter(id__in=lote_ids)
+                contador.update(registros.delete()[1])
+
+            for item_model, _ in plano:
+                quantidade = contador[item_model._meta.label]
+                if quantidade:
+                    post_delete_conjunto.send(
+                        sender=item_model,
+                        quantidade=quantidade,
+                        using=using,
+                        origin=model,
+                    )
+    finally:
+        _models_por_conjunto.reset(token)
+    return sum(contador.values()), dict(contador)
+
+
+class ExclusaoPorConjunto:
+    """
+    Faz o "delete()" de uma instância passar por "exclui_registros".
+
+    Assim, a exclusão de um único registro (e da sua cascata) também notifica
+    cada model uma única vez pelos sinais da exclusão por conjunto. Models com
+    herança multi-tabela usam o "delete()" padrão, que trata "keep_parents".
+
+    Examples:
+        class Reserva(ExclusaoPorConjunto, models.Model):
+            ...
+
+    """
+
+    def delete(self, using=None, keep_parents=False):
+        if self._meta.parents:
+            return super().delete(using=using, keep_parents=keep_parents)
+        if self.pk is None:
+            raise ValueError(
+                f"{self._meta.object_name} object can't be deleted because its "
+                f"{self._meta.pk.attname} attribute is set to None."
+            )
+        using = using or router.db_for_write(self.__class__, instance=self)
+        resultado = exclui_registros(type(self), [self.pk], using)
+        # Como no "delete()" do Django, a instância deixa de ter um ID
+        setattr(self, self._meta.pk.attname, None)
+        return resultado
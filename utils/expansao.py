@@ -0,0 +1,178 @@
+from collections import namedtuple
+from django.utils.module_loading import import_string
+from rest_framework import serializers
+from utils.metricas import cronometro
+
+# Relacionamento que pode ser incluído em uma listagem com "?expand=".
+# "model" é o model incluído na resposta, "select_related"/"prefetch_related" o
+# caminho carregado junto com os registros e "depende" a expansão necessária
+# para que esta faça sentido (ex.: as reservas são listadas dentro dos anúncios).
+Expansao = namedtuple(
+    "Expansao",
+    ["model", "select_related", "prefetch_related", "depende"],
+    defaults=[None, None, None],
+)
+
+
+def converte_expansoes(param, expansoes):
+    """
+    Converte o parâmetro "expand" em um conjunto de nomes de expansões.
+
+    Args:
+        param (str): Valor do parâmetro, ex.: "anuncios,reservas".
+        expansoes (dict): Expansões aceitas pelo endpoint.
+
+    Returns:
+        frozenset: Nomes das expansões solicitadas.
+
+    Raises:
+        ValueError: Se alguma expansão não existir ou depender de outra não solicitada.
+
+    """
+    if not param:
+        return frozenset()
+    nomes = frozenset(nome.strip() for nome in param.split(",") if nome.strip())
+    invalidas = sorted(nomes.difference(expansoes))
+    if invalidas:
+        raise ValueError(
+            f"Expansões inválidas: {str(invalidas)[1:][:-1]}. "
+            f"Expansões permitidas: {str(list(expansoes))[1:][:-1]}"
+        )
+    for nome in sorted(nomes):
+        depende = expansoes[nome].depende
+        if depende and depende not in nomes:
+            raise ValueError(f'A expansão "{nome}" depende da expansão "{depende}".')
+    return nomes
+
+
+def aplica_expansoes(registros, nomes, expansoes):
+    """
+    Carrega os relacionamentos expandidos junto com os registros.
+
+    Relacionamentos "um" são obtidos no mesmo SELECT (JOIN) e relacionamentos
+    "muitos" com uma consulta adicional por nível, de modo que a quantidade de
+    consultas não depende da quantidade de registros.
+
+    Args:
+        registros (QuerySet): Queryset da listagem.
+        nomes (frozenset): Expansões solicitadas.
+        expansoes (dict): Expansões aceitas pelo endpoint.
+
+    Returns:
+        QuerySet: Queryset com os relacionamentos carregados.
+
+    """
+    select_related = [
+        expansoes[nome].select_related
+        for nome in sorted(nomes)
+        if expansoes[nome].select_related
+    ]
+    prefetch_related = [
+        expansoes[nome].prefetch_related
+        for nome in sorted(nomes)
+        if expansoes[nome].prefetch_related
+    ]
+    if select_related:
+        registros = registros.select_related(*select_related)
+    if prefetch_related:
+        registros = registros.prefetch_related(*prefetch_related)
+    return registros
+
+
+def models_expandidos(request, expansoes):
+    """
+    Obtém os models incluídos na resposta pelas expansões da requisição.
+
+    Args:
+        request (HttpRequest | Request): Requisição HTTP contendo o parâmetro "expand".
+        expansoes (dict): Expansões aceitas pelo endpoint.
+
+    Returns:
+        list: Models incluídos na resposta.
+
+    Raises:
+        ValueError: Se o parâmetro "expand" for inválido.
+
+    """
+    if not expansoes:
+        return []
+    nomes = converte_expansoes(request.GET.get("expand"), expansoes)
+    return [expansoes[nome].model for nome in sorted(nomes)]
+
+
+def caminhos_expandidos(request, expansoes):
+    """
+    Obtém os caminhos de consulta ("lookups") das expansões da requisição.
+
+    Os caminhos de "prefetch_related" usam o nome do acessor reverso
+    ("anuncio_set"), que nas consultas é o nome do model ("anuncio").
+
+    Args:
+        request (HttpRequest | Request): Requisição HTTP contendo o parâmetro "expand".
+        expansoes (dict): Expansões aceitas pelo endpoint.
+
+    Returns:
+        tuple: Caminhos das expansões "um" (JOIN) e das expansões "muitos".
+
+    Raises:
+        ValueError: Se o parâmetro "expand" for inválido.
+
+    Examples:
+        >>> caminhos_expandidos(request, EXPANSOES_IMOVEL)  # ?expand=anuncios,reservas
+        ([], ['anuncio', 'anuncio__reserva'])
+
+    """
+    if not expansoes:
+        return [], []
+    nomes = converte_expansoes(request.GET.get("expand"), expansoes)
+    um = [
+        expansoes[nome].select_related
+        for nome in sorted(nomes)
+        if expansoes[nome].select_related
+    ]
+    muitos = [
+        "__".join(parte.removesuffix("_set") for parte in caminho.split("__"))
+        for caminho in (
+            expansoes[nome].prefetch_related
+            for nome in sorted(nomes)
+            if expansoes[nome].prefetch_related
+        )
+    ]
+    return um, muitos
+
+
+class SerializerExpansivel(serializers.ModelSerializer):
+    """
+    ModelSerializer que inclui relacionamentos aninhados sob demanda.
+
+    As expansões disponíveis são declaradas em "Meta.expansoes", mapeando o nome
+    da expansão para (caminho do serializer, atributo de origem, many). Apenas as
+    expansões presentes em "context['expand']" são incluídas. O serializer é
+    importado pelo caminho para evitar importações circulares entre os apps.
+
+    Examples:
+        class Meta:
+            model = Imovel
+            fields = "__all__"
+            expansoes = {
+                "anuncios": ("api_anuncios.serializer.AnuncioSerializer", "anuncio_set", True),
+            }
+
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        expand = self.context.get("expand", ())
+        for nome, (caminho, source, many) in getattr(
+            self.Meta, "expansoes", {}
+        ).items():
+            if nome in expand:
+                fields[nome] = import_string(caminho)(
+                    source=source, many=many, read_only=True
+                )
+        return fields
+
+    def to_representation(self, instance):
+        # Tempo de serialização enviado no "Server-Timing" (utils.metricas)
+        with cronometro("serializacao"):
+            return super().to_representation(instance)
@@ -0,0 +1,60 @@
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from utils.json_rapido import codifica_json
+from utils.representacao import RepresentacaoRapida
+
+# Quantidade de registros lidos do banco (e enviados ao cliente) por vez
+EXPORTACAO_CHUNK_SIZE = getattr(settings, "EXPORTACAO_CHUNK_SIZE", 2000)
+
+
+def gera_json_registros(registros, serializer_class, chunk_size=EXPORTACAO_CHUNK_SIZE):
+    """
+    Gera um array JSON em pedaços a partir de um queryset.
+
+    O "[" inicial é enviado antes da execução da consulta e os registros são
+    lidos com ".values_list().iterator()", então apenas um pedaço fica em memória por
+    vez. Cada pedaço é representado com "RepresentacaoRapida", com a mesma saída
+    do serializer, e codificado de uma só vez com "codifica_json".
+
+    Args:
+        registros (QuerySet): Queryset com os registros a serem exportados.
+        serializer_class (Serializer): Serializer usado para representar cada registro.
+        chunk_size (int): Quantidade de registros por pedaço.
+
+    Yields:
+        bytes: Pedaços consecutivos do array JSON.
+
+    """
+    representacao = RepresentacaoRapida(serializer_class)
+    yield b"["
+    separador = b""
+    pedaco = []
+    for linha in representacao.valores(registros).iterator(chunk_size=chunk_size):
+        pedaco.append(linha)
+        if len(pedaco) >= chunk_size:
+            # Codificar o pedaço como array e remover os colchetes
+            yield separador + codifica_json(representacao.representa(pedaco))[1:-1]
+            separador = b","
+            pedaco = []
+    if pedaco:
+        yield separador + codifica_json(representacao.representa(pedaco))[1:-1]
+    yield b"]"
+
+
+def exporta_registros(registros, serializer_class, chunk_size=EXPORTACAO_CHUNK_SIZE):
+    """
+    Cria uma resposta HTTP em streaming com todos os registros de um queryset.
+
+    Args:
+        registros (QuerySet): Queryset com os registros a serem exportados.
+        serializer_class (Serializer): Serializer usado para representar cada registro.
+        chunk_size (int): Quantidade de registros por pedaço.
+
+    Returns:
+        StreamingHttpResponse: Resposta contendo um array JSON com os registros.
+
+    """
+    return StreamingHttpResponse(
+        gera_json_registros(registros.order_by("id"), serializer_class, chunk_size),
+        content_type="application/json",
+    )
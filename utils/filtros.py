@@ -0,0 +1,118 @@
+from django.db import models
+from django.db.models import Q
+from utils.esquemas import CONVERSORES
+
+# Valores aceitos nos filtros booleanos da URL
+VALORES_BOOLEANOS = {
+    "true": True,
+    "1": True,
+    "false": False,
+    "0": False,
+}
+
+
+def _conversor_inteiro(campo_model):
+    def converte(valor):
+        valor = valor.strip()
+        sem_sinal = valor[1:] if valor[:1] == "-" else valor
+        if not (sem_sinal.isascii() and sem_sinal.isdecimal()):
+            raise ValueError("Um número inteiro válido é necessário.")
+        return int(valor)
+
+    return converte
+
+
+def _conversor_booleano(campo_model):
+    def converte(valor):
+        try:
+            return VALORES_BOOLEANOS[valor.strip().lower()]
+        except KeyError:
+            raise ValueError('Use "true" ou "false".')
+
+    return converte
+
+
+CONVERSORES_FILTRO = {
+    models.BooleanField: _conversor_booleano,
+    models.IntegerField: _conversor_inteiro,
+    **CONVERSORES,
+}
+
+
+class FiltrosListagem:
+    """
+    Filtros aceitos na URL de uma listagem, compilados uma única vez.
+
+    Cada parâmetro corresponde a um lookup do ORM; o valor é convertido pelo
+    tipo do campo do model (inteiro, booleano, Decimal, data ou texto) e os
+    filtros informados são combinados com "E". O filtro é aplicado pelo banco,
+    junto com a paginação, e não sobre os registros já lidos.
+
+    Args:
+        model (Model): Model da listagem.
+        lookups (dict): Parâmetro da URL e o lookup correspondente.
+
+    Examples:
+        >>> filtros = FiltrosListagem(Imovel, {"limite_hospedes_min": "limite_hospedes__gte"})
+        >>> filtros.condicao({"limite_hospedes_min": "4"})
+        <Q: (AND: ('limite_hospedes__gte', 4))>
+
+    """
+
+    def __init__(self, model, lookups):
+        self.model = model
+        self.lookups = dict(lookups)
+        self.conversores = {}
+        for parametro, lookup in self.lookups.items():
+            campo_model = model._meta.get_field(lookup.split("__")[0])
+            for classe, fabrica in CONVERSORES_FILTRO.items():
+                if isinstance(campo_model, classe):
+                    self.conversores[parametro] = fabrica(campo_model)
+                    break
+            else:
+                raise TypeError(f'Campo sem conversor de filtro: "{campo_model.name}".')
+
+    def informados(self, parametros):
+        # Parâmetros de filtro presentes (e não vazios) na URL
+        return [parametro for parametro in self.lookups if parametros.get(parametro)]
+
+    def condicao(self, parametros):
+        """
+        Monta a condição dos filtros informados na URL.
+
+        Args:
+            parametros (QueryDict): Parâmetros da URL.
+
+        Returns:
+            Q: Condição com todos os filtros informados (vazia se nenhum).
+
+        Raises:
+            ValueError: Se algum valor for inválido.
+
+        """
+        condicao = Q()
+        for parametro in self.informados(parametros):
+            try:
+                valor = self.conversores[parametro](parametros[parametro])
+            except ValueError as erro:
+                raise ValueError(f'Parâmetro "{parametro}": {erro}')
+            condicao &= Q(**{self.lookups[parametro]: valor})
+        return condicao
+
+    def aplica(self, registros, parametros):
+        """
+        Filtra um queryset pelos filtros informados na URL.
+
+        Args:
+            registros (QuerySet): Queryset da listagem.
+            parametros (QueryDict): Parâmetros da URL.
+
+        Returns:
+            QuerySet: Queryset filtrado.
+
+        Raises:
+            ValueError: Se algum valor for inválido.
+
+        """
+        condicao = self.condicao(parametros)
+        return registros.filter(condicao) if condicao else registros
@@ -0,0 +1,397 @@
+import contextlib
+import json
+import re
+from collections import Counter, defaultdict
+from decimal import Decimal
+from pathlib import Path
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+from base.models import Reserva
+from utils.cache import invalida_listagens
+from utils.carga import indices_adiados, insere_linhas, prepara_linhas
+from utils.resumo import reconstroi_resumo
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+# Caracteres lidos do arquivo por vez pelo leitor incremental de JSON
+TAMANHO_BLOCO = 1 << 20
+# Registros inseridos por transação
+TAMANHO_LOTE = 5000
+EXTENSOES_JSONL = (".jsonl", ".ndjson")
+
+_ESPACOS = re.compile(r"[ \t\n\r]*")
+
+
+def le_objetos_json(arquivo, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Lê os objetos de uma lista JSON aos poucos, sem carregar o arquivo inteiro.
+
+    O arquivo é lido em blocos de "tamanho_bloco" caracteres; cada objeto é
+    decodificado assim que está completo no buffer. Números com casas
+    decimais são lidos como Decimal.
+
+    Args:
+        arquivo (TextIO): Arquivo aberto em modo texto.
+        tamanho_bloco (int): Caracteres lidos por vez.
+
+    Yields:
+        object: Cada item da lista.
+
+    Raises:
+        ValueError: Se o conteúdo não for uma lista JSON válida.
+
+    Examples:
+        >>> list(le_objetos_json(io.StringIO('[{"pk": 1}, {"pk": 2}]')))
+        [{'pk': 1}, {'pk': 2}]
+
+    """
+    decodificador = json.JSONDecoder(parse_float=Decimal)
+    buffer, posicao = "", 0
+
+    def proximo_caractere():
+        # Próximo caractere que não é espaço, lendo mais blocos se necessário
+        nonlocal buffer, posicao
+        while True:
+            posicao = _ESPACOS.match(buffer, posicao).end()
+            if posicao < len(buffer):
+                return buffer[posicao]
+            buffer, posicao = arquivo.read(tamanho_bloco), 0
+            if not buffer:
+                return ""
+
+    if proximo_caractere() != "[":
+        raise ValueError("O arquivo deve conter uma lista JSON de objetos.")
+    posicao += 1
+    if proximo_caractere() == "]":
+        return
+
+    indice = 0
+    while True:
+        proximo_caractere()
+        while True:
+            try:
+                objeto, posicao = decodificador.raw_decode(buffer, posicao)
+                break
+            except json.JSONDecodeError as erro:
+                # Objeto incompleto no buffer: juntar o próximo bloco
+                bloco = arquivo.read(tamanho_bloco)
+                if not bloco:
+                    raise ValueError(f"JSON inválido no item {indice}: {erro}")
+                buffer, posicao = buffer[posicao:] + bloco, 0
+        yield objeto
+        indice += 1
+
+        caractere = proximo_caractere()
+        if caractere == "]":
+            return
+        if caractere != ",":
+            raise ValueError(
+                f'JSON inválido após o item {indice - 1}: esperado "," ou "]".'
+            )
+        posicao += 1
+
+
+def le_objetos_jsonl(arquivo):
+    """
+    Lê os objetos de um arquivo JSON Lines (um objeto por linha).
+
+    Usa o orjson quando instalado. Linhas em branco são ignoradas.
+
+    Args:
+        arquivo (BinaryIO): Arquivo aberto em modo binário.
+
+    Yields:
+        object: Cada objeto do arquivo.
+
+    Raises:
+        ValueError: Se alguma linha não for um JSON válido.
+
+    """
+    for numero, linha in enumerate(arquivo, 1):
+        if not linha.strip():
+            continue
+        try:
+            yield orjson.loads(linha) if orjson else json.loads(linha)
+        except ValueError as erro:
+            raise ValueError(f"JSON inválido na linha {numero}: {erro}")
+
+
+def le_fixture(caminho, formato=None):
+    """
+    Lê os objetos de uma fixture JSON ou JSON Lines, aos poucos.
+
+    Args:
+        caminho (str): Caminho do arquivo.
+        formato (str): "json" ou "jsonl". Por padrão, definido pela extensão
+            (".jsonl" e ".ndjson" são JSON Lines).
+
+    Yields:
+        dict: Objetos no formato do "dumpdata" ({"model", "pk", "fields"}).
+
+    """
+    if formato is None:
+        formato = "jsonl" if str(caminho).endswith(EXTENSOES_JSONL) else "json"
+    if formato == "jsonl":
+        with open(caminho, "rb") as arquivo:
+            yield from le_objetos_jsonl(arquivo)
+    else:
+        with open(caminho, encoding="utf-8") as arquivo:
+            yield from le_objetos_json(arquivo)
+
+
+class CarregadorFixtures:
+    """
+    Carrega objetos de fixtures em lotes, sem salvar cada objeto individualmente.
+
+    Os objetos são convertidos campo a campo ("to_python"), agrupados por
+    model e inseridos em lotes de "tamanho_lote", cada um em uma transação
+    (ver "utils.carga.insere_linhas"). As chaves estrangeiras de cada lote
+    são verificadas com uma consulta por model relacionado; objetos que
+    referenciam registros ainda não carregados aguardam até o fim da carga,
+    então a ordem dos arquivos não importa.
+
+    Assim como o "loaddata", grava os valores da fixture como estão (inclusive
+    "data_atualizacao") e não dispara signals; ao final, o cache das listagens
+    dos models carregados é invalidado e o resumo diário dos anúncios das
+    reservas carregadas é recalculado (ver "utils.resumo"). Diferente do
+    "loaddata", apenas insere: um "pk" já existente no banco interrompe a
+    carga, mantendo os lotes já gravados.
+
+    Args:
+        using (str): Alias do banco.
+        tamanho_lote (int): Registros inseridos por transação.
+        adiar_indices (bool): Remove os índices secundários das tabelas
+            carregadas e os recria ao final (ver "utils.carga.indices_adiados").
+
+    Examples:
+        >>> with CarregadorFixtures() as carregador:
+        ...     for objeto in le_fixture("fixtures/reserva_fixture.json"):
+        ...         carregador.adiciona(objeto)
+        ...     carregador.finaliza()
+        {<class 'base.models.Reserva'>: 10}
+
+    """
+
+    def __init__(
+        self, using=DEFAULT_DB_ALIAS, tamanho_lote=TAMANHO_LOTE, adiar_indices=False
+    ):
+        self.using = using
+        self.conexao = connections[using]
+        self.tamanho_lote = tamanho_lote
+        self.adiar_indices = adiar_indices
+        self.agora = timezone.now()
+        # Registros aguardando inserção e aguardando chaves estrangeiras,
+        # por (model, possui pk)
+        self.lotes = defaultdict(list)
+        self.pendentes = defaultdict(list)
+        # PKs conhecidos dos models referenciados por chaves estrangeiras
+        self.existentes = defaultdict(set)
+        self.referenciados = {
+            campo.related_model
+            for model in apps.get_models()
+            for campo in model._meta.concrete_fields
+            if campo.is_relation
+        }
+        self.campos = {}
+        self.contagem = Counter()
+        # Anúncios das reservas carregadas, cujo resumo diário é recalculado
+        self.anuncios_reservas = set()
+        self.indices_removidos = []
+        self.pilha = contextlib.ExitStack()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        # Recriar os índices adiados, mesmo se a carga falhar
+        self.pilha.close()
+
+    def _campos(self, model):
+        # Campos gravados (sem a chave primária), na ordem das colunas
+        if model not in self.campos:
+            self.campos[model] = [
+                campo for campo in model._meta.concrete_fields if not campo.primary_key
+            ]
+            if self.adiar_indices:
+                self.indices_removidos += self.pilha.enter_context(
+                    indices_adiados([model], self.using)
+                )
+        return self.campos[model]
+
+    def adiciona(self, objeto):
+        """
+        Converte um objeto da fixture e o inclui no lote do seu model.
+
+        Args:
+            objeto (dict): Objeto no formato do "dumpdata".
+
+        Raises:
+            ValueError: Se o model, algum campo ou algum valor for inválido.
+
+        """
+        try:
+            model = apps.get_model(objeto["model"])
+        except (KeyError, LookupError, TypeError, ValueError):
+            raise ValueError(f"Model inválido: {objeto.get('model')!r}.")
+        campos = self._campos(model)
+        valores = objeto.get("fields", {})
+        desconhecidos = set(valores) - {campo.name for campo in campos}
+        if desconhecidos:
+            raise ValueError(
+                f"{model._meta.label}: campos inexistentes ou não suportados: "
+                f"{', '.join(sorted(desconhecidos))}."
+            )
+
+        registro = {}
+        try:
+            for campo in campos:
+                if campo.name in valores:
+                    destino = campo.target_field if campo.is_relation else campo
+                    registro[campo.attname] = destino.to_python(valores[campo.name])
+                elif getattr(campo, "auto_now", False) or getattr(
+                    campo, "auto_now_add", False
+                ):
+                    registro[campo.attname] = self.agora
+                else:
+                    registro[campo.attname] = campo.get_default()
+            pk = objeto.get("pk")
+            if pk is not None:
+                registro[model._meta.pk.attname] = model._meta.pk.to_python(pk)
+        except ValidationError as erro:
+            raise ValueError(
+                f"{model._meta.label} (pk={objeto.get('pk')}): {' '.join(erro.messages)}"
+            )
+
+        chave = (model, pk is not None)
+        self.lotes[chave].append(registro)
+        if len(self.lotes[chave]) >= self.tamanho_lote:
+            self._descarrega(chave)
+
+    def _verifica_relacionados(self, model, registros):
+        # Buscar os registros relacionados ainda não conhecidos, em lotes de IDs
+        limite = self.conexao.features.max_query_params or len(registros)
+        for campo in self._campos(model):
+            if not campo.is_relation:
+                continue
+            alvo, conhecidos = campo.related_model, self.existentes[campo.related_model]
+            desconhecidos = list(
+                {registro[campo.attname] for registro in registros}
+                - conhecidos
+                - {None}
+            )
+            nome = campo.target_field.name
+            for inicio in range(0, len(desconhecidos), limite):
+                conhecidos.update(
+                    alvo._base_manager.using(self.using)
+                    .filter(**{f"{nome}__in": desconhecidos[inicio : inicio + limite]})
+                    .values_list(nome, flat=True)
+                )
+
+    def _referencia_inexistente(self, model, registro):
+        # Primeira chave estrangeira do registro que aponta para um registro inexistente
+        for campo in self._campos(model):
+            valor = registro[campo.attname] if campo.is_relation else None
+            if valor is not None and valor not in self.existentes[campo.related_model]:
+                return campo, valor
+        return None
+
+    def _descarrega(self, chave):
+        model, possui_pk = chave
+        registros = self.lotes.pop(chave, [])
+        self._verifica_relacionados(model, registros)
+        prontos = []
+        for registro in registros:
+            if self._referencia_inexistente(model, registro):
+                self.pendentes[chave].append(registro)
+            else:
+                prontos.append(registro)
+        if not prontos:
+            return
+
+        campos = self._campos(model)
+        if possui_pk:
+            campos = [*campos, model._meta.pk]
+        linhas = prepara_linhas(campos, prontos, self.conexao)
+        with transaction.atomic(using=self.using):
+            insere_linhas(model, campos, linhas, self.using)
+        if possui_pk and model in self.referenciados:
+            self.existentes[model].update(
+                registro[model._meta.pk.attname] for registro in prontos
+            )
+        self.contagem[model] += len(prontos)
+        if model is Reserva:
+            self.anuncios_reservas.update(
+                registro["cod_anuncio_id"] for registro in prontos
+            )
+
+    def finaliza(self):
+        """
+        Insere os lotes restantes e os objetos que aguardavam chaves estrangeiras.
+
+        Returns:
+            dict: Quantidade de registros inseridos por model.
+
+        Raises:
+            ValueError: Se algum objeto referenciar um registro inexistente.
+
+        """
+        for chave in list(self.lotes):
+            self._descarrega(chave)
+
+        # Objetos que referenciam registros carregados depois deles
+        while self.pendentes:
+            pendentes, self.pendentes = self.pendentes, defaultdict(list)
+            for chave, registros in pendentes.items():
+                for inicio in range(0, len(registros), self.tamanho_lote):
+                    self.lotes[chave] = registros[inicio : inicio + self.tamanho_lote]
+                    self._descarrega(chave)
+            restantes = sum(map(len, self.pendentes.values()))
+            if restantes and restantes == sum(map(len, pendentes.values())):
+                (model, _), registros = next(iter(self.pendentes.items()))
+                campo, valor = self._referencia_inexistente(model, registros[0])
+                raise ValueError(
+                    f"{restantes} objeto(s) referenciam registros inexistentes, "
+                    f'ex.: {model._meta.label} com {campo.name}="{valor}".'
+                )
+
+        # Com PKs explícitos, ajustar as sequências dos IDs (PostgreSQL), como o "loaddata"
+        comandos = self.conexao.ops.sequence_reset_sql(no_style(), list(self.contagem))
+        if comandos:
+            with self.conexao.cursor() as cursor:
+                for sql in comandos:
+                    cursor.execute(sql)
+        if self.anuncios_reservas:
+            reconstroi_resumo(self.anuncios_reservas, using=self.using)
+        for model in self.contagem:
+            invalida_listagens(model)
+        return dict(self.contagem)
+
+
+def carrega_fixtures(caminhos, formato=None, **opcoes):
+    """
+    Carrega arquivos de fixture com o "CarregadorFixtures".
+
+    Args:
+        caminhos (list): Caminhos dos arquivos (JSON ou JSON Lines).
+        formato (str): "json" ou "jsonl"; por padrão, definido pela extensão.
+        **opcoes: Argumentos do "CarregadorFixtures" ("using", "tamanho_lote",
+            "adiar_indices").
+
+    Returns:
+        dict: Quantidade de registros inseridos por model.
+
+    Raises:
+        ValueError: Se algum arquivo ou objeto for inválido.
+
+    """
+    with CarregadorFixtures(**opcoes) as carregador:
+        for caminho in caminhos:
+            for objeto in le_fixture(Path(caminho), formato):
+                carregador.adiciona(objeto)
+        return carregador.finaliza()
@@ -0,0 +1,111 @@
+from itertools import chain
+import msgpack
+from rest_framework.renderers import BaseRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+from utils.json_rapido import JSONRendererRapido
+
+# Valores que o MessagePack não representa (Decimal, datas, UUID, ...) usam o
+# mesmo formato das respostas JSON
+_padrao_drf = JSONEncoder().default
+
+
+def para_colunas(registros):
+    """
+    Converte uma lista de registros em colunas.
+
+    Cada chave é enviada uma única vez, seguida da lista com os valores de todos
+    os registros. Registros sem alguma das chaves recebem null nessa coluna.
+
+    Args:
+        registros (list): Registros (dicionários) de uma listagem.
+
+    Returns:
+        dict: Quantidade de linhas e os valores de cada coluna.
+
+    Examples:
+        >>> para_colunas([{"id": 1, "plataforma": "airbnb"}, {"id": 2, "plataforma": "booking"}])
+        {'linhas': 2, 'colunas': {'id': [1, 2], 'plataforma': ['airbnb', 'booking']}}
+
+    """
+    nomes = dict.fromkeys(chain.from_iterable(registros))
+    return {
+        "linhas": len(registros),
+        "colunas": {
+            nome: [registro.get(nome) for registro in registros] for nome in nomes
+        },
+    }
+
+
+def dados_colunares(data):
+    # Apenas listas de registros são convertidas; mensagens de erro ficam inalteradas
+    if isinstance(data, list) and all(isinstance(item, dict) for item in data):
+        return para_colunas(data)
+    if isinstance(data, dict) and isinstance(data.get("results"), list):
+        return {**data, "results": dados_colunares(data["results"])}
+    return data
+
+
+class ColunarJSONRenderer(JSONRendererRapido):
+    """
+    Renderer JSON em colunas ("?format=colunar").
+
+    As listagens são enviadas como {"linhas": n, "colunas": {campo: [valores]}},
+    sem repetir o nome dos campos em cada registro. Nas respostas paginadas,
+    apenas "results" é convertido.
+
+    """
+
+    media_type = "application/vnd.khanto.colunar+json"
+    format = "colunar"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return super().render(
+            dados_colunares(data), accepted_media_type, renderer_context
+        )
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renderer MessagePack ("?format=msgpack" ou "Accept: application/msgpack").
+
+    Os valores mantêm o formato das respostas JSON.
+
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=_padrao_drf, use_bin_type=True)
+
+
+class ColunarMessagePackRenderer(MessagePackRenderer):
+    """
+    Renderer MessagePack em colunas ("?format=colunar-msgpack").
+
+    Mesmo layout do "ColunarJSONRenderer", codificado em MessagePack.
+
+    """
+
+    media_type = "application/vnd.khanto.colunar+msgpack"
+    format = "colunar-msgpack"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return super().render(
+            dados_colunares(data), accepted_media_type, renderer_context
+        )
+
+
+# Renderers aceitos pelas listagens: os padrão (JSON e API navegável), seguidos
+# dos formatos alternativos
+RENDERERS_LISTAGEM = [
+    *api_settings.DEFAULT_RENDERER_CLASSES,
+    ColunarJSONRenderer,
+    MessagePackRenderer,
+    ColunarMessagePackRenderer,
+]
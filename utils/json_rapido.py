@@ -0,0 +1,119 @@
+import io
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+# Tipos que o orjson não converte sozinho, ou converte em um formato diferente do
+# DRF (datetime com "+00:00" em vez de "Z", dataclasses), são repassados ao
+# "JSONEncoder.default" do DRF, que define o formato atual da API
+_OPCOES_ORJSON = (
+    (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+    if orjson
+    else 0
+)
+_padrao_drf = JSONEncoder().default
+
+
+def codifica_json(dados):
+    """
+    Codifica dados em JSON compacto (UTF-8), com o mesmo formato do DRF.
+
+    Usa o orjson quando instalado e, caso contrário (ou se o orjson não
+    conseguir representar algum valor, como inteiros acima de 64 bits), o
+    "json" da biblioteca padrão com o encoder do DRF.
+
+    Args:
+        dados (object): Dados a serem codificados.
+
+    Returns:
+        bytes: JSON codificado em UTF-8.
+
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(dados, default=_padrao_drf, option=_OPCOES_ORJSON)
+        except orjson.JSONEncodeError:
+            pass
+    return JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode(dados).encode()
+
+
+class JSONRendererRapido(JSONRenderer):
+    """
+    JSONRenderer do DRF que usa o orjson quando ele está instalado.
+
+    Decimals, UUIDs, datas e datetimes mantêm exatamente o formato do
+    JSONRenderer padrão. Respostas indentadas (ex.: "Accept: application/json;
+    indent=4" ou a API navegável) e configurações diferentes das padrão
+    ("COMPACT_JSON", "UNICODE_JSON") continuam usando o renderer do DRF.
+    Floats NaN/Infinity, recusados pelo DRF, são enviados como null pelo orjson.
+
+    Examples:
+        REST_FRAMEWORK = {
+            "DEFAULT_RENDERER_CLASSES": ["utils.json_rapido.JSONRendererRapido", ...],
+        }
+
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or not self.compact
+            or self.ensure_ascii
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_padrao_drf, option=_OPCOES_ORJSON)
+        except orjson.JSONEncodeError:
+            # Ex.: inteiros acima de 64 bits
+            return super().render(data, accepted_media_type, renderer_context)
+        # Assim como o DRF, escapar U+2028 e U+2029 (JSON compatível com javascript)
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+        return ret
+
+
+class JSONParserRapido(JSONParser):
+    """
+    JSONParser do DRF que usa o orjson quando ele está instalado.
+
+    Payloads que o orjson recusa (ex.: números fora do intervalo do float) ou
+    enviados em outra codificação que não UTF-8 são processados pelo parser
+    padrão do DRF, com as mesmas mensagens de erro.
+
+    Examples:
+        REST_FRAMEWORK = {
+            "DEFAULT_PARSER_CLASSES": ["utils.json_rapido.JSONParserRapido", ...],
+        }
+
+    """
+
+    renderer_class = JSONRendererRapido
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", "utf-8")
+        if orjson is None or encoding.lower().replace("_", "-") not in (
+            "utf-8",
+            "utf8",
+        ):
+            return super().parse(stream, media_type, parser_context)
+
+        conteudo = stream.read()
+        try:
+            return orjson.loads(conteudo)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(conteudo), media_type, parser_context)
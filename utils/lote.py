@@ -0,0 +1,105 @@
+from django.conf import settings
+from django.db import transaction
+from utils.cache import invalida_listagens
+
+# Quantidade de registros inseridos por comando INSERT
+LOTE_BATCH_SIZE = getattr(settings, "LOTE_BATCH_SIZE", 500)
+# Quantidade máxima de itens aceitos em uma única requisição
+LOTE_MAX_ITENS = getattr(settings, "LOTE_MAX_ITENS", 10000)
+
+
+def valida_itens_lote(itens, esquema):
+    """
+    Valida uma lista de itens de cadastro em lote.
+
+    Cada item passa pelo mesmo esquema do cadastro individual. As chaves
+    estrangeiras de todos os itens são verificadas de uma só vez, com uma
+    consulta por model relacionado.
+
+    Args:
+        itens (list): Lista de dicionários com os dados de cada registro.
+        esquema (EsquemaPayload): Esquema de cadastro do model.
+
+    Returns:
+        tuple: Lista de tuplas (indice, instancia) dos itens válidos, ainda não
+            salvos, e dicionário {indice: erro} dos itens inválidos.
+
+    """
+    erros = {}
+    itens_validos = []
+
+    # Validar e converter os campos de cada item
+    for indice, item in enumerate(itens):
+        dados, erro = esquema.valida(item)
+        if erro:
+            erros[indice] = erro
+            continue
+        itens_validos.append((indice, dados))
+
+    # Buscar os IDs relacionados de todos os itens em uma consulta por model
+    ids_existentes = {}
+    for campo, model in esquema.relacionados.items():
+        nome_destino = esquema.nomes_destino[campo]
+        ids = {dados[nome_destino] for _, dados in itens_validos}
+        ids_existentes[campo] = set(
+            model.objects.filter(pk__in=ids).values_list("pk", flat=True)
+        )
+
+    registros = []
+    for indice, dados in itens_validos:
+        campos_inexistentes = {
+            campo: [
+                f'Pk inválido "{dados[esquema.nomes_destino[campo]]}" - objeto não existe.'
+            ]
+            for campo in esquema.relacionados
+            if dados[esquema.nomes_destino[campo]] not in ids_existentes[campo]
+        }
+        if campos_inexistentes:
+            erros[indice] = campos_inexistentes
+            continue
+        registros.append((indice, esquema.model(**dados)))
+
+    return registros, erros
+
+
+def salva_registros_lote(model, registros, batch_size=LOTE_BATCH_SIZE):
+    """
+    Salva registros já validados usando "bulk_create" em uma única transação.
+
+    Args:
+        model (Model): Model dos registros.
+        registros (list): Lista de tuplas (indice, instancia) a serem salvas.
+        batch_size (int): Quantidade de registros por comando INSERT.
+
+    Returns:
+        list: IDs dos registros criados, na ordem dos itens enviados.
+
+    """
+    with transaction.atomic():
+        criados = model.objects.bulk_create(
+            [registro for _, registro in registros], batch_size=batch_size
+        )
+        # "bulk_create" não dispara "post_save"; invalidar as listagens explicitamente
+        invalida_listagens(model)
+    return [registro.id for registro in criados]
+
+
+def resposta_lote(ids_criados, erros, mensagem):
+    """
+    Monta o corpo da resposta de um cadastro em lote.
+
+    Args:
+        ids_criados (list): IDs dos registros criados.
+        erros (dict): Dicionário {indice: erro} dos itens recusados.
+        mensagem (str): Mensagem de sucesso.
+
+    Returns:
+        dict: Corpo da resposta com a quantidade criada, os IDs e os erros por item.
+
+    """
+    return {
+        "message": mensagem,
+        "criados": len(ids_criados),
+        "ids": ids_criados,
+        "erros": {str(indice): erro for indice, erro in sorted(erros.items())},
+    }
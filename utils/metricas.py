@@ -0,0 +1,241 @@
+import contextlib
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from django.conf import settings
+from django.utils.deprecation import MiddlewareMixin
+
+logger = logging.getLogger("khanto.metricas")
+
+# Limites (inclusivos) dos intervalos dos histogramas, em milissegundos e em
+# quantidade de consultas
+METRICAS_LIMITES_MS = getattr(
+    settings,
+    "METRICAS_LIMITES_MS",
+    (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000),
+)
+METRICAS_LIMITES_CONSULTAS = getattr(
+    settings, "METRICAS_LIMITES_CONSULTAS", (0, 1, 2, 5, 10, 20, 50, 100)
+)
+
+
+class _MetricasRequisicao:
+    # Tempos (segundos) e consultas da requisição atual
+    __slots__ = ("inicio", "consultas", "sql", "tempos", "ativos")
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.consultas = 0
+        self.sql = 0.0
+        self.tempos = {"serializacao": 0.0, "render": 0.0}
+        # Etapas em andamento, para não contar duas vezes chamadas aninhadas
+        self.ativos = set()
+
+
+_metricas = ContextVar("metricas_requisicao", default=None)
+
+
+def mede_consulta(execute, sql, params, many, context):
+    """
+    Execute wrapper que conta as consultas SQL e o tempo gasto no banco.
+
+    É instalado em cada nova conexão (ver "base.signals") e só registra as
+    consultas feitas durante uma requisição acompanhada pelo "MetricasMiddleware".
+
+    """
+    metricas = _metricas.get()
+    if metricas is None:
+        return execute(sql, params, many, context)
+    inicio = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metricas.sql += time.perf_counter() - inicio
+        metricas.consultas += 1
+
+
+def instala_medicao(connection):
+    # Adicionar o execute wrapper uma única vez por conexão (ela pode reconectar)
+    if mede_consulta not in connection.execute_wrappers:
+        connection.execute_wrappers.append(mede_consulta)
+
+
+@contextlib.contextmanager
+def cronometro(etapa):
+    """
+    Mede o tempo de uma etapa da requisição ("serializacao" ou "render").
+
+    O tempo das consultas SQL executadas dentro da etapa (ex.: querysets
+    avaliados durante a serialização) é descontado, pois já é contado em "sql".
+    Chamadas aninhadas da mesma etapa são contadas uma única vez. Fora de uma
+    requisição acompanhada pelo "MetricasMiddleware", não faz nada.
+
+    Args:
+        etapa (str): Nome da etapa.
+
+    Examples:
+        >>> with cronometro("serializacao"):
+        ...     dados = serializer.data
+
+    """
+    metricas = _metricas.get()
+    if metricas is None or etapa in metricas.ativos:
+        yield
+        return
+    metricas.ativos.add(etapa)
+    inicio, sql_inicio = time.perf_counter(), metricas.sql
+    try:
+        yield
+    finally:
+        metricas.ativos.discard(etapa)
+        metricas.tempos[etapa] += (
+            time.perf_counter() - inicio - (metricas.sql - sql_inicio)
+        )
+
+
+class Histograma:
+    """
+    Histograma com intervalos fixos, no formato dos histogramas do Prometheus.
+
+    Args:
+        limites (tuple): Limite superior (inclusivo) de cada intervalo, em ordem.
+
+    """
+
+    __slots__ = ("limites", "contagens", "soma")
+
+    def __init__(self, limites):
+        self.limites = limites
+        # A última posição conta os valores acima do maior limite
+        self.contagens = [0] * (len(limites) + 1)
+        self.soma = 0
+
+    def registra(self, valor):
+        self.contagens[bisect_left(self.limites, valor)] += 1
+        self.soma += valor
+
+    def como_dict(self):
+        # Contagens acumuladas por limite ("le" = menor ou igual a)
+        acumulado, intervalos = 0, {}
+        for limite, contagem in zip([*self.limites, "+Inf"], self.contagens):
+            acumulado += contagem
+            intervalos[str(limite)] = acumulado
+        return {"contagem": acumulado, "soma": round(self.soma, 3), "le": intervalos}
+
+
+class RegistroMetricas:
+    """
+    Histogramas por rota, mantidos em memória no processo.
+
+    Cada processo do servidor (ex.: workers do gunicorn) possui o seu próprio
+    registro.
+
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.rotas = {}
+
+    def _histogramas(self):
+        return {
+            "total_ms": Histograma(METRICAS_LIMITES_MS),
+            "sql_ms": Histograma(METRICAS_LIMITES_MS),
+            "serializacao_ms": Histograma(METRICAS_LIMITES_MS),
+            "render_ms": Histograma(METRICAS_LIMITES_MS),
+            "consultas": Histograma(METRICAS_LIMITES_CONSULTAS),
+        }
+
+    def registra(self, rota, valores):
+        with self.lock:
+            histogramas = self.rotas.get(rota)
+            if histogramas is None:
+                histogramas = self.rotas[rota] = self._histogramas()
+            for nome, histograma in histogramas.items():
+                histograma.registra(valores[nome])
+
+    def como_dict(self):
+        with self.lock:
+            return {
+                rota: {nome: h.como_dict() for nome, h in histogramas.items()}
+                for rota, histogramas in sorted(self.rotas.items())
+            }
+
+    def limpa(self):
+        with self.lock:
+            self.rotas.clear()
+
+
+registro_metricas = RegistroMetricas()
+
+
+def _rota(request):
+    # Nome da rota (ex.: "GET api_reservas:get_reservas"), sem os parâmetros da URL
+    match = getattr(request, "resolver_match", None)
+    return f"{request.method} {match.view_name if match else '<sem rota>'}"
+
+
+class MetricasMiddleware(MiddlewareMixin):
+    """
+    Mede as consultas SQL, a serialização e a renderização de cada requisição.
+
+    As medições são enviadas:
+        - no cabeçalho "Server-Timing" da resposta (visível no DevTools do navegador);
+        - no logger "khanto.metricas", uma linha JSON por requisição (nível INFO);
+        - nos histogramas por rota de "registro_metricas" (rota "/metricas/").
+
+    Deve ser o primeiro item de "MIDDLEWARE", para que "total" inclua os demais
+    middlewares. Em respostas em streaming (ex.: exportações), as consultas
+    feitas durante o envio do conteúdo não são contadas.
+
+    """
+
+    def process_request(self, request):
+        _metricas.set(_MetricasRequisicao())
+
+    def process_template_response(self, request, response):
+        # Respostas do DRF são renderizadas pelo Django logo após este método
+        render = response.render
+
+        def render_medido():
+            with cronometro("render"):
+                return render()
+
+        response.render = render_medido
+        return response
+
+    def process_response(self, request, response):
+        metricas = _metricas.get()
+        if metricas is None:
+            return response
+        _metricas.set(None)
+
+        valores = {
+            "total_ms": (time.perf_counter() - metricas.inicio) * 1000,
+            "sql_ms": metricas.sql * 1000,
+            "serializacao_ms": metricas.tempos["serializacao"] * 1000,
+            "render_ms": metricas.tempos["render"] * 1000,
+            "consultas": metricas.consultas,
+        }
+        response.headers["Server-Timing"] = (
+            f'sql;dur={valores["sql_ms"]:.3f};desc="consultas: {metricas.consultas}", '
+            f'serializacao;dur={valores["serializacao_ms"]:.3f}, '
+            f'render;dur={valores["render_ms"]:.3f}, '
+            f'total;dur={valores["total_ms"]:.3f}'
+        )
+
+        rota = _rota(request)
+        registro_metricas.registra(rota, valores)
+        if logger.isEnabledFor(logging.INFO):
+            linha = {
+                "rota": rota,
+                "caminho": request.path,
+                "status": response.status_code,
+                **{nome: round(valor, 3) for nome, valor in valores.items()},
+            }
+            logger.info(
+                json.dumps(linha, ensure_ascii=False), extra={"metricas": linha}
+            )
+        return response
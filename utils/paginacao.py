@@ -0,0 +1,184 @@
+from rest_framework.pagination import CursorPagination
+from rest_framework.request import Request
+
+
+class PaginacaoCursor(CursorPagination):
+    """
+    Paginação por cursor (keyset) usada nas listagens das APIs.
+
+    Os registros são ordenados pelo "id" e cada página é obtida com um filtro
+    "id > ultimo_id_visto", de modo que o custo da consulta não cresce com o
+    tamanho da tabela. O cursor retornado em "next" é opaco para o cliente.
+
+    A consulta da página é montada por "queryset_pagina" e os links por
+    "conclui_pagina", compartilhados pelas versões síncrona e assíncrona e pelo
+    validador das listagens (utils.condicional). Como o "id" é único, os
+    cursores gerados nunca usam o deslocamento ("offset") do DRF.
+
+    Examples:
+        caminho_da_api.com/reserva/get_reservas?limite=50
+        caminho_da_api.com/reserva/get_reservas?cursor=cD0xMDA%3D
+    """
+
+    ordering = "id"
+    cursor_query_param = "cursor"
+    page_size_query_param = "limite"
+    max_page_size = 1000
+
+    def queryset_pagina(self, queryset, request, view=None):
+        """
+        Monta a consulta da página atual, sem executá-la.
+
+        Lê o cursor e o tamanho da página da requisição. A consulta retorna um
+        registro a mais, que indica se existe uma página seguinte.
+
+        Args:
+            queryset (QuerySet): Queryset a ser paginado.
+            request (Request): Requisição do DRF contendo "cursor" e "limite".
+            view (View): View da listagem, se houver.
+
+        Returns:
+            QuerySet: Registros da página, na ordem em que são lidos do banco.
+
+        Raises:
+            NotFound: Se o cursor informado for inválido.
+
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        offset, reverso, posicao = self.cursor or (0, False, None)
+
+        # Um cursor "reverso" (link "previous") lê os registros anteriores à posição
+        if reverso:
+            queryset = queryset.order_by("-id")
+            if posicao is not None:
+                queryset = queryset.filter(id__lt=posicao)
+        else:
+            queryset = queryset.order_by("id")
+            if posicao is not None:
+                queryset = queryset.filter(id__gt=posicao)
+        return queryset[offset : offset + self.page_size + 1]
+
+    def conclui_pagina(self, resultados):
+        """
+        Define a página e as posições dos links a partir dos registros lidos.
+
+        Args:
+            resultados (list): Registros retornados por "queryset_pagina".
+
+        Returns:
+            list: Registros da página atual, em ordem crescente de "id".
+
+        """
+        offset, reverso, posicao = self.cursor or (0, False, None)
+        self.page = resultados[: self.page_size]
+        seguinte = None
+        if len(resultados) > len(self.page):
+            seguinte = str(resultados[-1].id)
+
+        # Posições dos links "next" e "previous", como no "paginate_queryset" do DRF
+        anterior_ao_cursor = posicao is not None or offset > 0
+        if reverso:
+            self.page.reverse()
+            self.has_next, self.has_previous = anterior_ao_cursor, seguinte is not None
+            self.next_position, self.previous_position = posicao, seguinte
+        else:
+            self.has_next, self.has_previous = seguinte is not None, anterior_ao_cursor
+            self.next_position, self.previous_position = seguinte, posicao
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def paginate_queryset(self, queryset, request, view=None):
+        pagina = self.queryset_pagina(queryset, request, view)
+        return self.conclui_pagina(list(pagina))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Versão assíncrona do "paginate_queryset".
+
+        Lê a mesma consulta da versão síncrona com "aiterator", de modo que os
+        cursores e os links das duas versões sejam sempre os mesmos.
+
+        Args:
+            queryset (QuerySet): Queryset a ser paginado.
+            request (Request): Requisição do DRF (ou que a envolva).
+            view (View): View da listagem, se houver.
+
+        Returns:
+            list: Registros da página atual.
+
+        """
+        pagina = self.queryset_pagina(queryset, request, view)
+        # "chunk_size" é obrigatório quando há "prefetch_related" (expansões)
+        resultados = [
+            registro
+            async for registro in pagina.aiterator(chunk_size=self.page_size + 1)
+        ]
+        return self.conclui_pagina(resultados)
+
+
+def ids_pagina(request, registros):
+    """
+    Monta a subconsulta com os IDs da página solicitada de uma listagem.
+
+    Usada pelo validador das listagens, que assim agrega apenas os registros
+    retornados (e o seguinte, que define o link "next").
+
+    Args:
+        request (HttpRequest): Requisição HTTP contendo "cursor" e "limite".
+        registros (QuerySet): Queryset filtrado da listagem.
+
+    Returns:
+        QuerySet: Subconsulta com o "id" dos registros da página.
+
+    Raises:
+        NotFound: Se o cursor informado for inválido.
+
+    """
+    return PaginacaoCursor().queryset_pagina(registros.values("id"), Request(request))
+
+
+def pagina_registros(request, registros):
+    """
+    Aplica a paginação por cursor a um queryset.
+
+    Args:
+        request (Request): Requisição HTTP contendo os parâmetros "cursor" e "limite".
+        registros (QuerySet): Queryset a ser paginado.
+
+    Returns:
+        tuple: O paginador utilizado e a lista de registros da página atual.
+
+    Raises:
+        NotFound: Se o cursor informado for inválido.
+
+    """
+    paginador = PaginacaoCursor()
+    pagina = paginador.paginate_queryset(registros, request)
+    return paginador, pagina
+
+
+async def apagina_registros(request, registros):
+    """
+    Versão assíncrona de "pagina_registros".
+
+    Args:
+        request (Request): Requisição do DRF contendo os parâmetros "cursor" e "limite".
+        registros (QuerySet): Queryset a ser paginado.
+
+    Returns:
+        tuple: O paginador utilizado e a lista de registros da página atual.
+
+    Raises:
+        NotFound: Se o cursor informado for inválido.
+
+    """
+    paginador = PaginacaoCursor()
+    pagina = await paginador.apaginate_queryset(registros, request)
+    return paginador, pagina
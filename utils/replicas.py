@@ -0,0 +1,198 @@
+import contextlib
+import functools
+import threading
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.deprecation import MiddlewareMixin
+
+# Segundos em que as leituras de um cliente continuam no banco principal após uma
+# escrita, tempo suficiente para as réplicas receberem a alteração
+REPLICA_JANELA_PRIMARIO = getattr(settings, "REPLICA_JANELA_PRIMARIO", 10)
+# Cookie enviado ao cliente que acabou de escrever (read-your-writes)
+REPLICA_COOKIE = getattr(settings, "REPLICA_COOKIE", "khanto_primario")
+
+
+class _EstadoRequisicao:
+    # Estado da requisição atual, consultado pelo roteador
+    __slots__ = ("replica", "primario", "escreveu")
+
+    def __init__(self, primario=False):
+        # "replica": a view atual aceita ler das réplicas (ver "leitura_replica")
+        self.replica = False
+        # "primario": o cliente escreveu há pouco tempo e deve ler do principal
+        self.primario = primario
+        # "escreveu": houve alguma escrita nesta requisição
+        self.escreveu = False
+
+
+_estado = ContextVar("estado_replicas", default=None)
+
+
+@contextlib.contextmanager
+def _leituras_em_replica():
+    estado = _estado.get()
+    # Fora do middleware (ex.: testes e comandos), o estado vale apenas para a view
+    token = None
+    if estado is None:
+        estado = _EstadoRequisicao()
+        token = _estado.set(estado)
+    replica, estado.replica = estado.replica, True
+    try:
+        yield
+    finally:
+        estado.replica = replica
+        if token is not None:
+            _estado.reset(token)
+
+
+def leitura_replica(view):
+    """
+    Permite que as leituras de uma view sejam feitas nas réplicas.
+
+    Deve ser o decorator mais externo da view, para que as consultas dos
+    demais decorators (ETag, cache) também usem as réplicas. Após uma
+    escrita na mesma requisição, ou do mesmo cliente nos últimos
+    "REPLICA_JANELA_PRIMARIO" segundos, as leituras voltam ao banco principal.
+    Aceita views síncronas e assíncronas.
+
+    Args:
+        view (callable): View de leitura.
+
+    Returns:
+        callable: View decorada.
+
+    Examples:
+        @leitura_replica
+        @api_view(["GET"])
+        def get_imoveis(request):
+            ...
+
+    """
+    if iscoroutinefunction(view):
+
+        @functools.wraps(view)
+        async def view_async(request, *args, **kwargs):
+            with _leituras_em_replica():
+                return await view(request, *args, **kwargs)
+
+        return view_async
+
+    @functools.wraps(view)
+    def view_replica(request, *args, **kwargs):
+        with _leituras_em_replica():
+            return view(request, *args, **kwargs)
+
+    return view_replica
+
+
+def sequencia_ponderada(pesos):
+    """
+    Gera a ordem de uso das réplicas, proporcional ao peso de cada uma.
+
+    Usa o round-robin ponderado suave: as réplicas se alternam, em vez de uma
+    réplica com peso maior receber várias leituras seguidas.
+
+    Args:
+        pesos (dict): Peso (int) de cada alias de banco.
+
+    Returns:
+        list: Aliases na ordem de uso, com "sum(pesos)" posições.
+
+    Examples:
+        >>> sequencia_ponderada({"replica_1": 2, "replica_2": 1})
+        ['replica_1', 'replica_2', 'replica_1']
+
+    """
+    atuais = dict.fromkeys(pesos, 0)
+    total = sum(pesos.values())
+    sequencia = []
+    for _ in range(total):
+        for alias, peso in pesos.items():
+            atuais[alias] += peso
+        escolhido = max(atuais, key=atuais.get)
+        atuais[escolhido] -= total
+        sequencia.append(escolhido)
+    return sequencia
+
+
+class RoteadorReplicas:
+    """
+    Roteador que envia as leituras das views de consulta para as réplicas.
+
+    As réplicas são definidas em "DATABASE_REPLICAS" ({alias: peso}); pesos
+    iguais resultam em round-robin. Sem réplicas, todas as consultas usam o
+    banco "default". As leituras só vão para as réplicas em views decoradas
+    com "leitura_replica", fora de transações e antes de qualquer escrita na
+    mesma requisição. Com o "ReplicaMiddleware", o cliente que escreveu
+    continua lendo do banco principal por "REPLICA_JANELA_PRIMARIO" segundos.
+
+    Examples:
+        DATABASE_ROUTERS = ["utils.replicas.RoteadorReplicas"]
+        DATABASE_REPLICAS = {"replica_1": 1, "replica_2": 3}
+
+    """
+
+    def __init__(self):
+        pesos = getattr(settings, "DATABASE_REPLICAS", {})
+        self.sequencia = sequencia_ponderada(
+            {alias: peso for alias, peso in pesos.items() if peso > 0}
+        )
+        self.posicao = 0
+        self.lock = threading.Lock()
+
+    def proxima_replica(self):
+        with self.lock:
+            alias = self.sequencia[self.posicao]
+            self.posicao = (self.posicao + 1) % len(self.sequencia)
+        return alias
+
+    def db_for_read(self, model, **hints):
+        estado = _estado.get()
+        if (
+            not self.sequencia
+            or estado is None
+            or not estado.replica
+            or estado.primario
+            or estado.escreveu
+            # Dentro de uma transação, ler os dados que ela mesma alterou
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return None
+        return self.proxima_replica()
+
+    def db_for_write(self, model, **hints):
+        estado = _estado.get()
+        if estado is not None:
+            estado.escreveu = True
+        return None
+
+
+class ReplicaMiddleware(MiddlewareMixin):
+    """
+    Mantém as leituras no banco principal logo após uma escrita (read-your-writes).
+
+    Quando uma requisição escreve no banco (ex.: "add_*", "alter_*"), a
+    resposta inclui o cookie "REPLICA_COOKIE", válido por
+    "REPLICA_JANELA_PRIMARIO" segundos. Enquanto o cliente enviar o cookie,
+    as consultas são feitas no banco principal, que já contém a alteração.
+
+    """
+
+    def process_request(self, request):
+        _estado.set(_EstadoRequisicao(primario=REPLICA_COOKIE in request.COOKIES))
+
+    def process_response(self, request, response):
+        estado = _estado.get()
+        if estado is not None and estado.escreveu:
+            response.set_cookie(
+                REPLICA_COOKIE,
+                "1",
+                max_age=REPLICA_JANELA_PRIMARIO,
+                httponly=True,
+                samesite="Lax",
+            )
+        # A thread atende outras requisições em seguida
+        _estado.set(None)
+        return response
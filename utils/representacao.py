@@ -0,0 +1,256 @@
+import decimal
+from datetime import date, datetime
+from itertools import repeat
+from operator import methodcaller
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import ISO_8601, relations, serializers
+from rest_framework.settings import api_settings
+from utils.expansao import aplica_expansoes
+from utils.metricas import cronometro
+
+
+def _por_valor(conversor):
+    # Aplica um conversor de valor a uma coluna inteira
+    def converte(coluna):
+        return list(map(conversor, coluna))
+
+    return converte
+
+
+def _conversor_decimal(campo):
+    # Mesmo resultado de "DecimalField.to_representation" com as opções padrão
+    if (
+        campo.decimal_places is None
+        or campo.normalize_output
+        or campo.localize
+        or not getattr(campo, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+    ):
+        return _por_valor(campo.to_representation)
+    contexto = decimal.getcontext().copy()
+    if campo.max_digits is not None:
+        contexto.prec = campo.max_digits
+    quantiza = methodcaller(
+        "quantize",
+        decimal.Decimal(".1") ** campo.decimal_places,
+        rounding=campo.rounding,
+        context=contexto,
+    )
+
+    def converte(coluna):
+        return list(map(format, map(quantiza, coluna), repeat("f")))
+
+    return converte
+
+
+def _conversor_data(campo):
+    if getattr(campo, "format", api_settings.DATE_FORMAT).lower() != ISO_8601:
+        return _por_valor(campo.to_representation)
+
+    def converte(coluna):
+        return list(map(date.isoformat, coluna))
+
+    return converte
+
+
+def _conversor_data_hora(campo, fuso_horario):
+    formato = getattr(campo, "format", api_settings.DATETIME_FORMAT)
+    if formato is None or formato.lower() != ISO_8601 or fuso_horario is None:
+        return _por_valor(campo.to_representation)
+    converte_fuso = methodcaller("astimezone", getattr(campo, "timezone", fuso_horario))
+
+    def converte(coluna):
+        return [
+            valor[:-6] + "Z" if valor.endswith("+00:00") else valor
+            for valor in map(datetime.isoformat, map(converte_fuso, coluna))
+        ]
+
+    return converte
+
+
+def _conversor_uuid(campo):
+    if campo.uuid_format != "hex_verbose":
+        return _por_valor(campo.to_representation)
+
+    def converte(coluna):
+        return list(map(str, coluna))
+
+    return converte
+
+
+def _ignora_nulos(conversor):
+    # Converte apenas os valores preenchidos, mantendo os nulos
+    def converte(coluna):
+        coluna = list(coluna)
+        preenchidos = iter(conversor([valor for valor in coluna if valor is not None]))
+        return [None if valor is None else next(preenchidos) for valor in coluna]
+
+    return converte
+
+
+class RepresentacaoRapida:
+    """
+    Representação somente leitura de um ModelSerializer a partir de ".values_list()".
+
+    Os campos, a ordem das chaves e o conversor de cada campo (Decimal, date,
+    datetime e UUID) são obtidos do próprio serializer uma única vez. A listagem
+    então lê apenas tuplas do banco, sem instanciar os models nem passar pelo
+    "to_representation" de cada campo do DRF, e aplica cada conversor a uma
+    coluna inteira de uma vez, com "map" sempre que possível. A saída é
+    exatamente a mesma do serializer. Campos sem conversor conhecido usam o do
+    DRF.
+
+    Args:
+        serializer_class (ModelSerializer): Serializer cuja saída é reproduzida.
+
+    Examples:
+        >>> representacao = RepresentacaoRapida(ReservaSerializer)
+        >>> representacao.representa(representacao.valores(Reserva.objects.all()))
+        [{'id': 1, 'cod_reserva': '...', 'data_checkin': '2024-04-20', ...}]
+
+    """
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+        self._campos = None
+        self._conversores = {}
+
+    def _compila(self):
+        # Os campos só podem ser montados depois que os models forem carregados
+        if self._campos is None:
+            model = self.serializer_class.Meta.model
+            campos = []
+            for campo in self.serializer_class().fields.values():
+                if campo.write_only:
+                    continue
+                if isinstance(campo, relations.PrimaryKeyRelatedField):
+                    chave = model._meta.get_field(campo.source).attname
+                    conversor = (
+                        _por_valor(campo.pk_field.to_representation)
+                        if campo.pk_field
+                        else None
+                    )
+                elif isinstance(campo, serializers.DecimalField):
+                    chave, conversor = campo.source, _conversor_decimal(campo)
+                elif isinstance(campo, serializers.DateTimeField):
+                    # Depende do fuso horário ativo, resolvido a cada representação
+                    chave, conversor = campo.source, campo
+                elif isinstance(campo, serializers.DateField):
+                    chave, conversor = campo.source, _conversor_data(campo)
+                elif isinstance(campo, serializers.UUIDField):
+                    chave, conversor = campo.source, _conversor_uuid(campo)
+                elif isinstance(
+                    campo,
+                    (
+                        serializers.IntegerField,
+                        serializers.BooleanField,
+                        serializers.CharField,
+                    ),
+                ):
+                    # O banco já retorna int, bool e str
+                    chave, conversor = campo.source, None
+                else:
+                    chave, conversor = campo.source, _por_valor(campo.to_representation)
+                nulo = model._meta.get_field(chave).null
+                campos.append((campo.field_name, chave, conversor, nulo))
+            self._campos = campos
+        return self._campos
+
+    def _conversores_colunas(self):
+        fuso_horario = timezone.get_current_timezone() if settings.USE_TZ else None
+        conversores = self._conversores.get(fuso_horario)
+        if conversores is None:
+            conversores = []
+            for _, _, conversor, nulo in self._compila():
+                if isinstance(conversor, serializers.DateTimeField):
+                    conversor = _conversor_data_hora(conversor, fuso_horario)
+                if conversor is not None and nulo:
+                    conversor = _ignora_nulos(conversor)
+                conversores.append(conversor)
+            self._conversores[fuso_horario] = conversores
+        return conversores
+
+    @property
+    def nomes(self):
+        """list: Chaves da representação, na ordem do serializer."""
+        return [nome for nome, _, _, _ in self._compila()]
+
+    @property
+    def chaves(self):
+        """list: Colunas lidas com ".values_list()"."""
+        return [chave for _, chave, _, _ in self._compila()]
+
+    def valores(self, registros):
+        """
+        Restringe um queryset às colunas usadas na representação.
+
+        As linhas são tuplas nomeadas, então a paginação por cursor continua
+        obtendo o "id" de cada registro.
+
+        Args:
+            registros (QuerySet): Queryset do model do serializer.
+
+        Returns:
+            QuerySet: Queryset de tuplas (".values_list(named=True)").
+
+        """
+        return registros.values_list(*self.chaves, named=True)
+
+    def representa(self, linhas):
+        """
+        Converte as tuplas de "valores" na saída do serializer.
+
+        Args:
+            linhas (iterable): Tuplas retornadas por "valores".
+
+        Returns:
+            list: Registros representados, na mesma ordem.
+
+        """
+        # Converter coluna a coluna e só então montar os dicionários
+        colunas = [
+            coluna if conversor is None else conversor(coluna)
+            for conversor, coluna in zip(self._conversores_colunas(), zip(*linhas))
+        ]
+        nomes = self.nomes
+        return [dict(zip(nomes, linha)) for linha in zip(*colunas)]
+
+    def queryset_listagem(self, registros, expand, expansoes):
+        """
+        Prepara o queryset de uma listagem.
+
+        Sem expansões, apenas as colunas da representação são lidas com
+        ".values_list()". Com expansões, os relacionamentos são carregados para o
+        serializer.
+
+        Args:
+            registros (QuerySet): Queryset do model do serializer.
+            expand (frozenset): Expansões solicitadas.
+            expansoes (dict): Expansões aceitas pelo endpoint.
+
+        Returns:
+            QuerySet: Queryset a ser paginado ou filtrado pelos IDs.
+
+        """
+        if expand:
+            return aplica_expansoes(registros, expand, expansoes)
+        return self.valores(registros)
+
+    def dados_listagem(self, registros, expand):
+        """
+        Representa os registros obtidos de "queryset_listagem".
+
+        Args:
+            registros (iterable): Registros da listagem.
+            expand (frozenset): Expansões solicitadas.
+
+        Returns:
+            list: Registros representados.
+
+        """
+        with cronometro("serializacao"):
+            if expand:
+                return self.serializer_class(
+                    registros, many=True, context={"expand": expand}
+                ).data
+            return self.representa(registros)
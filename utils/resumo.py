@@ -0,0 +1,260 @@
+from collections import Counter, defaultdict
+from datetime import timedelta
+from decimal import Decimal
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Q
+from base.models import Anuncio, Reserva, ResumoDiario
+from utils.carga import insere_linhas, prepara_linhas
+from utils.validations import divide_ids
+
+# Linhas do resumo inseridas por comando na reconstrução
+TAMANHO_LOTE = 5000
+# Anúncios por consulta das linhas existentes do resumo
+ANUNCIOS_POR_CONSULTA = 100
+
+# Campos da reserva dos quais o resumo depende
+CAMPOS_RESERVA = ("cod_anuncio_id", "data_checkin", "data_checkout", "preco_total")
+CAMPOS_METRICAS = ("reservas", "continuacoes", "noites", "receita")
+
+
+def dados_reserva(reserva):
+    """
+    Obtém os campos de uma reserva dos quais o resumo diário depende.
+
+    Os valores são convertidos pelos campos do model, já que uma instância
+    recém-criada pode guardar as datas como texto e o preço como float.
+
+    Args:
+        reserva (Reserva): Reserva, salva ou não.
+
+    Returns:
+        tuple: ID do anúncio, check-in, check-out e preço total.
+
+    """
+    return tuple(
+        Reserva._meta.get_field(campo).to_python(getattr(reserva, campo))
+        for campo in CAMPOS_RESERVA
+    )
+
+
+def dados_salvos(reserva, using=DEFAULT_DB_ALIAS):
+    # Valores gravados no banco de uma reserva (lista vazia se ainda não existir)
+    if reserva.pk is None:
+        return []
+    return list(
+        Reserva._base_manager.using(using)
+        .filter(pk=reserva.pk)
+        .values_list(*CAMPOS_RESERVA)
+    )
+
+
+def contribuicoes(cod_anuncio, data_checkin, data_checkout, preco_total):
+    """
+    Distribui uma reserva pelos dias do resumo.
+
+    Cada noite da estadia gera uma linha com uma noite vendida e a sua parte do
+    preço; os centavos restantes da divisão vão para as primeiras noites, de
+    modo que a soma das linhas seja exatamente o preço total. A reserva é
+    contada no dia do check-in e como continuação nos dias seguintes. Uma
+    reserva sem pernoite gera uma única linha, sem noites, com o preço inteiro.
+
+    Args:
+        cod_anuncio (int): ID do anúncio.
+        data_checkin (date): Data de check-in.
+        data_checkout (date): Data de check-out.
+        preco_total (Decimal): Preço total da reserva.
+
+    Yields:
+        tuple: Chave (anúncio, data) e métricas (reservas, continuacoes, noites, receita).
+
+    Examples:
+        >>> list(contribuicoes(1, date(2024, 4, 1), date(2024, 4, 3), Decimal("25.99")))
+        [((1, date(2024, 4, 1)), (1, 0, 1, Decimal('13.00'))),
+         ((1, date(2024, 4, 2)), (0, 1, 1, Decimal('12.99')))]
+
+    """
+    noites = (data_checkout - data_checkin).days
+    if noites <= 0:
+        yield (cod_anuncio, data_checkin), (1, 0, 0, preco_total)
+        return
+    centavos = int(preco_total.scaleb(2).to_integral_value())
+    diaria, resto = divmod(centavos, noites)
+    for noite in range(noites):
+        yield (cod_anuncio, data_checkin + timedelta(days=noite)), (
+            int(noite == 0),
+            int(noite > 0),
+            1,
+            Decimal(diaria + (noite < resto)).scaleb(-2),
+        )
+
+
+def _acumula(totais, reservas, sinal=1):
+    for reserva in reservas:
+        for chave, metricas in contribuicoes(*reserva):
+            atual = totais.setdefault(chave, [0, 0, 0, Decimal(0)])
+            for posicao, valor in enumerate(metricas):
+                atual[posicao] += sinal * valor
+
+
+def atualiza_resumo(adicionadas=(), removidas=(), using=DEFAULT_DB_ALIAS):
+    """
+    Aplica ao resumo diário as reservas adicionadas e removidas.
+
+    Apenas as linhas dos dias afetados são lidas e gravadas, em uma transação
+    e com os anúncios bloqueados (nos bancos com "SELECT ... FOR UPDATE"), para
+    que atualizações simultâneas não se percam. Linhas zeradas são excluídas.
+    Descontos em linhas inexistentes são ignorados: elas já foram excluídas
+    junto com o anúncio.
+
+    Args:
+        adicionadas (iterable): Tuplas (anúncio, check-in, check-out, preço) a somar.
+        removidas (iterable): Tuplas no mesmo formato a descontar.
+        using (str): Alias do banco.
+
+    Returns:
+        int: Quantidade de linhas (anúncio, dia) afetadas.
+
+    Examples:
+        Alteração de uma reserva:
+
+        >>> atualiza_resumo(adicionadas=[dados_reserva(reserva)], removidas=dados_salvos(reserva))
+
+    """
+    totais = {}
+    _acumula(totais, adicionadas)
+    _acumula(totais, removidas, -1)
+    totais = {chave: metricas for chave, metricas in totais.items() if any(metricas)}
+    if not totais:
+        return 0
+
+    periodos = defaultdict(list)
+    for id_anuncio, data in totais:
+        periodos[id_anuncio].append(data)
+    ids_anuncios = sorted(periodos)
+
+    with transaction.atomic(using=using):
+        if connections[using].features.has_select_for_update:
+            list(
+                Anuncio._base_manager.using(using)
+                .select_for_update()
+                .filter(id__in=ids_anuncios)
+                .values_list("id", flat=True)
+            )
+
+        existentes = {}
+        for inicio in range(0, len(ids_anuncios), ANUNCIOS_POR_CONSULTA):
+            condicao = Q()
+            for id_anuncio in ids_anuncios[inicio : inicio + ANUNCIOS_POR_CONSULTA]:
+                datas = periodos[id_anuncio]
+                condicao |= Q(
+                    cod_anuncio_id=id_anuncio,
+                    data__gte=min(datas),
+                    data__lte=max(datas),
+                )
+            for linha in ResumoDiario._base_manager.using(using).filter(condicao):
+                existentes[(linha.cod_anuncio_id, linha.data)] = linha
+
+        novas, alteradas, vazias = [], [], []
+        for (id_anuncio, data), metricas in totais.items():
+            linha = existentes.get((id_anuncio, data))
+            if linha is None:
+                if min(metricas) >= 0:
+                    novas.append(
+                        ResumoDiario(
+                            cod_anuncio_id=id_anuncio,
+                            data=data,
+                            **dict(zip(CAMPOS_METRICAS, metricas)),
+                        )
+                    )
+                continue
+            for campo, valor in zip(CAMPOS_METRICAS, metricas):
+                setattr(linha, campo, getattr(linha, campo) + valor)
+            if any(getattr(linha, campo) for campo in CAMPOS_METRICAS):
+                alteradas.append(linha)
+            else:
+                vazias.append(linha.pk)
+
+        gerenciador = ResumoDiario._base_manager.using(using)
+        gerenciador.bulk_create(novas)
+        gerenciador.bulk_update(alteradas, CAMPOS_METRICAS)
+        for lote_ids in divide_ids(vazias):
+            gerenciador.filter(pk__in=lote_ids).delete()
+    return len(totais)
+
+
+def reconstroi_resumo(anuncios=None, using=DEFAULT_DB_ALIAS, tamanho_lote=TAMANHO_LOTE):
+    """
+    Recalcula o resumo diário a partir das reservas.
+
+    As linhas dos anúncios são excluídas e geradas novamente, em uma única
+    transação, percorrendo as reservas ordenadas por anúncio (um anúncio por
+    vez em memória). Usado nas cargas em lote, que não disparam os signals, e
+    para preencher o resumo de dados já existentes.
+
+    Args:
+        anuncios (iterable): IDs dos anúncios (opcional; padrão: todos).
+        using (str): Alias do banco.
+        tamanho_lote (int): Linhas inseridas por comando.
+
+    Returns:
+        dict: Quantidade de reservas lidas e de linhas gravadas.
+
+    Examples:
+        >>> reconstroi_resumo()
+        {'reservas': 1000, 'linhas': 2911}
+
+    """
+    conexao = connections[using]
+    campos = [
+        campo for campo in ResumoDiario._meta.concrete_fields if not campo.primary_key
+    ]
+    reservas = (
+        Reserva._base_manager.using(using)
+        .order_by("cod_anuncio", "data_checkin")
+        .values_list(*CAMPOS_RESERVA)
+    )
+    resumo = ResumoDiario._base_manager.using(using)
+    contagem = Counter(reservas=0, linhas=0)
+    pendentes = []
+
+    def grava(forcar=False):
+        if pendentes and (forcar or len(pendentes) >= tamanho_lote):
+            insere_linhas(
+                ResumoDiario, campos, prepara_linhas(campos, pendentes, conexao), using
+            )
+            contagem["linhas"] += len(pendentes)
+            pendentes.clear()
+
+    def inclui(totais):
+        for (id_anuncio, data), metricas in sorted(totais.items()):
+            pendentes.append(
+                {
+                    "cod_anuncio_id": id_anuncio,
+                    "data": data,
+                    **dict(zip(CAMPOS_METRICAS, metricas)),
+                }
+            )
+        grava()
+
+    with transaction.atomic(using=using):
+        if anuncios is None:
+            resumo.all().delete()
+            consultas = [reservas]
+        else:
+            anuncios = sorted(set(anuncios))
+            consultas = []
+            for lote_ids in divide_ids(anuncios):
+                resumo.filter(cod_anuncio_id__in=lote_ids).delete()
+                consultas.append(reservas.filter(cod_anuncio_id__in=lote_ids))
+
+        for consulta in consultas:
+            atual, totais = None, {}
+            for reserva in consulta.iterator(chunk_size=tamanho_lote):
+                if reserva[0] != atual:
+                    inclui(totais)
+                    atual, totais = reserva[0], {}
+                _acumula(totais, [reserva])
+                contagem["reservas"] += 1
+            inclui(totais)
+        grava(forcar=True)
+    return dict(contagem)
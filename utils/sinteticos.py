@@ -0,0 +1,217 @@
+import random
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import islice
+from django.db import connections, router, transaction
+from django.utils import timezone
+from base.models import Anuncio, Imovel, Reserva
+from utils.cache import invalida_listagens
+from utils.carga import insere_linhas, prepara_linhas
+from utils.resumo import reconstroi_resumo
+
+# Reservas geradas por imóvel, em média (cada imóvel tem de 1 a 3 anúncios)
+RESERVAS_POR_IMOVEL = 50
+# Registros inseridos por "bulk_create" e por transação
+TAMANHO_LOTE = 5000
+
+PLATAFORMAS = ["airbnb", "booking", "vrbo", "expedia", "decolar"]
+COMENTARIOS = [
+    "",
+    "",
+    "Chegada prevista no fim da tarde",
+    "Viagem em família",
+    "Precisa de berço",
+    "Check-in antecipado, se possível",
+    "Comemoração de aniversário",
+]
+# Primeiro dia das estadias geradas
+INICIO_RESERVAS = date(2020, 1, 1)
+
+
+def _decimal(valor):
+    return Decimal(valor).quantize(Decimal("0.01"))
+
+
+def _uuid(rng):
+    # UUID4 a partir do gerador, para que a mesma semente gere os mesmos dados
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _em_lotes(registros, tamanho):
+    registros = iter(registros)
+    while lote := list(islice(registros, tamanho)):
+        yield lote
+
+
+def gera_imoveis(rng, quantidade):
+    """
+    Gera imóveis com características variadas (capacidade, banheiros, limpeza).
+
+    Args:
+        rng (random.Random): Gerador de números aleatórios.
+        quantidade (int): Quantidade de imóveis.
+
+    Yields:
+        Imovel: Imóveis ainda não salvos.
+
+    """
+    for _ in range(quantidade):
+        limite_hospedes = rng.choices(
+            range(1, 13), weights=[4, 14, 10, 18, 8, 14, 5, 10, 3, 6, 2, 6]
+        )[0]
+        yield Imovel(
+            limite_hospedes=limite_hospedes,
+            quantidade_banheiros=min(4, 1 + limite_hospedes // 4 + rng.randint(0, 1)),
+            aceita_animais=rng.random() < 0.35,
+            valor_limpeza=_decimal(rng.uniform(20, 60 + limite_hospedes * 20)),
+            data_ativacao=date(2015, 1, 1) + timedelta(days=rng.randint(0, 3650)),
+        )
+
+
+def gera_anuncios(rng, imoveis):
+    """
+    Gera de 1 a 3 anúncios, em plataformas diferentes, para cada imóvel.
+
+    Args:
+        rng (random.Random): Gerador de números aleatórios.
+        imoveis (iterable): IDs dos imóveis.
+
+    Yields:
+        Anuncio: Anúncios ainda não salvos.
+
+    """
+    for id_imovel in imoveis:
+        quantidade = rng.choices((1, 2, 3), weights=(3, 4, 3))[0]
+        for plataforma in rng.sample(PLATAFORMAS, quantidade):
+            yield Anuncio(
+                cod_imovel_id=id_imovel,
+                plataforma=plataforma,
+                taxa_plataforma=_decimal(rng.uniform(3, 20)),
+            )
+
+
+def gera_reservas(rng, anuncios, quantidade):
+    """
+    Gera as reservas, sem sobreposição de períodos em um mesmo anúncio.
+
+    As reservas são distribuídas igualmente entre os anúncios. As estadias de
+    cada anúncio são consecutivas, a partir de 2020, com intervalos de 0 a 10
+    dias, duração de 1 a 14 noites (em geral curtas) e preço proporcional às
+    noites e à capacidade do imóvel.
+
+    Args:
+        rng (random.Random): Gerador de números aleatórios.
+        anuncios (list): Tuplas (id do anúncio, limite de hóspedes, valor da limpeza).
+        quantidade (int): Quantidade total de reservas.
+
+    Yields:
+        dict: Valores dos campos de cada reserva.
+
+    """
+    por_anuncio, restantes = divmod(quantidade, len(anuncios))
+    for posicao, (id_anuncio, limite_hospedes, valor_limpeza) in enumerate(anuncios):
+        diaria = rng.uniform(80, 120) * (1 + limite_hospedes / 4)
+        checkin = INICIO_RESERVAS + timedelta(days=rng.randint(0, 30))
+        for _ in range(por_anuncio + (posicao < restantes)):
+            noites = min(14, 1 + int(rng.expovariate(1 / 3)))
+            checkout = checkin + timedelta(days=noites)
+            yield {
+                "cod_reserva": _uuid(rng),
+                "cod_anuncio_id": id_anuncio,
+                "data_checkin": checkin,
+                "data_checkout": checkout,
+                "preco_total": _decimal(noites * diaria + float(valor_limpeza)),
+                "comentario": rng.choice(COMENTARIOS),
+                "numero_hospedes": rng.randint(1, limite_hospedes),
+            }
+            checkin = checkout + timedelta(days=rng.randint(0, 10))
+
+
+def _insere(model, registros, tamanho_lote):
+    # Cada lote é salvo em uma transação; os IDs gerados são retornados em ordem
+    ids = []
+    for lote in _em_lotes(registros, tamanho_lote):
+        with transaction.atomic():
+            ids += [registro.pk for registro in model.objects.bulk_create(lote)]
+    return ids
+
+
+def _insere_valores(model, registros, tamanho_lote, fixos):
+    # Insere dicionários {attname: valor} sem instanciar o model (ver "utils.carga")
+    using = router.db_for_write(model)
+    conexao = connections[using]
+    campos = [campo for campo in model._meta.concrete_fields if not campo.primary_key]
+    quantidade = 0
+    for lote in _em_lotes(registros, tamanho_lote):
+        linhas = prepara_linhas(campos, lote, conexao, fixos)
+        with transaction.atomic(using=using):
+            insere_linhas(model, campos, linhas, using)
+        quantidade += len(linhas)
+    return quantidade
+
+
+def carrega_dados_sinteticos(reservas, seed=42, tamanho_lote=TAMANHO_LOTE):
+    """
+    Gera e salva um conjunto de dados sintético, reproduzível pela semente.
+
+    Para "reservas" reservas são criados "reservas / RESERVAS_POR_IMOVEL"
+    imóveis (no mínimo 1) e de 1 a 3 anúncios por imóvel. Os registros são
+    gerados sob demanda e inseridos em lotes ("bulk_create" para imóveis e
+    anúncios, "insere_linhas" para as reservas), sem manter todas as reservas
+    em memória. Os signals de cada objeto não são disparados; ao final, o
+    resumo diário dos anúncios criados é calculado e o cache das listagens é
+    invalidado.
+
+    Args:
+        reservas (int): Quantidade de reservas (ex.: 1000 a 10000000).
+        seed (int): Semente do gerador de números aleatórios.
+        tamanho_lote (int): Registros por "bulk_create" e por transação.
+
+    Returns:
+        dict: Quantidade de imóveis, anúncios e reservas criados.
+
+    Examples:
+        >>> carrega_dados_sinteticos(1000)
+        {'imoveis': 20, 'anuncios': 45, 'reservas': 1000}
+
+    """
+    rng = random.Random(seed)
+    agora = timezone.now()
+
+    imoveis = list(gera_imoveis(rng, max(1, reservas // RESERVAS_POR_IMOVEL)))
+    for imovel in imoveis:
+        imovel.data_criacao = agora
+    ids_imoveis = _insere(Imovel, imoveis, tamanho_lote)
+    # Capacidade e limpeza de cada imóvel, usadas no preço das reservas
+    caracteristicas = {
+        imovel_id: (imovel.limite_hospedes, imovel.valor_limpeza)
+        for imovel_id, imovel in zip(ids_imoveis, imoveis)
+    }
+    del imoveis
+
+    anuncios = list(gera_anuncios(rng, ids_imoveis))
+    for anuncio in anuncios:
+        anuncio.data_criacao = agora
+    ids_anuncios = _insere(Anuncio, anuncios, tamanho_lote)
+    dados_anuncios = [
+        (id_anuncio, *caracteristicas[anuncio.cod_imovel_id])
+        for id_anuncio, anuncio in zip(ids_anuncios, anuncios)
+    ]
+    del anuncios, caracteristicas
+
+    quantidade_reservas = _insere_valores(
+        Reserva,
+        gera_reservas(rng, dados_anuncios, reservas),
+        tamanho_lote,
+        {"data_criacao": agora, "data_atualizacao": agora},
+    )
+    reconstroi_resumo(ids_anuncios, using=router.db_for_write(Reserva))
+
+    for model in (Imovel, Anuncio, Reserva):
+        invalida_listagens(model)
+    return {
+        "imoveis": len(ids_imoveis),
+        "anuncios": len(ids_anuncios),
+        "reservas": quantidade_reservas,
+    }
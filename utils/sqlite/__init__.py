@@ -0,0 +1,63 @@
+import re
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+# PRAGMAs aplicados a cada nova conexão SQLite (vazio desliga o ajuste). Ver
+# https://www.sqlite.org/pragma.html
+SQLITE_PRAGMAS = getattr(settings, "SQLITE_PRAGMAS", {})
+
+# Nomes e valores aceitos: identificadores (ex.: "WAL", "NORMAL") ou números
+_IDENTIFICADOR = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_NUMERO = re.compile(r"^-?\d+$")
+
+
+def comandos_pragmas(pragmas):
+    """
+    Monta os comandos "PRAGMA" de uma configuração.
+
+    Args:
+        pragmas (dict): Valor de cada PRAGMA, ex.: {"journal_mode": "WAL"}.
+
+    Returns:
+        list: Comandos SQL, na mesma ordem da configuração.
+
+    Raises:
+        ImproperlyConfigured: Se algum nome ou valor não for um identificador ou
+            um número inteiro.
+
+    Examples:
+        >>> comandos_pragmas({"journal_mode": "WAL", "busy_timeout": 5000})
+        ['PRAGMA journal_mode = WAL', 'PRAGMA busy_timeout = 5000']
+
+    """
+    comandos = []
+    for nome, valor in pragmas.items():
+        valor = str(valor)
+        if not _IDENTIFICADOR.match(nome) or not (
+            _IDENTIFICADOR.match(valor) or _NUMERO.match(valor)
+        ):
+            raise ImproperlyConfigured(
+                f"PRAGMA inválido em SQLITE_PRAGMAS: {nome}={valor}"
+            )
+        comandos.append(f"PRAGMA {nome} = {valor}")
+    return comandos
+
+
+def aplica_pragmas(connection, pragmas=None):
+    """
+    Aplica os PRAGMAs a uma conexão SQLite recém-aberta.
+
+    Conexões de outros bancos são ignoradas. O "journal_mode" WAL fica gravado
+    no arquivo do banco; os demais valem apenas para a conexão. Em bancos em
+    memória (ex.: testes), o "journal_mode" permanece "memory".
+
+    Args:
+        connection (DatabaseWrapper): Conexão do Django.
+        pragmas (dict): PRAGMAs aplicados. Padrão: "SQLITE_PRAGMAS".
+
+    """
+    if connection.vendor != "sqlite":
+        return
+    # Executar diretamente na conexão do sqlite3, que acabou de ser aberta
+    for comando in comandos_pragmas(SQLITE_PRAGMAS if pragmas is None else pragmas):
+        connection.connection.execute(comando)
@@ -0,0 +1,53 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+# Modos aceitos em OPTIONS["transaction_mode"] (https://www.sqlite.org/lang_transaction.html)
+MODOS_TRANSACAO = ("DEFERRED", "IMMEDIATE", "EXCLUSIVE")
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    Backend SQLite do Django com o modo das transações configurável.
+
+    Por padrão, "transaction.atomic()" inicia a transação com "BEGIN"
+    (DEFERRED): o bloqueio de escrita só é pedido no primeiro INSERT/UPDATE.
+    Se outra conexão escreveu nesse intervalo, o SQLite retorna "database is
+    locked" imediatamente, sem respeitar o "busy_timeout". Com
+    OPTIONS["transaction_mode"] = "IMMEDIATE", o bloqueio é pedido no início
+    da transação, e as escritas simultâneas aguardam a vez. Com WAL, as
+    leituras fora de transações não são bloqueadas.
+
+    Mesma opção do backend SQLite do Django 5.1; ao atualizar o Django, basta
+    voltar o ENGINE para "django.db.backends.sqlite3".
+
+    Examples:
+        DATABASES = {
+            "default": {
+                "ENGINE": "utils.sqlite",
+                "NAME": BASE_DIR / "db.sqlite3",
+                "OPTIONS": {"transaction_mode": "IMMEDIATE"},
+            }
+        }
+
+    """
+
+    def __init__(self, settings_dict, *args, **kwargs):
+        super().__init__(settings_dict, *args, **kwargs)
+        transaction_mode = settings_dict.get("OPTIONS", {}).get(
+            "transaction_mode", "DEFERRED"
+        )
+        if str(transaction_mode).upper() not in MODOS_TRANSACAO:
+            raise ImproperlyConfigured(
+                f"transaction_mode inválido: {transaction_mode!r}. "
+                f"Use um dos valores: {', '.join(MODOS_TRANSACAO)}."
+            )
+        self.transaction_mode = str(transaction_mode).upper()
+
+    def get_connection_params(self):
+        # A opção é do backend e não deve ser repassada ao "sqlite3.connect"
+        kwargs = super().get_connection_params()
+        kwargs.pop("transaction_mode", None)
+        return kwargs
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute(f"BEGIN {self.transaction_mode}")
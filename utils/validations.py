@@ -1,20 +1,114 @@
-from ast import literal_eval
 from datetime import datetime
+from django.conf import settings
 
+# Quantidade máxima de IDs aceitos em uma consulta
+IDS_MAX_QUANTIDADE = getattr(settings, "IDS_MAX_QUANTIDADE", 1000)
+# Quantidade de IDs por consulta "id__in" (o SQLite antigo aceita até 999 parâmetros)
+IDS_POR_CONSULTA = getattr(settings, "IDS_POR_CONSULTA", 500)
 
-def valida_ids_get(model, param):
+
+def _converte_id(valor):
+    # Aceitar apenas dígitos ASCII, sem sinal, espaços internos ou "_"
+    valor = valor.strip()
+    if not (valor.isascii() and valor.isdecimal()):
+        raise ValueError(f"ID inválido: '{valor}'.")
+    return int(valor)
+
+
+def converte_ids(param, max_quantidade=IDS_MAX_QUANTIDADE):
+    """
+    Converte o parâmetro "id" da URL em uma lista ordenada de IDs únicos.
+
+    Aceita IDs separados por vírgula e intervalos no formato "inicio-fim".
+
+    Args:
+        param (str): Valor do parâmetro, por exemplo "1,5,10-20".
+        max_quantidade (int): Quantidade máxima de IDs aceitos.
+
+    Returns:
+        list: IDs únicos em ordem crescente.
+
+    Raises:
+        ValueError: Se o parâmetro for inválido ou exceder a quantidade máxima.
+
+    Examples:
+        >>> converte_ids("3,1-3,7")
+        [1, 2, 3, 7]
+
+    """
+    ids = set()
+    for trecho in param.split(","):
+        inicio, separador, fim = trecho.partition("-")
+        if separador:
+            inicio, fim = _converte_id(inicio), _converte_id(fim)
+            if fim < inicio:
+                raise ValueError(f"Intervalo de IDs inválido: '{trecho.strip()}'.")
+            # Verificar o tamanho antes de expandir o intervalo
+            if len(ids) + (fim - inicio + 1) > max_quantidade:
+                raise ValueError(
+                    f"A consulta pode conter no máximo {max_quantidade} IDs."
+                )
+            ids.update(range(inicio, fim + 1))
+        else:
+            ids.add(_converte_id(inicio))
+        if len(ids) > max_quantidade:
+            raise ValueError(f"A consulta pode conter no máximo {max_quantidade} IDs.")
+    return sorted(ids)
+
+
+def divide_ids(ids, tamanho=IDS_POR_CONSULTA):
+    # Dividir a lista de IDs em pedaços para consultas "id__in" menores
+    for inicio in range(0, len(ids), tamanho):
+        yield ids[inicio : inicio + tamanho]
+
+
+def valida_ids_get(model, param, registros_base=None):
+    # "registros_base" permite filtrar um queryset já preparado (ex.: com "select_related")
+    if registros_base is None:
+        registros_base = model.objects.all()
     if param:
         # Converter o parâmetro para uma lista de IDs
-        param = literal_eval(param) if len(param.split(",")) > 1 else [int(param)]
-        # Filtrar os registros da tabela com base nos IDs fornecidos
-        registros = model.objects.filter(id__in=param)
+        ids = converte_ids(param)
+        # Filtrar os registros da tabela com base nos IDs fornecidos, em pedaços
+        registros = []
+        for lote_ids in divide_ids(ids):
+            registros += registros_base.filter(id__in=lote_ids).order_by("id")
     else:
         # Se nenhum parâmetro fornecido, obter todos os registros da tabela
-        registros = model.objects.all()
+        registros = registros_base
+
+    return registros
 
+
+async def avalida_ids_get(model, param, registros_base=None):
+    # Versão assíncrona de "valida_ids_get", lendo os registros com "aiterator"
+    if registros_base is None:
+        registros_base = model.objects.all()
+    if not param:
+        return [registro async for registro in registros_base.aiterator()]
+    registros = []
+    for lote_ids in divide_ids(converte_ids(param)):
+        registros += [
+            registro
+            async for registro in registros_base.filter(id__in=lote_ids)
+            .order_by("id")
+            .aiterator()
+        ]
     return registros
 
 
+def valida_ids_payload(valor, max_quantidade=IDS_MAX_QUANTIDADE):
+    # Aceitar um único ID ou uma lista de IDs no payload
+    ids = valor if isinstance(valor, list) else [valor]
+    # Recusar valores que não sejam inteiros (bool é subclasse de int)
+    if not ids or any(type(id_registro) != int for id_registro in ids):
+        return None
+    ids = sorted(set(ids))
+    if len(ids) > max_quantidade:
+        return None
+    return ids
+
+
 def valida_campos_obrigatorios(campos_obrigatorios, payload):
     # Convertendo as listas em conjuntos
     set_campos_obrigatorios = set(campos_obrigatorios)
@@ -25,26 +119,6 @@ def valida_campos_obrigatorios(campos_obrigatorios, payload):
     return list(diferenca)
 
 
-def valida_campos_validos(campos_validos, payload):
-    lista_campos_invalidos = []
-    for campo_payload in payload:
-        if campo_payload not in campos_validos:
-            lista_campos_invalidos.append(campo_payload)
-
-    return lista_campos_invalidos
-
-
-def valida_var_tipos(tipos_validos, payload):
-    dict_tipo_invalido = {}
-    for payload_key in payload.keys():
-        if type(payload[payload_key]) != tipos_validos[payload_key]:
-            dict_tipo_invalido[payload_key] = (
-                f"Tipo de dado incorreto! Esperado: {tipos_validos[payload_key]}. "
-            )
-
-    return dict_tipo_invalido
-
-
 def valida_data_checkin_checkout(dados_reserva):
     # Converter as strings de data em objetos de data
     datetime_checkin = datetime.strptime(